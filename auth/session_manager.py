@@ -7,7 +7,7 @@ This module handles user session tracking, token management, and session cleanup
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Set
+from typing import AbstractSet, Dict, Optional, Set
 
 from .auth_service import auth_service
 from ..interfaces.auth_interface import AuthToken
@@ -15,17 +15,27 @@ from ..network.network_service import network_service
 
 logger = logging.getLogger(__name__)
 
+# Returned for users without sessions, so lookups that miss allocate nothing
+_NO_CLIENTS: AbstractSet[str] = frozenset()
+
 class SessionManager:
     """Manages user sessions and their associated network connections."""
+    __slots__ = ('user_sessions', 'client_sessions', '_cleanup_task')
     
     def __init__(self):
         self.user_sessions: Dict[int, Set[str]] = {}  # user_id -> set of client_ids
         self.client_sessions: Dict[str, int] = {}  # client_id -> user_id
         self._cleanup_task: Optional[asyncio.Task] = None
         
-    async def start(self) -> None:
-        """Start the session manager."""
-        self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+    async def start(self, run_background: bool = True) -> None:
+        """Start the session manager.
+        
+        Args:
+            run_background: Whether to spawn the periodic cleanup task. Tests
+                pass False and call _cleanup_once() when they need a sweep.
+        """
+        if run_background:
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
         logger.info("Session manager started")
         
     async def stop(self) -> None:
@@ -95,28 +105,35 @@ class SessionManager:
         """
         return self.client_sessions.get(client_id)
         
-    def get_client_ids(self, user_id: int) -> Set[str]:
+    def get_client_ids(self, user_id: int) -> AbstractSet[str]:
         """Get all client IDs for a user.
         
         Args:
             user_id: The user ID
             
         Returns:
-            Set[str]: Set of client IDs
+            AbstractSet[str]: Set of client IDs; treat it as read-only
         """
-        return self.user_sessions.get(user_id, set())
+        return self.user_sessions.get(user_id, _NO_CLIENTS)
+        
+    def reset_state(self) -> None:
+        """Forget all sessions without stopping the cleanup task."""
+        self.user_sessions.clear()
+        self.client_sessions.clear()
         
+    async def _cleanup_once(self) -> None:
+        """End the sessions of clients that are no longer connected."""
+        connected_clients = await network_service.get_connected_clients()
+        
+        for client_id in list(self.client_sessions.keys()):
+            if client_id not in connected_clients:
+                await self.end_session(client_id)
+                
     async def _cleanup_loop(self) -> None:
         """Periodically cleanup expired sessions."""
         while True:
             try:
-                # Get connected clients
-                connected_clients = await network_service.get_connected_clients()
-                
-                # Find disconnected clients
-                for client_id in list(self.client_sessions.keys()):
-                    if client_id not in connected_clients:
-                        await self.end_session(client_id)
+                await self._cleanup_once()
                         
                 # Sleep for 60 seconds
                 await asyncio.sleep(60)
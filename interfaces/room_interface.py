@@ -7,9 +7,10 @@ creation, player management, and room state tracking.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from datetime import datetime
 from enum import Enum, auto
-from typing import Dict, List, Optional, Set
+from typing import AbstractSet, Dict, List, Optional
+
+from ..models.base import DATACLASS_SLOTS
 
 class RoomState(Enum):
     """Possible states for a room."""
@@ -19,9 +20,13 @@ class RoomState(Enum):
     ENDING = auto()  # Game is ending
     CLOSED = auto()  # Room is closed
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class RoomSettings:
-    """Settings for a game room."""
+    """Settings for a game room.
+    
+    Immutable, so rooms with identical settings can share one instance;
+    use dataclasses.replace() to derive changed settings.
+    """
     name: str
     max_players: int
     password: Optional[str] = None
@@ -39,7 +44,7 @@ class RoomInfo:
     state: RoomState
     player_count: int
     spectator_count: int
-    created_at: datetime
+    created_at: float  # Unix timestamp; datetime.fromtimestamp() for display
     game_id: Optional[int] = None
 
 class RoomInterface(ABC):
@@ -148,15 +153,17 @@ class RoomInterface(ABC):
         pass
         
     @abstractmethod
-    async def get_room_players(self, room_id: int) -> Optional[Dict[str, Set[int]]]:
+    async def get_room_players(self, room_id: int, snapshot: bool = False) -> Optional[Dict[str, AbstractSet[int]]]:
         """Get players in a room.
         
         Args:
             room_id: ID of the room
+            snapshot: Return independent copies instead of read-only views.
+                      Callers that need to mutate the result must pass True.
             
         Returns:
-            Optional[Dict[str, Set[int]]]: Dict with 'players' and 'spectators' sets
-                                         of user IDs if room found
+            Optional[Dict[str, AbstractSet[int]]]: Dict with 'players' and 'spectators'
+                                                 sets of user IDs if room found
         """
         pass
         
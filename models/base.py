@@ -3,11 +3,17 @@ Base model functionality for Myth metaserver.
 """
 
 from dataclasses import dataclass
-from typing import Any, ClassVar, Type, TypeVar
+from typing import Any, ClassVar, Dict, Type, TypeVar
 import struct
+import sys
 
 T = TypeVar('T', bound='BaseModel')
 
+# Keyword arguments for @dataclass giving instances __slots__ instead of a
+# per-instance __dict__. Slotted dataclasses need Python 3.10+, so older
+# interpreters get regular ones.
+DATACLASS_SLOTS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 @dataclass
 class BaseModel:
     """Base class for all data models
@@ -6,9 +6,10 @@ Refer to the file "License.txt" for details
 Converted to Python by Codeium
 """
 
-from dataclasses import dataclass, field
-from typing import List
+from dataclasses import dataclass, field, fields
+from typing import List, Union
 from datetime import datetime
+import struct
 
 from .bungie_net_structures import BungieNetPlayerScoreDatum
 
@@ -20,6 +21,27 @@ MAXIMUM_ORDER_CONTACT_EMAIL_LENGTH = 127
 MAXIMUM_PASSWORD_LENGTH = 31  # From original codebase
 MAXIMUM_NUMBER_OF_GAME_TYPES = 16  # From original codebase
 
+# Fixed-size database record: order id, the two dates as Unix timestamps,
+# then NUL-padded name, passwords, url, contact email and motto
+ORDER_RECORD_STRUCT = struct.Struct(
+    f'<III{MAXIMUM_ORDER_NAME_LENGTH + 1}s'
+    f'{MAXIMUM_PASSWORD_LENGTH + 1}s{MAXIMUM_PASSWORD_LENGTH + 1}s'
+    f'{MAXIMUM_ORDER_URL_LENGTH + 1}s{MAXIMUM_ORDER_CONTACT_EMAIL_LENGTH + 1}s'
+    f'{MAXIMUM_ORDER_MOTTO_LENGTH + 1}s'
+)
+
+def _pack_string(value: str, max_length: int) -> bytes:
+    """Encode a string, cut to leave room for its NUL terminator."""
+    return value.encode('utf-8')[:max_length]
+
+def _unpack_string(raw: bytes) -> str:
+    """Decode a NUL-padded string field."""
+    return raw.split(b'\0', 1)[0].decode('utf-8', 'ignore')
+
+def _pack_date(value: Union[datetime, int]) -> int:
+    """Store a date as a Unix timestamp; new_order assigns plain ints."""
+    return int(value.timestamp()) if isinstance(value, datetime) else int(value)
+
 @dataclass
 class BungieNetOrderDatum:
     """Represents a Bungie.net order (clan/team) data structure"""
@@ -84,6 +106,55 @@ class BungieNetOrderDatum:
         if len(self.motto) > MAXIMUM_ORDER_MOTTO_LENGTH:
             self.motto = self.motto[:MAXIMUM_ORDER_MOTTO_LENGTH]
 
+    def copy_from(self, other: 'BungieNetOrderDatum') -> None:
+        """Assign every field from another datum in place.
+        
+        Nested objects are shared, not copied. Unlike __dict__.update this
+        also works if the class switches to __slots__.
+        """
+        for name in _ORDER_FIELD_NAMES:
+            setattr(self, name, getattr(other, name))
+
+    @classmethod
+    def size(cls) -> int:
+        """Get the size of the packed database record in bytes"""
+        return ORDER_RECORD_STRUCT.size
+
+    def to_bytes(self) -> bytes:
+        """Pack the order into its fixed-size database record
+        
+        Scores are not part of the record.
+        """
+        return ORDER_RECORD_STRUCT.pack(
+            self.order_id,
+            _pack_date(self.founding_date),
+            _pack_date(self.initial_date_below_three_members),
+            _pack_string(self.name, MAXIMUM_ORDER_NAME_LENGTH),
+            _pack_string(self.maintenance_password, MAXIMUM_PASSWORD_LENGTH),
+            _pack_string(self.member_password, MAXIMUM_PASSWORD_LENGTH),
+            _pack_string(self.url, MAXIMUM_ORDER_URL_LENGTH),
+            _pack_string(self.contact_email, MAXIMUM_ORDER_CONTACT_EMAIL_LENGTH),
+            _pack_string(self.motto, MAXIMUM_ORDER_MOTTO_LENGTH)
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'BungieNetOrderDatum':
+        """Unpack an order from its database record; data may be a memoryview"""
+        (order_id, founding_date, initial_date_below_three_members, name,
+         maintenance_password, member_password, url, contact_email,
+         motto) = ORDER_RECORD_STRUCT.unpack(data)
+        return cls(
+            order_id=order_id,
+            founding_date=datetime.fromtimestamp(founding_date),
+            initial_date_below_three_members=datetime.fromtimestamp(initial_date_below_three_members),
+            name=_unpack_string(name),
+            maintenance_password=_unpack_string(maintenance_password),
+            member_password=_unpack_string(member_password),
+            url=_unpack_string(url),
+            contact_email=_unpack_string(contact_email),
+            motto=_unpack_string(motto)
+        )
+
     def to_dict(self) -> dict:
         """Convert the order data to a dictionary for serialization"""
         return {
@@ -131,3 +202,5 @@ class BungieNetOrderDatum:
             ]
             
         return order
+
+_ORDER_FIELD_NAMES = tuple(f.name for f in fields(BungieNetOrderDatum))
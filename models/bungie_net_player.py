@@ -6,7 +6,7 @@ Refer to the file "License.txt" for details
 Converted to Python by Codeium
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Flag, IntFlag, auto
 from typing import List, Optional
@@ -25,6 +25,8 @@ STEFANS_MAXIMUM_ORDER_MEMBERS = 32
 MAXIMUM_PACKED_PLAYER_DATA_LENGTH = 128
 NUMBER_OF_TRACKED_OPPONENTS = 10
 
+UNSPECIFIED_IP = ipaddress.IPv4Address('0.0.0.0')
+
 class PlayerStatus(IntFlag):
     """Player status flags"""
     INACTIVE = 0
@@ -120,6 +122,21 @@ class BungieNetPlayerScoreDatum:
     def from_dict(cls, data: dict) -> 'BungieNetPlayerScoreDatum':
         return cls(**data)
 
+    def reset(self) -> None:
+        """Zero every counter in place"""
+        self.games_played = 0
+        self.wins = 0
+        self.losses = 0
+        self.ties = 0
+        self.damage_inflicted = 0
+        self.damage_received = 0
+        self.disconnects = 0
+        self.points = 0
+        self.rank = 0
+        self.highest_points = 0
+        self.highest_rank = 0
+        self.numerical_rank = 0
+
 @dataclass
 class AdditionalPlayerData:
     """Additional player metadata"""
@@ -134,7 +151,7 @@ class BungieNetPlayerDatum:
     password: str = field(default="", metadata={"max_length": MAXIMUM_PASSWORD_LENGTH})
     flags: PlayerFlags = field(default_factory=lambda: PlayerFlags(0))
     
-    last_login_ip: ipaddress.IPv4Address = field(default_factory=lambda: ipaddress.IPv4Address('0.0.0.0'))
+    last_login_ip: ipaddress.IPv4Address = UNSPECIFIED_IP
     last_login_time: datetime = field(default_factory=datetime.now)
     last_game_time: datetime = field(default_factory=datetime.now)
     last_ranked_game_time: datetime = field(default_factory=datetime.now)
@@ -192,6 +209,56 @@ class BungieNetPlayerDatum:
         if len(self.description) > MAXIMUM_DESCRIPTION_LENGTH:
             self.description = self.description[:MAXIMUM_DESCRIPTION_LENGTH]
 
+    def reset(self) -> None:
+        """Reset every field to its default in place.
+        
+        Buddy, color, score and opponent objects are cleared rather than
+        reallocated so a single datum can be reused across many reads.
+        """
+        now = datetime.now()
+        self.player_id = 0
+        self.login = ""
+        self.password = ""
+        self.flags = PlayerFlags(0)
+        self.last_login_ip = UNSPECIFIED_IP
+        self.last_login_time = now
+        self.last_game_time = now
+        self.last_ranked_game_time = now
+        self.room_id = 0
+        for buddy in self.buddies:
+            buddy.player_id = 0
+            buddy.active = False
+        self.order_index = 0
+        self.icon_index = 0
+        self.icon_collection_name = ""
+        self.name = ""
+        self.team_name = ""
+        self.description = ""
+        for color in (self.primary_color, self.secondary_color):
+            color.red = color.green = color.blue = color.flags = 0
+        self.ban_duration = 0
+        self.banned_time = now
+        self.times_banned = 0
+        self.country_code = 0
+        self.unranked_score.reset()
+        self.ranked_score.reset()
+        for score in self.ranked_scores_by_game_type:
+            score.reset()
+        self.last_opponent_index = 0
+        for i in range(len(self.last_opponents)):
+            self.last_opponents[i] = 0
+        self.aux_data.game_type_flags = GameTypeFlags(0)
+        self.aux_data.build_version = 0
+
+    def copy_from(self, other: 'BungieNetPlayerDatum') -> None:
+        """Assign every field from another datum in place.
+        
+        Nested objects are shared, not copied. Unlike __dict__.update this
+        also works if the class switches to __slots__.
+        """
+        for name in _PLAYER_FIELD_NAMES:
+            setattr(self, name, getattr(other, name))
+
     def to_dict(self) -> dict:
         """Convert player data to a dictionary for serialization"""
         return {
@@ -290,6 +357,8 @@ class BungieNetPlayerDatum:
 
         return player
 
+_PLAYER_FIELD_NAMES = tuple(f.name for f in fields(BungieNetPlayerDatum))
+
 @dataclass
 class BungieNetOnlinePlayerData:
     """Online player data"""
@@ -6,6 +6,7 @@ Provides metrics collection, performance tracking, and error monitoring.
 from .metrics import MetricsCollector
 from .logger import MonitoringLogger
 from .tracker import PerformanceTracker
+from .reservoir import SlidingTimeWindowArrayReservoir
 from ..services.monitoring_service import MonitoringService
 
-__all__ = ['MetricsCollector', 'MonitoringLogger', 'PerformanceTracker', 'MonitoringService']
+__all__ = ['MetricsCollector', 'MonitoringLogger', 'PerformanceTracker', 'SlidingTimeWindowArrayReservoir', 'MonitoringService']
@@ -0,0 +1,34 @@
+"""
+Numeric kernels for metric statistics over contiguous float64 arrays.
+
+When numba is installed the kernels are compiled eagerly at import, using
+explicit signatures, so no request pays a compile-on-first-call delay.
+Without it they run as plain numpy code.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # Fall back to the numpy implementations
+
+def _mean(values: np.ndarray) -> float:
+    return values.mean()
+
+def _variance(values: np.ndarray) -> float:
+    return values.var()
+
+def _percentile(values: np.ndarray, q: float) -> float:
+    # Selection (introselect) finds the k-th value without a full sort
+    index = min(int(len(values) * q), len(values) - 1)
+    return np.partition(values, index)[index]
+
+if njit is not None:
+    mean = njit('float64(float64[::1])', cache=True)(_mean)
+    variance = njit('float64(float64[::1])', cache=True)(_variance)
+    percentile = njit('float64(float64[::1], float64)', cache=True)(_percentile)
+else:
+    mean = _mean
+    variance = _variance
+    percentile = _percentile
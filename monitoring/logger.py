@@ -14,6 +14,21 @@ class LogEvent:
     message: str = ""
     context: Dict[str, Any] = field(default_factory=dict)
 
+class ContextFormatter(logging.Formatter):
+    """Formatter appending a record's context (passed as extra={"ctx": ...})
+    to its message as key=value pairs.
+
+    Context is only rendered here, so records dropped by level never pay
+    for it.
+    """
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        message = super().formatMessage(record)
+        context = getattr(record, "ctx", None)
+        if context:
+            message += " " + " ".join(f"{k}={v}" for k, v in context.items())
+        return message
+
 class MonitoringLogger:
     def __init__(self, name: str):
         self.logger = logging.getLogger(name)
@@ -22,7 +37,7 @@ class MonitoringLogger:
         # Add console handler if none exists
         if not self.logger.handlers:
             handler = logging.StreamHandler()
-            formatter = logging.Formatter(
+            formatter = ContextFormatter(
                 '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
             )
             handler.setFormatter(formatter)
@@ -36,13 +51,9 @@ class MonitoringLogger:
             context=context
         )
         
-        # Format context for logging
-        context_str = " ".join(f"{k}={v}" for k, v in context.items())
-        log_message = f"{message} {context_str}"
-        
-        # Log at appropriate level
+        # Log at appropriate level; the formatter renders the context
         log_method = getattr(self.logger, level.lower(), self.logger.info)
-        log_method(log_message)
+        log_method(message, extra={"ctx": context})
         
         return event
 
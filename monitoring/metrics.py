@@ -5,20 +5,83 @@ Metrics collection system for tracking server performance and resource usage.
 import time
 import asyncio
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
-from collections import deque
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from . import _kernels
+
+# Wall-clock time at monotonic zero, for displaying monotonic timestamps
+_WALL_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+_NO_LABELS: Mapping[str, Any] = MappingProxyType({})
 
 @dataclass
 class Metric:
     name: str
     value: float
-    timestamp: float = field(default_factory=time.time)
-    labels: Dict[str, str] = field(default_factory=dict)
+    timestamp_ns: int = field(default_factory=time.monotonic_ns)
+    labels: Mapping[str, Any] = field(default_factory=lambda: _NO_LABELS)  # Read-only, shared
+
+    @property
+    def datetime(self) -> datetime:
+        """Wall-clock time the metric was recorded, for display."""
+        return datetime.fromtimestamp((self.timestamp_ns + _WALL_OFFSET_NS) / 1e9)
+
+class MetricSeries:
+    """Fixed-capacity ring buffer of one metric's samples, stored as parallel columns.
+
+    Recording writes three scalars instead of allocating a Metric per sample;
+    Metric objects are only built when a caller asks for them.
+    """
+    __slots__ = ('timestamps', 'values', 'label_ids', 'head', 'size')
+
+    def __init__(self, capacity: int):
+        self.timestamps = np.empty(capacity, dtype=np.int64)
+        self.values = np.empty(capacity, dtype=np.float64)
+        self.label_ids = np.empty(capacity, dtype=np.int32)
+        self.head = 0  # Next slot to write
+        self.size = 0
+
+    def append(self, timestamp_ns: int, value: float, label_id: int) -> int:
+        """Write a sample, returning the label id of the sample it overwrote, or -1."""
+        head = self.head
+        capacity = len(self.values)
+        evicted = int(self.label_ids[head]) if self.size == capacity else -1
+        self.timestamps[head] = timestamp_ns
+        self.values[head] = value
+        self.label_ids[head] = label_id
+        self.head = (head + 1) % capacity
+        if self.size < capacity:
+            self.size += 1
+        return evicted
+
+    def latest_index(self) -> int:
+        return (self.head - 1) % len(self.values)
+
+    def order(self) -> np.ndarray:
+        """Get the slot indices in recording order, oldest first."""
+        if self.size < len(self.values):
+            return np.arange(self.size)
+        return np.roll(np.arange(self.size), -self.head)
 
 class MetricsCollector:
     def __init__(self, max_history: int = 1000):
-        self.metrics: Dict[str, deque[Metric]] = {}
+        self.series: Dict[str, MetricSeries] = {}
         self.max_history = max_history
+        # Interned label sets: each distinct set of labels is stored once, as
+        # a read-only mapping, and samples refer to it by index. Ids are
+        # reference counted per stored sample and reused once their last
+        # sample is overwritten, so the tables stay bounded by the samples
+        # held, as they were when each sample kept its own dict.
+        self._label_ids: Dict[Tuple[Tuple[str, Any], ...], int] = {}
+        self._label_keys: List[Tuple[Tuple[str, Any], ...]] = []
+        self._label_sets: List[Optional[Mapping[str, Any]]] = []
+        self._label_refs: List[int] = []
+        self._free_label_ids: List[int] = []
+        self._reset_labels()
         self._running = False
         self._task: Optional[asyncio.Task] = None
 
@@ -36,20 +99,101 @@ class MetricsCollector:
 
     def record(self, name: str, value: float, **labels):
         """Record a metric value."""
-        if name not in self.metrics:
-            self.metrics[name] = deque(maxlen=self.max_history)
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = MetricSeries(self.max_history)
         
-        metric = Metric(name=name, value=value, labels=labels)
-        self.metrics[name].append(metric)
+        evicted = series.append(time.monotonic_ns(), value, self._acquire_labels(labels))
+        if evicted > 0:
+            self._release_labels(evicted)
+
+    def _acquire_labels(self, labels: Dict[str, Any]) -> int:
+        """Get the id of a set of labels for one more stored sample, assigning one on first use."""
+        if not labels:
+            return 0  # The empty set is permanent and not counted
+        key = tuple(sorted(labels.items()))
+        label_id = self._label_ids.get(key)
+        if label_id is None:
+            mapping = MappingProxyType(dict(key))
+            if self._free_label_ids:
+                label_id = self._free_label_ids.pop()
+                self._label_keys[label_id] = key
+                self._label_sets[label_id] = mapping
+            else:
+                label_id = len(self._label_sets)
+                self._label_keys.append(key)
+                self._label_sets.append(mapping)
+                self._label_refs.append(0)
+            self._label_ids[key] = label_id
+        self._label_refs[label_id] += 1
+        return label_id
+
+    def _release_labels(self, label_id: int):
+        """Drop one stored sample's reference to a label set, freeing it with the last."""
+        self._label_refs[label_id] -= 1
+        if not self._label_refs[label_id]:
+            del self._label_ids[self._label_keys[label_id]]
+            self._label_keys[label_id] = ()
+            self._label_sets[label_id] = None
+            self._free_label_ids.append(label_id)
+
+    def reset_state(self):
+        """Forget all recorded metrics and label sets without stopping collection."""
+        self.series.clear()
+        self._reset_labels()
+
+    def _reset_labels(self):
+        self._label_ids.clear()
+        self._label_ids[()] = 0
+        self._label_keys[:] = [()]
+        self._label_sets[:] = [_NO_LABELS]
+        self._label_refs[:] = [0]
+        self._free_label_ids.clear()
 
     def get_metric(self, name: str) -> List[Metric]:
         """Get all recorded values for a metric."""
-        return list(self.metrics.get(name, []))
+        series = self.series.get(name)
+        if series is None:
+            return []
+        return [self._build_metric(name, series, int(i)) for i in series.order()]
 
     def get_latest(self, name: str) -> Optional[Metric]:
         """Get the most recent value for a metric."""
-        metrics = self.metrics.get(name, [])
-        return metrics[-1] if metrics else None
+        series = self.series.get(name)
+        if series is None or not series.size:
+            return None
+        return self._build_metric(name, series, series.latest_index())
+
+    def get_average(self, name: str) -> Optional[float]:
+        """Get the mean of the recorded values for a metric."""
+        values = self._values(name)
+        return float(_kernels.mean(values)) if values is not None else None
+
+    def get_variance(self, name: str) -> Optional[float]:
+        """Get the population variance of the recorded values for a metric."""
+        values = self._values(name)
+        return float(_kernels.variance(values)) if values is not None else None
+
+    def get_percentile(self, name: str, percentile: float) -> Optional[float]:
+        """Get the value at a specific percentile (0..1) for a metric."""
+        values = self._values(name)
+        return float(_kernels.percentile(values, percentile)) if values is not None else None
+
+    def _values(self, name: str) -> Optional[np.ndarray]:
+        """Get a metric's recorded values as a contiguous float64 array."""
+        series = self.series.get(name)
+        if series is None or not series.size:
+            return None
+        # Statistics don't depend on order, so the filled slots are used as-is
+        return series.values[:series.size]
+
+    def _build_metric(self, name: str, series: MetricSeries, index: int) -> Metric:
+        return Metric(
+            name=name,
+            value=float(series.values[index]),
+            timestamp_ns=int(series.timestamps[index]),
+            labels=self._label_sets[series.label_ids[index]]
+        )
 
     async def _collect_metrics(self):
         """Collect system metrics periodically."""
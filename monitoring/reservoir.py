@@ -0,0 +1,132 @@
+"""
+Sliding time window reservoir for duration statistics.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Sequence
+
+import numpy as np
+
+from . import _kernels
+
+NS_PER_SECOND = 1_000_000_000
+
+class Bucket:
+    """Samples recorded during one bucket interval, with their running aggregates."""
+    __slots__ = ('start_ns', 'count', 'total', 'total_sq', 'samples')
+
+    def __init__(self, start_ns: int):
+        self.start_ns = start_ns
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.samples: Deque[float] = deque()
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        self.samples.append(value)
+
+    def drop_oldest(self):
+        value = self.samples.popleft()
+        self.count -= 1
+        self.total -= value
+        self.total_sq -= value * value
+
+class SlidingTimeWindowArrayReservoir:
+    """Keeps the samples recorded within the last window_seconds.
+
+    Samples are grouped into buckets of bucket_seconds, each carrying its
+    count, sum and sum of squares, so the mean and deviation combine one
+    aggregate per bucket rather than every sample. Whole buckets fall out
+    of the window, making its edge accurate to one bucket interval.
+    max_size additionally caps memory under bursty load.
+    """
+
+    def __init__(self, window_seconds: float = 60.0, max_size: Optional[int] = None,
+                 clock: Callable[[], int] = time.monotonic_ns, bucket_seconds: float = 1.0):
+        self.window_ns = int(window_seconds * NS_PER_SECOND)
+        self.bucket_ns = max(1, int(bucket_seconds * NS_PER_SECOND))
+        self.max_size = max_size
+        self._clock = clock
+        self._buckets: Deque[Bucket] = deque()
+        self._count = 0
+        self._snapshot: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        self._trim(self._clock())
+        return self._count
+
+    def update(self, value: float):
+        """Record a sample."""
+        now = self._clock()
+        self._trim(now)
+        start_ns = now - now % self.bucket_ns
+        if not self._buckets or self._buckets[-1].start_ns != start_ns:
+            self._buckets.append(Bucket(start_ns))
+        self._buckets[-1].add(value)
+        self._count += 1
+        if self.max_size is not None and self._count > self.max_size:
+            self._drop_oldest_sample()
+        self._snapshot = None
+
+    def values(self) -> np.ndarray:
+        """Get the samples currently in the window, oldest first."""
+        self._trim(self._clock())
+        if self._snapshot is None:
+            self._snapshot = np.fromiter(
+                (value for bucket in self._buckets for value in bucket.samples),
+                dtype=np.float64,
+                count=self._count
+            )
+        return self._snapshot
+
+    def mean(self) -> Optional[float]:
+        """Get the mean of the samples in the window."""
+        self._trim(self._clock())
+        if not self._count:
+            return None
+        return sum(bucket.total for bucket in self._buckets) / self._count
+
+    def stddev(self) -> Optional[float]:
+        """Get the population standard deviation of the samples in the window."""
+        mean = self.mean()
+        if mean is None:
+            return None
+        mean_sq = sum(bucket.total_sq for bucket in self._buckets) / self._count
+        return math.sqrt(max(mean_sq - mean * mean, 0.0))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Get the sample at quantile q (0..1) of the window."""
+        values = self.values()
+        if not len(values):
+            return None
+        return float(_kernels.percentile(values, q))
+
+    def quantiles(self, qs: Sequence[float]) -> Optional[List[float]]:
+        """Get the samples at several quantiles (0..1) of the window at once."""
+        values = self.values()
+        n = len(values)
+        if not n:
+            return None
+        indices = np.minimum((np.asarray(qs, dtype=np.float64) * n).astype(np.intp), n - 1)
+        # One partition places every requested order statistic
+        return np.partition(values, indices)[indices].tolist()
+
+    def _trim(self, now: int):
+        cutoff = now - self.window_ns
+        buckets = self._buckets
+        if buckets and buckets[0].start_ns + self.bucket_ns <= cutoff:
+            while buckets and buckets[0].start_ns + self.bucket_ns <= cutoff:
+                self._count -= buckets.popleft().count
+            self._snapshot = None
+
+    def _drop_oldest_sample(self):
+        oldest = self._buckets[0]
+        oldest.drop_oldest()
+        self._count -= 1
+        if not oldest.count:
+            self._buckets.popleft()
@@ -4,10 +4,12 @@ Performance tracking system for monitoring application performance.
 
 import time
 import asyncio
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Sequence
 from dataclasses import dataclass, field
 from collections import deque
 
+from .reservoir import NS_PER_SECOND, SlidingTimeWindowArrayReservoir
+
 @dataclass
 class PerformanceMetric:
     operation: str
@@ -16,14 +18,19 @@ class PerformanceMetric:
     context: Dict[str, str] = field(default_factory=dict)
 
 class PerformanceTracker:
-    def __init__(self, max_history: int = 1000):
+    def __init__(self, max_history: int = 1000, clock: Callable[[], float] = time.perf_counter,
+                 window_seconds: float = 60.0):
         self.metrics: Dict[str, deque[PerformanceMetric]] = {}
         self.max_history = max_history
+        self.window_seconds = window_seconds
+        # Recent durations per operation, for average and percentile queries
+        self.reservoirs: Dict[str, SlidingTimeWindowArrayReservoir] = {}
+        self._clock = clock  # Monotonic source for durations; tests may swap it
         self._active_timers: Dict[str, float] = {}
 
     def start_operation(self, operation: str):
         """Start timing an operation."""
-        self._active_timers[operation] = time.time()
+        self._active_timers[operation] = self._clock()
 
     def stop_operation(self, operation: str, **context) -> Optional[PerformanceMetric]:
         """Stop timing an operation and record its duration."""
@@ -31,7 +38,7 @@ class PerformanceTracker:
         if start_time is None:
             return None
 
-        duration = time.time() - start_time
+        duration = self._clock() - start_time
         metric = PerformanceMetric(
             operation=operation,
             duration=duration,
@@ -40,30 +47,43 @@ class PerformanceTracker:
 
         if operation not in self.metrics:
             self.metrics[operation] = deque(maxlen=self.max_history)
+            self.reservoirs[operation] = SlidingTimeWindowArrayReservoir(
+                self.window_seconds, max_size=self.max_history, clock=self._clock_ns
+            )
         self.metrics[operation].append(metric)
+        self.reservoirs[operation].update(duration)
 
         return metric
 
+    def _clock_ns(self) -> int:
+        """The tracker's clock in nanoseconds, so windows expire on the same time source."""
+        return int(self._clock() * NS_PER_SECOND)
+
+    def reset_state(self):
+        """Forget all recorded metrics and running timers."""
+        self.metrics.clear()
+        self.reservoirs.clear()
+        self._active_timers.clear()
+
     def get_metrics(self, operation: str) -> List[PerformanceMetric]:
         """Get all metrics for a specific operation."""
         return list(self.metrics.get(operation, []))
 
     def get_average_duration(self, operation: str) -> Optional[float]:
-        """Get the average duration of an operation."""
-        metrics = self.metrics.get(operation, [])
-        if not metrics:
-            return None
-        return sum(m.duration for m in metrics) / len(metrics)
+        """Get the average duration of an operation over the sliding window."""
+        reservoir = self.reservoirs.get(operation)
+        return reservoir.mean() if reservoir else None
 
     def get_percentile_duration(self, operation: str, percentile: float) -> Optional[float]:
-        """Get the duration at a specific percentile for an operation."""
-        metrics = self.metrics.get(operation, [])
-        if not metrics:
-            return None
-        
-        sorted_durations = sorted(m.duration for m in metrics)
-        index = int(len(sorted_durations) * percentile)
-        return sorted_durations[index]
+        """Get the duration at a specific percentile for an operation over the sliding window."""
+        reservoir = self.reservoirs.get(operation)
+        return reservoir.quantile(percentile) if reservoir else None
+
+    def get_percentile_durations(self, operation: str,
+                                 percentiles: Sequence[float]) -> Optional[List[float]]:
+        """Get the durations at several percentiles for an operation over the sliding window."""
+        reservoir = self.reservoirs.get(operation)
+        return reservoir.quantiles(percentiles) if reservoir else None
 
     async def track_async(self, operation: str, coro, **context):
         """Track the duration of an async operation."""
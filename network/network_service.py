@@ -35,9 +35,20 @@ class NetworkService(NetworkInterface):
         self._server: Optional[asyncio.AbstractServer] = None
         self._clients: Dict[str, ClientConnection] = {}
         self._client_queues: Dict[str, asyncio.Queue] = {}
+        self._clients_changed: Optional[asyncio.Condition] = None  # Created on the running loop
+        
+    @property
+    def port(self) -> Optional[int]:
+        """Port the server is listening on, or None if not running.
+        
+        Useful after starting on port 0, where the kernel picks the port.
+        """
+        if not self._server or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
         
     async def start_server(self, host: str, port: int) -> None:
-        """Start the network server."""
+        """Start the network server; returns once it is accepting connections."""
         if self._server:
             logger.warning("Server already running")
             return
@@ -49,9 +60,6 @@ class NetworkService(NetworkInterface):
             
             addr = self._server.sockets[0].getsockname()
             logger.info(f"Server started on {addr}")
-            
-            async with self._server:
-                await self._server.serve_forever()
                 
         except Exception as e:
             logger.error(f"Failed to start server: {e}")
@@ -73,14 +81,25 @@ class NetworkService(NetworkInterface):
     async def broadcast(self, message: Any, exclude_clients: Optional[Set[str]] = None) -> None:
         """Broadcast a message to all connected clients."""
         exclude_clients = exclude_clients or set()
+        recipients = [
+            client for client_id, client in self._clients.items()
+            if client_id not in exclude_clients
+        ]
+        if not recipients:
+            return
         
-        for client_id, client in self._clients.items():
-            if client_id not in exclude_clients:
-                try:
-                    await self._send_message(client, message)
-                except Exception as e:
-                    logger.error(f"Failed to broadcast to client {client_id}: {e}")
-                    await self.disconnect_client(client_id)
+        # Encode once and hand the same bytes to every transport
+        data = self._encode_message(message)
+        for client in recipients:
+            client.writer.write(data)
+        results = await asyncio.gather(
+            *(client.writer.drain() for client in recipients), return_exceptions=True
+        )
+        
+        for client, result in zip(recipients, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to broadcast to client {client.id}: {result}")
+                await self.disconnect_client(client.id)
                     
     async def send_to_client(self, client_id: str, message: Any) -> bool:
         """Send a message to a specific client."""
@@ -114,11 +133,35 @@ class NetworkService(NetworkInterface):
         """Get set of all connected client IDs."""
         return set(self._clients.keys())
         
+    async def wait_for_clients(self, count: int, timeout: float = 1.0) -> bool:
+        """Wait until exactly count clients are registered.
+        
+        Args:
+            count: Number of connected clients to wait for
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            bool: True if the count was reached before the timeout
+        """
+        condition = self._get_clients_changed()
+        try:
+            async with condition:
+                await asyncio.wait_for(
+                    condition.wait_for(lambda: len(self._clients) == count), timeout
+                )
+            return True
+        except asyncio.TimeoutError:
+            return False
+        
     async def disconnect_client(self, client_id: str) -> bool:
         """Disconnect a specific client."""
-        client = self._clients.get(client_id)
+        # Unregister before closing: the connection handler also disconnects
+        # the client once its reader sees EOF, possibly while we await here
+        client = self._clients.pop(client_id, None)
         if not client:
             return False
+        self._client_queues.pop(client_id, None)
+        await self._notify_clients_changed()
             
         try:
             client.writer.close()
@@ -126,11 +169,6 @@ class NetworkService(NetworkInterface):
         except Exception as e:
             logger.error(f"Error closing client connection {client_id}: {e}")
             
-        del self._clients[client_id]
-        
-        if client_id in self._client_queues:
-            del self._client_queues[client_id]
-            
         logger.info(f"Client {client_id} disconnected")
         return True
         
@@ -163,6 +201,7 @@ class NetworkService(NetworkInterface):
         
         self._clients[client_id] = client
         self._client_queues[client_id] = asyncio.Queue()
+        await self._notify_clients_changed()
         
         peer_name = writer.get_extra_info("peername")
         logger.info(f"New connection from {peer_name} (client_id: {client_id})")
@@ -198,14 +237,30 @@ class NetworkService(NetworkInterface):
         except Exception as e:
             logger.error(f"Error processing client message: {e}")
             
+    def _get_clients_changed(self) -> asyncio.Condition:
+        """Get the condition signalled whenever a client registers or leaves."""
+        if self._clients_changed is None:
+            self._clients_changed = asyncio.Condition()
+        return self._clients_changed
+        
+    async def _notify_clients_changed(self) -> None:
+        """Wake tasks waiting in wait_for_clients."""
+        condition = self._get_clients_changed()
+        async with condition:
+            condition.notify_all()
+            
+    @staticmethod
+    def _encode_message(message: Any) -> bytes:
+        """Convert a message to the bytes sent on the wire."""
+        if isinstance(message, bytes):
+            return message
+        if isinstance(message, str):
+            return message.encode()
+        return str(message).encode()
+        
     async def _send_message(self, client: ClientConnection, message: Any) -> None:
         """Send a message to a client."""
-        if isinstance(message, str):
-            message = message.encode()
-        elif not isinstance(message, bytes):
-            message = str(message).encode()
-            
-        client.writer.write(message)
+        client.writer.write(self._encode_message(message))
         await client.writer.drain()
 
 # Global instance
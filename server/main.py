@@ -47,7 +47,7 @@ import struct
 from datetime import datetime
 import argparse
 
-from core.utils.environment import Environment
+from core.utils.cseries import MACHINE_TICKS_PER_SECOND
 from core.models.metaserver_common_structs import MetaserverCommonStructs
 from core.models.stats import Stats
 from core.auth.auth import Authentication
@@ -76,7 +76,7 @@ STDIN_SOCKET = 0
 INCOMING_QUEUE_SIZE = 65536
 OUTGOING_QUEUE_SIZE = 65536
 MAXIMUM_PACKET_LENGTH = 32767
-TICKS_BEFORE_UPDATING_ROOM_LIST = 45 * Environment.MACHINE_TICKS_PER_SECOND
+TICKS_BEFORE_UPDATING_ROOM_LIST = 45 * MACHINE_TICKS_PER_SECOND
 SECONDS_TO_WAIT_ON_SELECT = 60
 CLASS_C_NETMASK = 0xffffff00
 MINIMUM_NUMBER_OF_PLAYERS_IN_ORDER = 3
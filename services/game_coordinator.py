@@ -8,7 +8,7 @@ player coordination, and game state synchronization.
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from ..interfaces.game_coordinator_interface import (
     GameCoordinatorInterface,
@@ -24,7 +24,8 @@ logger = logging.getLogger(__name__)
 class GameCoordinator(GameCoordinatorInterface):
     """Service for coordinating game sessions."""
     
-    def __init__(self):
+    def __init__(self, now_func: Callable[[], datetime] = datetime.now):
+        self._now = now_func  # Clock for all coordinator timestamps; tests may swap it
         self.games: Dict[int, GameStatus] = {}
         self.players: Dict[int, Dict[int, PlayerStatus]] = {}  # game_id -> {user_id -> status}
         self._cleanup_task: Optional[asyncio.Task] = None
@@ -81,9 +82,12 @@ class GameCoordinator(GameCoordinatorInterface):
         if user_id in self.players[game_id]:
             return True  # Already in game
             
+        now = self._now()
         status = PlayerStatus(
             user_id=user_id,
-            team=team if game.team_game else None
+            team=team if game.team_game else None,
+            joined_at=now,
+            last_active=now
         )
         
         self.players[game_id][user_id] = status
@@ -154,7 +158,7 @@ class GameCoordinator(GameCoordinatorInterface):
             return False
             
         game.state = GameState.IN_PROGRESS
-        game.start_time = datetime.now()
+        game.start_time = self._now()
         
         # Notify all players
         for user_id in self.players[game_id]:
@@ -177,7 +181,7 @@ class GameCoordinator(GameCoordinatorInterface):
             return False
             
         game.state = GameState.COMPLETED
-        game.end_time = datetime.now()
+        game.end_time = self._now()
         
         # Record scores and notify players
         for user_id, score in scores.items():
@@ -217,7 +221,7 @@ class GameCoordinator(GameCoordinatorInterface):
         if game_id not in self.players or user_id not in self.players[game_id]:
             return False
             
-        self.players[game_id][user_id].last_active = datetime.now()
+        self.players[game_id][user_id].last_active = self._now()
         return True
         
     async def check_game_ready(self, game_id: int) -> Tuple[bool, Optional[str]]:
@@ -250,36 +254,39 @@ class GameCoordinator(GameCoordinatorInterface):
                 
         return True, None
         
+    async def _run_cleanup_once(self) -> None:
+        """End inactive games and drop finished ones, in a single pass."""
+        now = self._now()
+        
+        # Check each game
+        for game_id in list(self.games.keys()):
+            game = self.games[game_id]
+            
+            # End games that have been inactive too long
+            if game.state == GameState.IN_PROGRESS:
+                inactive_time = timedelta(minutes=30)
+                all_inactive = True
+                
+                for status in self.players[game_id].values():
+                    if now - status.last_active < inactive_time:
+                        all_inactive = False
+                        break
+                        
+                if all_inactive:
+                    logger.warning(f"Ending inactive game {game_id}")
+                    await self.end_game(game_id, {})
+                    
+            # Clean up completed/aborted games after a while
+            elif game.state in (GameState.COMPLETED, GameState.ABORTED):
+                if now - game.end_time > timedelta(minutes=5):
+                    del self.games[game_id]
+                    del self.players[game_id]
+        
     async def _cleanup_loop(self) -> None:
         """Periodically cleanup inactive games and players."""
         while True:
             try:
-                now = datetime.now()
-                
-                # Check each game
-                for game_id in list(self.games.keys()):
-                    game = self.games[game_id]
-                    
-                    # End games that have been inactive too long
-                    if game.state == GameState.IN_PROGRESS:
-                        inactive_time = timedelta(minutes=30)
-                        all_inactive = True
-                        
-                        for status in self.players[game_id].values():
-                            if now - status.last_active < inactive_time:
-                                all_inactive = False
-                                break
-                                
-                        if all_inactive:
-                            logger.warning(f"Ending inactive game {game_id}")
-                            await self.end_game(game_id, {})
-                            
-                    # Clean up completed/aborted games after a while
-                    elif game.state in (GameState.COMPLETED, GameState.ABORTED):
-                        if now - game.end_time > timedelta(minutes=5):
-                            del self.games[game_id]
-                            del self.players[game_id]
-                            
+                await self._run_cleanup_once()
                 await asyncio.sleep(60)  # Check every minute
                 
             except asyncio.CancelledError:
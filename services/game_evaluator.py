@@ -11,8 +11,9 @@ Copyright (c) 2002 Vishvananda Ishaya
 Copyright (c) 2003 Bill Keirstead
 """
 
-from typing import List, Optional
+from typing import Callable, List, Optional
 from dataclasses import dataclass
+import functools
 import logging
 
 from ..models.player import BungieNetPlayerDatum
@@ -26,6 +27,69 @@ UNRANKED_NORMAL = 2
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def _make_scorer(
+    number_of_teams: int,
+    game_type: int
+) -> Callable[[BungieNetPlayerDatum, int, int, int], None]:
+    """Build a standings scorer specialized for a game shape.
+    
+    The number of teams and the scoring game type are fixed for the whole
+    standings loop, so they are bound once here as closure constants
+    instead of being looked up on the standings for every player.
+    
+    Args:
+        number_of_teams: Number of teams in the game
+        game_type: Game scoring type used to index per-type scores
+        
+    Returns:
+        Function applying one player's result to their ranked scores
+    """
+    loser_place = number_of_teams - 1
+
+    def apply(
+        current_player: BungieNetPlayerDatum,
+        points_killed: int,
+        points_lost: int,
+        place: int
+    ) -> None:
+        ranked_score = current_player.ranked_score
+        type_score = current_player.ranked_scores_by_game_type[game_type]
+
+        # Adjust ranked score (for all game types)
+        ranked_score.damage_inflicted += points_killed
+        ranked_score.damage_received += points_lost
+        ranked_score.games_played += 1
+
+        # Adjust scores for specific game type
+        type_score.damage_inflicted += points_killed
+        type_score.damage_received += points_lost
+        type_score.games_played += 1
+
+        if place == 0:  # Winner
+            # Adjust wins & points for all game types
+            ranked_score.wins += 1
+            ranked_score.points += 3
+            if ranked_score.points > ranked_score.highest_points:
+                ranked_score.highest_points = ranked_score.points
+
+            # Adjust wins & points for specific game type
+            type_score.wins += 1
+            type_score.points += 3
+            if type_score.points > type_score.highest_points:
+                type_score.highest_points = type_score.points
+
+        elif place == loser_place:  # Loser
+            # Adjust losses and points for all game types
+            ranked_score.losses += 1
+            ranked_score.points -= 1
+
+            # Adjust losses for specific game type
+            type_score.losses += 1
+            type_score.points -= 1
+
+    return apply
+
 def find_player_struct_by_pid(
     player_id: int,
     player_count: int,
@@ -156,60 +220,34 @@ async def bungie_net_game_evaluate(
         return
         
     # Update player scores
-    player_scores = {}
-    for i in range(player_count):
-        player_id = current_standings.players[i].bungie_net_player_id
-        score = current_standings.players[i].points_killed - current_standings.players[i].points_lost
-        player_scores[player_id] = score
+    players = current_standings.players[:player_count]
+    player_scores = dict(zip(
+        [player.bungie_net_player_id for player in players],
+        [player.points_killed - player.points_lost for player in players]
+    ))
         
     # End game and record results
     await game_service.end_game(game_id, player_scores)
 
     # Treat unranked games as if they were ranked
     if game_classification in (RANKED_NORMAL, UNRANKED_NORMAL):
+        apply = _make_scorer(current_standings.number_of_teams, current_standings.game_scoring)
+
         # Go through reported_standings - only adjust winner and loser points
         for i in range(player_count):
-            current_player_id = current_standings.players[i].bungie_net_player_id
-            current_team = current_standings.players[i].team_index
-            current_player = find_player_struct_by_pid(current_player_id, player_count, bungie_net_players)
-            place = current_standings.teams[current_team].place
+            player_standing = current_standings.players[i]
+            current_player = find_player_struct_by_pid(
+                player_standing.bungie_net_player_id, player_count, bungie_net_players
+            )
 
             # Adjust games played, damage, and wins/losses/ties as appropriate
             if current_player is not None:
-                # Adjust ranked score (for all game types)
-                current_player.ranked_score.damage_inflicted += current_standings.players[i].points_killed
-                current_player.ranked_score.damage_received += current_standings.players[i].points_lost
-                current_player.ranked_score.games_played += 1
-
-                # Adjust scores for specific game type
-                game_type = current_standings.game_scoring
-                current_player.ranked_scores_by_game_type[game_type].damage_inflicted += current_standings.players[i].points_killed
-                current_player.ranked_scores_by_game_type[game_type].damage_received += current_standings.players[i].points_lost
-                current_player.ranked_scores_by_game_type[game_type].games_played += 1
-
-                if place == 0:  # Winner
-                    # Adjust wins & points for all game types
-                    current_player.ranked_score.wins += 1
-                    current_player.ranked_score.points += 3
-                    if current_player.ranked_score.points > current_player.ranked_score.highest_points:
-                        current_player.ranked_score.highest_points = current_player.ranked_score.points
-
-                    # Adjust wins & points for specific game type
-                    current_player.ranked_scores_by_game_type[game_type].wins += 1
-                    current_player.ranked_scores_by_game_type[game_type].points += 3
-                    if (current_player.ranked_scores_by_game_type[game_type].points >
-                        current_player.ranked_scores_by_game_type[game_type].highest_points):
-                        current_player.ranked_scores_by_game_type[game_type].highest_points = \
-                            current_player.ranked_scores_by_game_type[game_type].points
-
-                elif place == (current_standings.number_of_teams - 1):  # Loser
-                    # Adjust losses and points for all game types
-                    current_player.ranked_score.losses += 1
-                    current_player.ranked_score.points -= 1
-
-                    # Adjust losses for specific game type
-                    current_player.ranked_scores_by_game_type[game_type].losses += 1
-                    current_player.ranked_scores_by_game_type[game_type].points -= 1
+                apply(
+                    current_player,
+                    player_standing.points_killed,
+                    player_standing.points_lost,
+                    current_standings.teams[player_standing.team_index].place
+                )
 
 def scoring_datum_adjust_total(
     score_by_game_types: List[BungieNetPlayerDatum],
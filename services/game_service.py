@@ -24,7 +24,6 @@ from ..models.game import (
 )
 from ..models.bungie_net_structures import BungieNetPlayerScoreDatum, BungieNetGameDatum
 from ..models.game_search_types import NewGameParameterData
-from ..utils.environment import Environment
 
 logger = logging.getLogger(__name__)
 
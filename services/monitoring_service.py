@@ -3,7 +3,7 @@ Monitoring service for coordinating metrics collection, logging, and performance
 """
 
 import asyncio
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -19,17 +19,21 @@ class Alert:
     context: Dict[str, str] = field(default_factory=dict)
 
 class MonitoringService:
-    def __init__(self):
+    def __init__(self, cycle_interval: float = 5.0):
+        self.cycle_interval = cycle_interval  # Seconds between performance checks
         self.metrics = MetricsCollector()
         self.logger = MonitoringLogger("myth.monitoring")
         self.tracker = PerformanceTracker()
         self._alert_handlers: Dict[str, callable] = {}
+        self._handler_tasks: Set[asyncio.Task] = set()
         self._running = False
         self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
 
     async def start(self):
         """Start the monitoring service."""
         self._running = True
+        self._wake = asyncio.Event()
         await self.metrics.start()
         self._task = asyncio.create_task(self._monitor_performance())
         self.logger.info("Monitoring service started")
@@ -38,11 +42,21 @@ class MonitoringService:
         """Stop the monitoring service."""
         if self._running:
             self._running = False
+            self._wake.set()  # Don't wait out the current cycle interval
             await self.metrics.stop()
             if self._task:
                 await self._task
             self.logger.info("Monitoring service stopped")
 
+    def reset_state(self):
+        """Drop alert handlers and recorded metrics, keeping the service running."""
+        self._alert_handlers.clear()
+        for task in self._handler_tasks:
+            task.cancel()
+        self._handler_tasks.clear()
+        self.metrics.reset_state()
+        self.tracker.reset_state()
+
     def register_alert_handler(self, level: str, handler: callable):
         """Register a handler for alerts of a specific level."""
         self._alert_handlers[level] = handler
@@ -57,46 +71,54 @@ class MonitoringService:
         # Call registered handler if exists
         handler = self._alert_handlers.get(level)
         if handler:
-            asyncio.create_task(handler(alert))
+            task = asyncio.create_task(handler(alert))
+            self._handler_tasks.add(task)
+            task.add_done_callback(self._handler_tasks.discard)
 
     async def _monitor_performance(self):
         """Monitor performance metrics and raise alerts if needed."""
         while self._running:
-            # Check CPU usage
-            cpu_usage = self.metrics.get_latest("system.cpu_percent")
-            if cpu_usage and cpu_usage.value > 80:
-                self.alert(
-                    "WARNING",
-                    "High CPU usage detected",
-                    cpu_percent=f"{cpu_usage.value:.1f}%"
-                )
+            await self._run_cycle()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.cycle_interval)
+            except asyncio.TimeoutError:
+                pass
 
-            # Check memory usage
-            memory_usage = self.metrics.get_latest("system.memory_percent")
-            if memory_usage and memory_usage.value > 80:
-                self.alert(
-                    "WARNING",
-                    "High memory usage detected",
-                    memory_percent=f"{memory_usage.value:.1f}%"
-                )
+    async def _run_cycle(self):
+        """Run one round of performance checks, raising alerts as needed."""
+        # Check CPU usage
+        cpu_usage = self.metrics.get_latest("system.cpu_percent")
+        if cpu_usage and cpu_usage.value > 80:
+            self.alert(
+                "WARNING",
+                "High CPU usage detected",
+                cpu_percent=f"{cpu_usage.value:.1f}%"
+            )
+
+        # Check memory usage
+        memory_usage = self.metrics.get_latest("system.memory_percent")
+        if memory_usage and memory_usage.value > 80:
+            self.alert(
+                "WARNING",
+                "High memory usage detected",
+                memory_percent=f"{memory_usage.value:.1f}%"
+            )
+
+        # Check connection count
+        connections = self.metrics.get_latest("app.active_connections")
+        if connections and connections.value > 90:
+            self.alert(
+                "WARNING",
+                "High connection count",
+                connection_count=str(int(connections.value))
+            )
 
-            # Check connection count
-            connections = self.metrics.get_latest("app.active_connections")
-            if connections and connections.value > 90:
+        # Check operation latencies
+        for operation in ["game_update", "room_update", "player_update"]:
+            avg_duration = self.tracker.get_average_duration(operation)
+            if avg_duration and avg_duration > 0.1:  # 100ms threshold
                 self.alert(
                     "WARNING",
-                    "High connection count",
-                    connection_count=str(int(connections.value))
+                    f"High {operation} latency",
+                    duration=f"{avg_duration*1000:.1f}ms"
                 )
-
-            # Check operation latencies
-            for operation in ["game_update", "room_update", "player_update"]:
-                avg_duration = self.tracker.get_average_duration(operation)
-                if avg_duration and avg_duration > 0.1:  # 100ms threshold
-                    self.alert(
-                        "WARNING",
-                        f"High {operation} latency",
-                        duration=f"{avg_duration*1000:.1f}ms"
-                    )
-
-            await asyncio.sleep(5)  # Check every 5 seconds
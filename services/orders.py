@@ -12,16 +12,17 @@ Copyright (c) 2003 Bill Keirstead
 All rights reserved.
 """
 
+import mmap
 import os
+import struct
 import time
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator
 import logging
 from pathlib import Path
 
-from ..utils.environment import Environment
+from ..utils.environment import DB_DIRECTORY
 from ..models.metaserver_common_structs import MetaserverCommonStructs
-from ..utils.rb_tree import RBTree, RBNode
 from ..models.stats import Stats
 from ..models.bungie_net_player import BungieNetPlayerDatum
 from ..models.bungie_net_order import BungieNetOrderDatum
@@ -31,11 +32,21 @@ BUNGIE_NET_ORDER_DB_SIGNATURE = 0x4f524452  # 'ORDR'
 UNUSED_ORDER_ID = 0xFFFFFFFF
 MAXIMUM_ORDER_NAME_LENGTH = 32
 
+# Precompiled on-disk layouts
+UINT32_STRUCT = struct.Struct('<I')  # Entry signature / header order count
+HEADER_STRUCT = struct.Struct('<I40I')  # Order count followed by unused words
+PACKED_ORDER_SIGNATURE = UINT32_STRUCT.pack(BUNGIE_NET_ORDER_DB_SIGNATURE)
+
+# Fixed file geometry: header, then signature + order datum per entry
+ORDER_SIZE = BungieNetOrderDatum.size()
+ORDER_ENTRY_SIZE = UINT32_STRUCT.size + ORDER_SIZE
+HEADER_END = HEADER_STRUCT.size
+
 @dataclass
 class OrderDatabaseHeader:
     """Header structure for the order database."""
     order_count: int = 0
-    unused: List[int] = field(default_factory=lambda: [0] * 40)
+    unused: bytes = bytes(HEADER_END - UINT32_STRUCT.size)  # 40 reserved words
 
 @dataclass
 class OrderDatabaseEntry:
@@ -45,7 +56,7 @@ class OrderDatabaseEntry:
 
 @dataclass
 class OrderNameTreeData:
-    """Data structure for order name tree nodes."""
+    """Data structure for order name index entries."""
     order_name: str = ""
     file_position: int = 0
 
@@ -54,15 +65,16 @@ class OrderDatabase:
     
     def __init__(self):
         self.logger = logging.getLogger("OrderDatabase")
-        self.db_file = None
+        self.db_fd: int = -1
+        self.db_map: Optional[mmap.mmap] = None
         self.total_orders = 0
-        self.order_name_tree = RBTree("order name tree")
+        self.order_name_index: Dict[str, OrderNameTreeData] = {}  # Maps lowercase name to entry
         self.order_id_indexes: Dict[int, int] = {}  # Maps order_id to file position
-        self.search_order_id = -1
+        self.search_order_ids: Iterator[int] = iter(())
 
     def get_orders_db_file_name(self) -> str:
         """Get the path to the orders database file."""
-        return str(Path(Environment.get_data_dir()) / "orders.db")
+        return str(Path(DB_DIRECTORY) / "orders.db")
 
     def create_order_database(self) -> bool:
         """Create a new order database file."""
@@ -70,56 +82,68 @@ class OrderDatabase:
             header = OrderDatabaseHeader()
             file_name = self.get_orders_db_file_name()
             
-            with open(file_name, "wb") as f:
-                # Write header
-                f.write(header.order_count.to_bytes(4, 'little'))
-                for unused in header.unused:
-                    f.write(unused.to_bytes(4, 'little'))
-                    
-            self.db_file = open(file_name, "r+b")
+            self.db_fd = os.open(file_name, os.O_CREAT | os.O_RDWR | os.O_TRUNC)
+            os.write(self.db_fd, UINT32_STRUCT.pack(header.order_count) + header.unused)
+            self.db_map = mmap.mmap(self.db_fd, 0)
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to create order database: {e}")
+            self.logger.error("Failed to create order database: %s", e)
             return False
 
     def initialize_order_database(self) -> bool:
         """Initialize the order database and load existing entries."""
         try:
             file_name = self.get_orders_db_file_name()
-            self.db_file = open(file_name, "r+b")
+            self.db_fd = os.open(file_name, os.O_RDWR)
+            self._advise_access(getattr(os, "POSIX_FADV_SEQUENTIAL", None))
             
             # Read header
-            self.db_file.seek(0)
-            header_bytes = self.db_file.read(4)  # Read order count
-            order_count = int.from_bytes(header_bytes, 'little')
+            order_count = HEADER_STRUCT.unpack(os.pread(self.db_fd, HEADER_END, 0))[0]
             
-            # Skip unused header space
-            self.db_file.seek(4 + 40 * 4)  # Move past header
+            # Read the whole entry table at once and parse it in place
+            entries = memoryview(os.pread(self.db_fd, order_count * ORDER_ENTRY_SIZE, HEADER_END))
             
-            # Read all entries
-            for i in range(order_count):
-                entry_pos = self.db_file.tell()
-                signature = int.from_bytes(self.db_file.read(4), 'little')
+            table_end = len(entries) - len(entries) % ORDER_ENTRY_SIZE
+            entry_pos = HEADER_END
+            for offset in range(0, table_end, ORDER_ENTRY_SIZE):
+                signature = UINT32_STRUCT.unpack_from(entries, offset)[0]
                 
                 if signature == BUNGIE_NET_ORDER_DB_SIGNATURE:
-                    order = BungieNetOrderDatum.from_bytes(self.db_file.read())
+                    order = BungieNetOrderDatum.from_bytes(entries[offset + 4:offset + ORDER_ENTRY_SIZE])
                     if order.order_id != UNUSED_ORDER_ID:
                         self.order_id_indexes[order.order_id] = entry_pos
-                        self._add_entry_to_order_name_tree(order, entry_pos)
+                        self._add_entry_to_order_name_index(order, entry_pos)
+                entry_pos += ORDER_ENTRY_SIZE
                         
+            self.db_map = mmap.mmap(self.db_fd, 0)
+            self._advise_access(getattr(os, "POSIX_FADV_RANDOM", None))
             self.total_orders = order_count
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to initialize order database: {e}")
+            self.logger.error("Failed to initialize order database: %s", e)
             return False
 
+    def _advise_access(self, advice: Optional[int]) -> None:
+        """Hint the kernel about the upcoming access pattern, where supported."""
+        if advice is None or not hasattr(os, "posix_fadvise"):
+            return
+        try:
+            os.posix_fadvise(self.db_fd, 0, 0, advice)
+        except OSError as e:
+            self.logger.debug("posix_fadvise not applied: %s", e)
+
     def shutdown_order_database(self) -> None:
         """Close the order database."""
-        if self.db_file:
-            self.db_file.close()
-            self.db_file = None
+        if self.db_map:
+            # Entries are written into the mapping; sync them once, here
+            self.db_map.flush()
+            self.db_map.close()
+            self.db_map = None
+        if self.db_fd != -1:
+            os.close(self.db_fd)
+            self.db_fd = -1
 
     def get_order_count(self) -> int:
         """Get the total number of orders in the database."""
@@ -127,16 +151,14 @@ class OrderDatabase:
 
     def get_first_order_information(self, order: BungieNetOrderDatum) -> bool:
         """Get information about the first order in the database."""
-        self.search_order_id = 1
+        self.search_order_ids = iter(sorted(self.order_id_indexes))
         return self.get_next_order_information(order)
 
     def get_next_order_information(self, order: BungieNetOrderDatum) -> bool:
         """Get information about the next order in the database."""
-        while self.search_order_id <= self.total_orders:
-            if self.get_order_information(None, self.search_order_id, order):
-                self.search_order_id += 1
+        for order_id in self.search_order_ids:
+            if self.get_order_information(None, order_id, order):
                 return True
-            self.search_order_id += 1
         return False
 
     def get_order_information(self, order_name: Optional[str], order_id: int, 
@@ -144,31 +166,23 @@ class OrderDatabase:
         """Get order information by name or ID."""
         try:
             if order_id and order_id in self.order_id_indexes:
-                file_pos = self.order_id_indexes[order_id]
-                self.db_file.seek(file_pos)
-                signature = int.from_bytes(self.db_file.read(4), 'little')
-                if signature == BUNGIE_NET_ORDER_DB_SIGNATURE:
-                    order_data = BungieNetOrderDatum.from_bytes(self.db_file.read())
-                    if order_data.order_id != UNUSED_ORDER_ID:
-                        order.__dict__.update(order_data.__dict__)
-                        return True
+                order_data = self._read_entry(self.order_id_indexes[order_id])
+                if order_data and order_data.order_id != UNUSED_ORDER_ID:
+                    order.copy_from(order_data)
+                    return True
                         
             elif order_name:
-                node = self.order_name_tree.search(order_name)
-                if node:
-                    data: OrderNameTreeData = node.data
-                    self.db_file.seek(data.file_position)
-                    signature = int.from_bytes(self.db_file.read(4), 'little')
-                    if signature == BUNGIE_NET_ORDER_DB_SIGNATURE:
-                        order_data = BungieNetOrderDatum.from_bytes(self.db_file.read())
-                        if order_data.order_id != UNUSED_ORDER_ID:
-                            order.__dict__.update(order_data.__dict__)
-                            return True
+                data = self.order_name_index.get(order_name.lower())
+                if data:
+                    order_data = self._read_entry(data.file_position)
+                    if order_data and order_data.order_id != UNUSED_ORDER_ID:
+                        order.copy_from(order_data)
+                        return True
                             
             return False
             
         except Exception as e:
-            self.logger.error(f"Failed to get order information: {e}")
+            self.logger.error("Failed to get order information: %s", e)
             return False
 
     def update_order_information(self, order_name: Optional[str], order_id: int, 
@@ -177,56 +191,49 @@ class OrderDatabase:
         try:
             if order_id and order_id in self.order_id_indexes:
                 file_pos = self.order_id_indexes[order_id]
-                self.db_file.seek(file_pos)
-                self.db_file.write(BUNGIE_NET_ORDER_DB_SIGNATURE.to_bytes(4, 'little'))
-                self.db_file.write(order.to_bytes())
+                self._write_entry(file_pos, order)
                 return True
                 
             elif order_name:
-                node = self.order_name_tree.search(order_name)
-                if node:
-                    data: OrderNameTreeData = node.data
-                    self.db_file.seek(data.file_position)
-                    self.db_file.write(BUNGIE_NET_ORDER_DB_SIGNATURE.to_bytes(4, 'little'))
-                    self.db_file.write(order.to_bytes())
+                data = self.order_name_index.get(order_name.lower())
+                if data:
+                    self._write_entry(data.file_position, order)
                     return True
                     
             return False
             
         except Exception as e:
-            self.logger.error(f"Failed to update order information: {e}")
+            self.logger.error("Failed to update order information: %s", e)
             return False
 
     def new_order(self, order: BungieNetOrderDatum) -> bool:
         """Create a new order in the database."""
         try:
             # Check if order name already exists
-            if self.order_name_tree.search(order.name):
+            if order.name.lower() in self.order_name_index:
                 return False
 
-            # Update header
-            self.db_file.seek(0)
-            self.total_orders += 1
-            self.db_file.write(self.total_orders.to_bytes(4, 'little'))
-
-            # Write new order entry
-            file_pos = 4 + 40 * 4 + (self.total_orders - 1) * (4 + BungieNetOrderDatum.size())
-            self.db_file.seek(file_pos)
+            order_id = self.total_orders + 1
+            file_pos = HEADER_END + (order_id - 1) * ORDER_ENTRY_SIZE
             
-            order.order_id = self.total_orders
+            order.order_id = order_id
             order.founding_date = int(time.time())
+            payload = PACKED_ORDER_SIGNATURE + order.to_bytes()
             
-            self.db_file.write(BUNGIE_NET_ORDER_DB_SIGNATURE.to_bytes(4, 'little'))
-            self.db_file.write(order.to_bytes())
+            # Append the entry first so the header never counts an unwritten order
+            self.db_map.resize(file_pos + len(payload))
+            self.db_map[file_pos:file_pos + len(payload)] = payload
+            UINT32_STRUCT.pack_into(self.db_map, 0, order_id)
+            self.total_orders = order_id
             
             # Update indexes
             self.order_id_indexes[order.order_id] = file_pos
-            self._add_entry_to_order_name_tree(order, file_pos)
+            self._add_entry_to_order_name_index(order, file_pos)
             
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to create new order: {e}")
+            self.logger.error("Failed to create new order: %s", e)
             return False
 
     def mark_order_as_unused(self, order_id: int) -> None:
@@ -236,15 +243,28 @@ class OrderDatabase:
             order.order_id = UNUSED_ORDER_ID
             self.update_order_information(None, order_id, order)
 
-    def _add_entry_to_order_name_tree(self, order: BungieNetOrderDatum, file_pos: int) -> bool:
-        """Add an entry to the order name tree."""
-        try:
-            data = OrderNameTreeData(order.name, file_pos)
-            self.order_name_tree.insert(order.name.lower(), data)
-            return True
-        except Exception as e:
-            self.logger.error(f"Failed to add entry to order name tree: {e}")
-            return False
+    def _read_entry(self, file_pos: int) -> Optional[BungieNetOrderDatum]:
+        """Parse the order entry at file_pos directly from the mapped database.
+        
+        The datum is decoded from a memoryview over the mapping rather than a
+        copied slice. The views are released before returning so the mapping
+        can still be resized by new_order.
+        """
+        if UINT32_STRUCT.unpack_from(self.db_map, file_pos)[0] != BUNGIE_NET_ORDER_DB_SIGNATURE:
+            return None
+        with memoryview(self.db_map) as view:
+            with view[file_pos + UINT32_STRUCT.size:file_pos + ORDER_ENTRY_SIZE] as order_bytes:
+                return BungieNetOrderDatum.from_bytes(order_bytes)
+
+    def _write_entry(self, file_pos: int, order: BungieNetOrderDatum) -> None:
+        """Store an order entry in place in the mapped database."""
+        payload = PACKED_ORDER_SIGNATURE + order.to_bytes()
+        self.db_map[file_pos:file_pos + len(payload)] = payload
+
+    def _add_entry_to_order_name_index(self, order: BungieNetOrderDatum, file_pos: int) -> bool:
+        """Add an entry to the order name index."""
+        self.order_name_index[order.name.lower()] = OrderNameTreeData(order.name, file_pos)
+        return True
 
 # Global instance
 order_database = OrderDatabase()
@@ -7,22 +7,20 @@ Refer to the file "License.txt" for details
 import enum
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any, Tuple
-from functools import lru_cache
 import logging
+from functools import lru_cache
 from pathlib import Path
 
-from ..utils.environment import Environment
+import numpy as np
+
 from ..models.stats import Stats
 from ..security.authentication import Authentication
 from ..models.metaserver_common_structs import MetaserverCommonStructs, RGBColor
 from ..models.bungie_net_player import BungieNetPlayerDatum, BungieNetPlayerScoreDatum
 from ..models.bungie_net_order import BungieNetOrderDatum
-from .users import Users
+from .users import user_database
 from .orders import order_database
 
-# Cache size for frequently accessed data
-RANK_CACHE_SIZE = 1024
-
 # Constants
 NUMBER_OF_RANKING_PASSES = 17
 MAXIMUM_DATABASE_OPERATIONS_PER_CALL = 1000
@@ -67,6 +65,11 @@ class RankConstants(enum.IntEnum):
     NUMBER_OF_RANKED_GAME_TYPES = 8
     NUMBER_OF_NORMAL_CASTES = 12
 
+# Plain-int copies of enum values used in per-player code
+_GAMES_PLAYED_KRIS_DAGGER = int(RankConstants.GAMES_PLAYED_KRIS_DAGGER_CASTE)
+_DAGGER = int(BungieRank.DAGGER)
+_UNRANKED = (_DAGGER, 0)
+
 class UserIndex(enum.IntEnum):
     """User index constants"""
     COMET = 0
@@ -83,6 +86,27 @@ RANK_PERCENTAGES = [
     0.00, 0.00, 0.00, 0.16, 0.15, 0.14,
     0.12, 0.11, 0.10, 0.09, 0.07, 0.06
 ]
+_RANK_PERCENTAGES = np.array(RANK_PERCENTAGES)
+
+# Score fields kept as rows of RankingSystem's column block, in RankingMetrics order
+_SCORE_COLUMNS = ('points', 'games_played', 'wins', 'damage_inflicted', 'damage_received')
+
+@lru_cache(maxsize=16)
+def _caste_start_indexes(total_players: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the populated castes and the ranking index each one starts at.
+    
+    Each caste holds a fixed share of the players and starts after all
+    the players placed in the castes above it, so the indexes depend only
+    on the player count.
+    """
+    players_in_caste = (total_players * _RANK_PERCENTAGES).astype(np.int64)
+    populated = np.flatnonzero(players_in_caste > 0)
+    first_index = np.cumsum(players_in_caste) - players_in_caste
+    return populated, first_index[populated]
+
+# Shared all-zero score used to fill per-game-type lists. Ranking passes
+# replace list entries with new score objects; they never mutate this one.
+_ZERO_SCORE = BungieNetPlayerScoreDatum()
 
 @dataclass
 class BungieNetPlayerStats:
@@ -102,12 +126,12 @@ class BungieNetPlayerStats:
     unranked_score_datum: BungieNetPlayerScoreDatum = field(default_factory=BungieNetPlayerScoreDatum)
     ranked_score_datum: BungieNetPlayerScoreDatum = field(default_factory=BungieNetPlayerScoreDatum)
     ranked_score_datum_by_game_type: List[BungieNetPlayerScoreDatum] = field(
-        default_factory=lambda: [BungieNetPlayerScoreDatum() for _ in range(MAXIMUM_NUMBER_OF_GAME_TYPES)]
+        default_factory=lambda: [_ZERO_SCORE] * MAXIMUM_NUMBER_OF_GAME_TYPES
     )
     order_unranked_score_datum: BungieNetPlayerScoreDatum = field(default_factory=BungieNetPlayerScoreDatum)
     order_ranked_score_datum: BungieNetPlayerScoreDatum = field(default_factory=BungieNetPlayerScoreDatum)
     order_ranked_score_datum_by_game_type: List[BungieNetPlayerScoreDatum] = field(
-        default_factory=lambda: [BungieNetPlayerScoreDatum() for _ in range(MAXIMUM_NUMBER_OF_GAME_TYPES)]
+        default_factory=lambda: [_ZERO_SCORE] * MAXIMUM_NUMBER_OF_GAME_TYPES
     )
     login: str = ""
     name: str = ""
@@ -139,6 +163,9 @@ class GameRankData:
     damage_inflicted: RankingData = field(default_factory=RankingData)
     damage_received: RankingData = field(default_factory=RankingData)
 
+# Shared empty game rank data, replaced rather than mutated like _ZERO_SCORE
+_EMPTY_GAME_RANK = GameRankData()
+
 @dataclass
 class OverallRankingData:
     """Overall ranking data structure"""
@@ -152,12 +179,12 @@ class OverallRankingData:
     unranked_game_data: GameRankData = field(default_factory=GameRankData)
     ranked_game_data: GameRankData = field(default_factory=GameRankData)
     ranked_game_data_by_game_type: List[GameRankData] = field(
-        default_factory=lambda: [GameRankData() for _ in range(MAXIMUM_NUMBER_OF_GAME_TYPES)]
+        default_factory=lambda: [_EMPTY_GAME_RANK] * MAXIMUM_NUMBER_OF_GAME_TYPES
     )
     order_unranked_game_data: GameRankData = field(default_factory=GameRankData)
     order_ranked_game_data: GameRankData = field(default_factory=GameRankData)
     order_ranked_game_data_by_game_type: List[GameRankData] = field(
-        default_factory=lambda: [GameRankData() for _ in range(MAXIMUM_NUMBER_OF_GAME_TYPES)]
+        default_factory=lambda: [_EMPTY_GAME_RANK] * MAXIMUM_NUMBER_OF_GAME_TYPES
     )
 
 @dataclass
@@ -204,31 +231,105 @@ class RankingMetrics:
         self.damage_inflicted += score.damage_inflicted
         self.damage_received += score.damage_received
 
+    def update_from_columns(self, columns: np.ndarray) -> None:
+        """Update metrics with every player's score in one reduction.
+        
+        Args:
+            columns: Block with one row per metric field and one column per player
+        """
+        points, games_played, wins, damage_inflicted, damage_received = columns.sum(axis=1).tolist()
+        self.points += points
+        self.games_played += games_played
+        self.wins += wins
+        self.damage_inflicted += damage_inflicted
+        self.damage_received += damage_received
+
 class RankingSystem:
     """Handles player ranking calculations and updates with optimizations"""
     
     def __init__(self):
         self.logger = logging.getLogger("RankingSystem")
+        self._scratch_player = BungieNetPlayerDatum()  # Reused by update_database_on_ranking
         self._reset_state()
 
     def _reset_state(self) -> None:
         """Reset internal state - useful for testing and cleanup"""
-        self.ranking_data: List[RawRankData] = []
+        self.ranking_data = []
         self.present_ranking: int = 0
         self.rank_cache: Dict[int, Tuple[int, int]] = {}  # player_id -> (rank, points)
         self.caste_breakpoints: Optional[CasteBreakpointData] = None
+        self._clear_arrays()
+
+    @property
+    def ranking_data(self) -> List[RawRankData]:
+        """Players to rank; assigning a new list drops the column arrays.
+        
+        Edit entries in place only before the next sort or build, or
+        assign the list again afterwards so the columns are rebuilt.
+        """
+        return self._ranking_data
+
+    @ranking_data.setter
+    def ranking_data(self, ranking_data: List[RawRankData]) -> None:
+        self._ranking_data = ranking_data
+        self._clear_arrays()
+
+    def _clear_arrays(self) -> None:
+        """Drop the column arrays built from ranking_data"""
+        self._ids: Optional[np.ndarray] = None
+        self._score_columns: Optional[np.ndarray] = None
+        self._points: Optional[np.ndarray] = None
+        self._games_played: Optional[np.ndarray] = None
+        self._wins: Optional[np.ndarray] = None
+        self._damage_inflicted: Optional[np.ndarray] = None
+        self._damage_received: Optional[np.ndarray] = None
+
+    def _rebuild_arrays(self) -> None:
+        """Materialize ranking_data as one NumPy column per score field"""
+        count = len(self.ranking_data)
+        scores = [rank_data.score for rank_data in self.ranking_data]
+        self._ids = np.fromiter((rank_data.id for rank_data in self.ranking_data), dtype=np.int64, count=count)
+        self._score_columns = np.array(
+            [[getattr(score, name) for score in scores] for name in _SCORE_COLUMNS],
+            dtype=np.int64
+        ).reshape(len(_SCORE_COLUMNS), count)
+        self._bind_score_columns()
+
+    def _bind_score_columns(self) -> None:
+        """Point the per-field attributes at the rows of the column block"""
+        (self._points, self._games_played, self._wins,
+         self._damage_inflicted, self._damage_received) = self._score_columns
+
+    def _ensure_arrays(self) -> None:
+        """Rebuild the column arrays if they were dropped or ranking_data changed size"""
+        if self._points is None or len(self._points) != len(self.ranking_data):
+            self._rebuild_arrays()
 
     def _clear_caches(self) -> None:
         """Clear all cached data"""
         self.rank_cache.clear()
         self.caste_breakpoints = None
+        self._clear_arrays()
 
-    @lru_cache(maxsize=RANK_CACHE_SIZE)
     def get_player_rank(self, player_id: int) -> Tuple[int, int]:
-        """Get a player's rank and points (cached)"""
-        if player_id in self.rank_cache:
-            return self.rank_cache[player_id]
-        return (BungieRank.DAGGER, 0)
+        """Get a player's rank and points from the rank cache"""
+        return self.rank_cache.get(player_id, _UNRANKED)
+
+    def sort_ranking_data(self) -> None:
+        """Order ranking_data best first.
+        
+        Players past the kris dagger caste rank ahead of newer players,
+        then higher points first, then more games played first.
+        """
+        self._ensure_arrays()
+        veteran = self._games_played > _GAMES_PLAYED_KRIS_DAGGER
+        order = np.lexsort((-self._games_played, -self._points, ~veteran))
+
+        # Reordered alongside the columns, so they stay valid
+        self._ranking_data = [self._ranking_data[i] for i in order.tolist()]
+        self._ids = self._ids[order]
+        self._score_columns = self._score_columns[:, order]
+        self._bind_score_columns()
 
     def get_caste_breakpoints(self) -> CasteBreakpointData:
         """Calculate and cache caste breakpoints"""
@@ -241,46 +342,27 @@ class RankingSystem:
         if total_players == 0:
             return breakpoints
 
+        self.sort_ranking_data()
+
         # Calculate normal caste breakpoints
-        players_placed = 0
-        for i in range(RankConstants.NUMBER_OF_NORMAL_CASTES):
-            players_in_caste = int(total_players * RANK_PERCENTAGES[i])
-            if players_in_caste > 0:
-                breakpoints.normal_caste_breakpoints[i] = self.ranking_data[players_placed].score.points
-                players_placed += players_in_caste
-
-        # Assign special ranks
-        current_index = 0
+        populated, start_indexes = _caste_start_indexes(total_players)
+        caste_points = np.zeros(len(_RANK_PERCENTAGES), dtype=np.int64)
+        caste_points[populated] = self._points[start_indexes]
+        breakpoints.normal_caste_breakpoints = caste_points.tolist()
 
-        # Comet
-        for i in range(RankConstants.COMET_PLAYER_COUNT):
-            if current_index < total_players:
-                breakpoints.comet_player_ids[i] = self.ranking_data[current_index].id
-                current_index += 1
-
-        # Sun
-        for i in range(RankConstants.SUN_PLAYER_COUNT):
-            if current_index < total_players:
-                breakpoints.sun_player_ids[i] = self.ranking_data[current_index].id
-                current_index += 1
-
-        # Eclipsed Sun
-        for i in range(RankConstants.ECLIPSED_SUN_PLAYER_COUNT):
-            if current_index < total_players:
-                breakpoints.eclipsed_sun_player_ids[i] = self.ranking_data[current_index].id
-                current_index += 1
-
-        # Moon
-        for i in range(RankConstants.MOON_PLAYER_COUNT):
-            if current_index < total_players:
-                breakpoints.moon_player_ids[i] = self.ranking_data[current_index].id
-                current_index += 1
-
-        # Eclipsed Moon
-        for i in range(RankConstants.ECLIPSED_MOON_PLAYER_COUNT):
-            if current_index < total_players:
-                breakpoints.eclipsed_moon_player_ids[i] = self.ranking_data[current_index].id
-                current_index += 1
+        # Assign special ranks, best player first
+        named_ids = self._ids[:RankConstants.TOTAL_NAMED_PLAYER_COUNT].tolist()
+        current_index = 0
+        for player_ids in (
+            breakpoints.comet_player_ids,
+            breakpoints.sun_player_ids,
+            breakpoints.eclipsed_sun_player_ids,
+            breakpoints.moon_player_ids,
+            breakpoints.eclipsed_moon_player_ids
+        ):
+            for i, player_id in enumerate(named_ids[current_index:current_index + len(player_ids)]):
+                player_ids[i] = player_id
+            current_index += len(player_ids)
 
         self.caste_breakpoints = breakpoints
         return breakpoints
@@ -296,10 +378,10 @@ class RankingSystem:
             top_player = self.ranking_data[0]
             overall_rank_data.ranked_game_data.top_ranked_player = str(top_player.id)
             
-            # Calculate aggregate statistics efficiently
+            # Calculate aggregate statistics as column reductions
+            self._ensure_arrays()
             metrics = RankingMetrics()
-            for rank_data in self.ranking_data:
-                metrics.update(rank_data.score)
+            metrics.update_from_columns(self._score_columns)
             
             # Update overall statistics
             if len(self.ranking_data) > 0:
@@ -314,20 +396,22 @@ class RankingSystem:
                 overall_rank_data.ranked_game_data.damage_received.average = int(metrics.damage_received / len(self.ranking_data))
                 overall_rank_data.ranked_game_data.damage_received.best = int(metrics.damage_received)
 
-    def update_database_on_ranking(self, order: bool = False) -> bool:
+    async def update_database_on_ranking(self, order: bool = False) -> bool:
         """Update database with current rankings"""
         if not self.ranking_data:
             return False
 
         BATCH_SIZE = MAXIMUM_DATABASE_OPERATIONS_PER_CALL
         last_ranked_id = 1
+        player = self._scratch_player
         
         while last_ranked_id <= len(self.ranking_data):
             batch_end = min(last_ranked_id + BATCH_SIZE, len(self.ranking_data) + 1)
             
             for i in range(last_ranked_id, batch_end):
-                player = BungieNetPlayerDatum()
-                if Users.get_player_information(self.ranking_data[i-1].id, player):
+                datum = user_database.get_player_information(None, self.ranking_data[i-1].id)
+                if datum:
+                    player.copy_from(datum)
                     if order:
                         if self.present_ranking == 0:  # Overall ranking
                             player.ranked_score_datum = self.ranking_data[i-1].score
@@ -339,7 +423,7 @@ class RankingSystem:
                         else:  # Game type specific ranking
                             player.order_ranked_score_datum_by_game_type[self.present_ranking - 1] = self.ranking_data[i-1].score
                     
-                    Users.update_player_information(player.player_id, player)
+                    await user_database.update_player_information(None, player.player_id, False, player)
             
             last_ranked_id = batch_end
             
@@ -349,24 +433,5 @@ class RankingSystem:
             
         return False
 
-    def compare_rankings(self, r0: RawRankData, r1: RawRankData) -> int:
-        """Compare two rankings efficiently"""
-        if (r0.score.games_played > RankConstants.GAMES_PLAYED_KRIS_DAGGER_CASTE and
-            r1.score.games_played <= RankConstants.GAMES_PLAYED_KRIS_DAGGER_CASTE):
-            return -1
-        elif (r1.score.games_played > RankConstants.GAMES_PLAYED_KRIS_DAGGER_CASTE and
-              r0.score.games_played <= RankConstants.GAMES_PLAYED_KRIS_DAGGER_CASTE):
-            return 1
-        
-        # Compare points first
-        if r0.score.points != r1.score.points:
-            return -1 if r0.score.points > r1.score.points else 1
-            
-        # If points are equal, compare games played
-        if r0.score.games_played != r1.score.games_played:
-            return -1 if r0.score.games_played > r1.score.games_played else 1
-            
-        return 0  # Rankings are equal
-
 # Global instance
 ranking_system = RankingSystem()
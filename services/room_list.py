@@ -7,10 +7,12 @@ This module provides functionality for managing room templates, including:
 - Converting between game names and flags
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Tuple
 from enum import IntFlag
+from functools import lru_cache
 import os
+import re
 import sys
 import logging
 
@@ -34,9 +36,30 @@ ROOM_TYPES: List[Tuple[str, GameTypeFlags]] = [
     ("JCHAT", GameTypeFlags.JCHAT),
 ]
 
+# Game name -> flags used when parsing names.
+# Special case: old Myth2 1.3.x clients reporting as "MYTH" map to MYTH2 only.
+_NAME_TO_FLAGS: Dict[str, GameTypeFlags] = {
+    room_type: GameTypeFlags.MYTH2 if room_type == "MYTH" else type_flags
+    for room_type, type_flags in ROOM_TYPES
+}
+# Same table keyed by ASCII bytes, so tokens skip unicode case mapping
+_NAME_BYTES_TO_FLAGS: Dict[bytes, GameTypeFlags] = {
+    room_type.encode('ascii'): type_flags for room_type, type_flags in _NAME_TO_FLAGS.items()
+}
+
+# Splits a name list on commas, swallowing surrounding whitespace
+_NAME_SPLIT = re.compile(rb'\s*,\s*')
+
+# Single-game names indexed by flag bit position, plus the composite MYTH mask
+_BIT_TO_NAME: Tuple[str, ...] = ("MYTH1", "MYTH2", "MYTH3", "MARATHON", "JCHAT")
+_MYTH_MASK = int(GameTypeFlags.MYTH1 | GameTypeFlags.MYTH2 | GameTypeFlags.MYTH3)
+
 @dataclass
 class RoomData:
     """Room data structure"""
+    # No per-instance __dict__; slotted fields can't carry class-level defaults
+    __slots__ = ('supported_application_flags', 'ranked_room', 'room_identifier', 'country_code',
+                 'minimum_caste', 'maximum_caste', 'tournament_room', 'used')
     supported_application_flags: GameTypeFlags
     ranked_room: bool
     room_identifier: int
@@ -44,8 +67,13 @@ class RoomData:
     minimum_caste: int
     maximum_caste: int
     tournament_room: bool
-    used: bool = False
-    next: Optional['RoomData'] = None
+    used: bool
+
+@dataclass
+class RoomTable:
+    """Room templates in list order, indexed by (flags, room identifier)"""
+    entries: List[RoomData] = field(default_factory=list)
+    index: Dict[Tuple[int, int], int] = field(default_factory=dict)  # Key -> position in entries
 
 def get_supported_application_flags_from_name_list(name_list: str) -> GameTypeFlags:
     """Convert a comma-separated list of game names to application flags
@@ -57,21 +85,11 @@ def get_supported_application_flags_from_name_list(name_list: str) -> GameTypeFl
         Combined game type flags
     """
     flags = GameTypeFlags(0)
-    names = name_list.split(',')
-    
-    for name in names:
-        name = name.strip().upper()
-        for room_type, type_flags in ROOM_TYPES:
-            if name == room_type:
-                # Special case: old Myth2 1.3.x clients reporting as "MYTH"
-                if name == "MYTH":
-                    flags |= GameTypeFlags.MYTH2
-                else:
-                    flags |= type_flags
-                break
-    
+    for name in _NAME_SPLIT.split(name_list.encode().strip().upper()):
+        flags |= _NAME_BYTES_TO_FLAGS.get(name, 0)
     return flags
 
+@lru_cache(maxsize=64)
 def get_name_list_from_supported_application_flags(flags: GameTypeFlags) -> str:
     """Convert application flags to a comma-separated list of game names
     
@@ -81,10 +99,10 @@ def get_name_list_from_supported_application_flags(flags: GameTypeFlags) -> str:
     Returns:
         Comma-separated list of game names
     """
-    names = []
-    for room_type, type_flags in ROOM_TYPES:
-        if flags & type_flags == type_flags:
-            names.append(room_type)
+    v = int(flags)
+    names = [_BIT_TO_NAME[i] for i in range(len(_BIT_TO_NAME)) if v >> i & 1]
+    if v & _MYTH_MASK == _MYTH_MASK:
+        names.insert(0, "MYTH")
     return ','.join(names) if names else "UNKNOWN"
 
 def get_application_type_from_name(name: str) -> GameTypeFlags:
@@ -96,93 +114,100 @@ def get_application_type_from_name(name: str) -> GameTypeFlags:
     Returns:
         Game type flags
     """
-    name = name.strip().upper()
-    for room_type, type_flags in ROOM_TYPES:
-        if name == room_type:
-            # Special case: old Myth2 1.3.x clients reporting as "MYTH"
-            return GameTypeFlags.MYTH2 if name == "MYTH" else type_flags
-    return GameTypeFlags(0)
-
-def load_room_list(filename: str) -> Optional[RoomData]:
+    return _NAME_BYTES_TO_FLAGS.get(name.encode().strip().upper(), GameTypeFlags(0))
+
+def load_room_list(filename: str) -> Optional[RoomTable]:
     """Load room list from file
     
     Args:
         filename: Path to room list file
         
     Returns:
-        Linked list of room data, or None if error
+        Table of room data, or None if error
     """
     if not os.path.exists(filename):
         logger.error("No rooms list file found! The server will not be able to load any rooms!")
         return None
 
-    rooms = None
     with open(filename, 'r') as fp:
-        for line in fp:
-            parts = line.strip().split()
-            if len(parts) != 7:
-                continue
-
-            name_list = parts[0]
-            room_id = int(parts[1])
-            ranked = int(parts[2])
-            country_code = int(parts[3])
-            min_caste = int(parts[4])
-            max_caste = int(parts[5])
-            tournament_room = int(parts[6])
-
-            flags = get_supported_application_flags_from_name_list(name_list)
-            if flags:
-                rooms = add_room(rooms, flags, room_id, ranked, country_code, 
-                               min_caste, max_caste, tournament_room)
-            else:
-                logger.warning(f"Unrecognized name list in room list file '{name_list}'")
+        lines = fp.read().splitlines()
 
-    return rooms
+    entries: List[RoomData] = []
+    for parts in [line.split() for line in lines]:
+        if len(parts) != 7:
+            continue
 
-def save_room_list(rooms: Optional[RoomData], filename: str) -> bool:
+        name_list, *values = parts
+        room_id, ranked, country_code, min_caste, max_caste, tournament_room = map(int, values)
+
+        flags = get_supported_application_flags_from_name_list(name_list)
+        if flags:
+            entries.append(RoomData(
+                supported_application_flags=flags,
+                room_identifier=room_id,
+                ranked_room=ranked,
+                country_code=country_code,
+                minimum_caste=min_caste,
+                maximum_caste=max_caste,
+                tournament_room=tournament_room,
+                used=False
+            ))
+        else:
+            logger.warning(f"Unrecognized name list in room list file '{name_list}'")
+
+    if not entries:
+        return None
+
+    index = {
+        (int(room.supported_application_flags), room.room_identifier): position
+        for position, room in enumerate(entries)
+    }
+    return RoomTable(entries=entries, index=index)
+
+def _format_room(room: RoomData) -> str:
+    """Format a room template as a room list file line, without newline"""
+    return (f"{get_name_list_from_supported_application_flags(room.supported_application_flags)} "
+            f"{room.room_identifier} {int(room.ranked_room)} {room.country_code} "
+            f"{room.minimum_caste} {room.maximum_caste} {int(room.tournament_room)}")
+
+def save_room_list(rooms: Optional[RoomTable], filename: str) -> bool:
     """Save room list to file
     
     Args:
-        rooms: Linked list of room data
+        rooms: Table of room data
         filename: Path to save room list to
         
     Returns:
         True if saved successfully
     """
+    data = ''.join(f"{_format_room(room)}\n" for room in (rooms.entries if rooms else ()))
     try:
         with open(filename, 'w') as fp:
-            room = rooms
-            while room:
-                fp.write(f"{get_name_list_from_supported_application_flags(room.supported_application_flags)} "
-                        f"{room.room_identifier} {int(room.ranked_room)} {room.country_code} "
-                        f"{room.minimum_caste} {room.maximum_caste} {int(room.tournament_room)}\n")
-                room = room.next
+            fp.write(data)
         return True
     except IOError as e:
         logger.error(f"Error saving room list: {e}")
         return False
 
-def list_room_templates(rooms: Optional[RoomData]) -> None:
+def list_room_templates(rooms: Optional[RoomTable]) -> None:
     """List all room templates
     
     Args:
-        rooms: Linked list of room data
+        rooms: Table of room data
     """
-    print("Game\tRoomID\tRanked\tCountry\tMin Caste\tMax Caste\tTournament Room#")
-    room = rooms
-    while room:
-        print(f"{get_name_list_from_supported_application_flags(room.supported_application_flags)} "
-              f"{room.room_identifier} {int(room.ranked_room)} {room.country_code} "
-              f"{room.minimum_caste} {room.maximum_caste} {int(room.tournament_room)}")
-        room = room.next
-
-def delete_room_template(rooms: Optional[RoomData], supported_application_flags: GameTypeFlags, 
-                        room_identifier: int) -> Optional[RoomData]:
+    lines = ["Game\tRoomID\tRanked\tCountry\tMin Caste\tMax Caste\tTournament Room#"]
+    lines.extend(_format_room(room) for room in (rooms.entries if rooms else ()))
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def delete_room_template(rooms: Optional[RoomTable], supported_application_flags: GameTypeFlags, 
+                        room_identifier: int) -> Optional[RoomTable]:
     """Delete a room template
     
+    The last room is moved into the deleted room's slot, so deletion is
+    O(1) but does not preserve list order.
+    
     Args:
-        rooms: Linked list of room data
+        rooms: Table of room data
         supported_application_flags: Game type flags for room
         room_identifier: Room ID to delete
         
@@ -193,31 +218,25 @@ def delete_room_template(rooms: Optional[RoomData], supported_application_flags:
         logger.error("No supported client flags!")
         return rooms
 
-    previous = None
-    room = rooms
-    while room and (room.supported_application_flags != supported_application_flags or 
-                   room.room_identifier != room_identifier):
-        previous = room
-        room = room.next
-
-    if room:
-        if previous:
-            previous.next = room.next
-        else:
-            rooms = room.next
+    position = rooms.index.pop((int(supported_application_flags), room_identifier), None) if rooms else None
+    if position is not None:
+        last = rooms.entries.pop()
+        if position < len(rooms.entries):
+            rooms.entries[position] = last
+            rooms.index[(int(last.supported_application_flags), last.room_identifier)] = position
         logger.info("Room deleted!")
     else:
         logger.warning("Room not found!")
 
     return rooms
 
-def add_or_update_room(rooms: Optional[RoomData], supported_application_flags: GameTypeFlags,
+def add_or_update_room(rooms: Optional[RoomTable], supported_application_flags: GameTypeFlags,
                        room_identifier: int, ranked_room: bool, country_code: int,
-                       minimum_caste: int, maximum_caste: int, tournament_room: bool) -> Optional[RoomData]:
+                       minimum_caste: int, maximum_caste: int, tournament_room: bool) -> Optional[RoomTable]:
     """Add or update a room template
     
     Args:
-        rooms: Linked list of room data
+        rooms: Table of room data
         supported_application_flags: Game type flags for room
         room_identifier: Room ID
         ranked_room: Whether room is ranked
@@ -234,30 +253,28 @@ def add_or_update_room(rooms: Optional[RoomData], supported_application_flags: G
         return rooms
 
     # Try to find and update existing room
-    room = rooms
-    while room:
-        if (room.supported_application_flags == supported_application_flags and 
-            room.room_identifier == room_identifier):
-            room.ranked_room = ranked_room
-            room.country_code = country_code
-            room.minimum_caste = minimum_caste
-            room.maximum_caste = maximum_caste
-            room.tournament_room = tournament_room
-            logger.info("Room updated!")
-            return rooms
-        room = room.next
+    position = rooms.index.get((int(supported_application_flags), room_identifier)) if rooms else None
+    if position is not None:
+        room = rooms.entries[position]
+        room.ranked_room = ranked_room
+        room.country_code = country_code
+        room.minimum_caste = minimum_caste
+        room.maximum_caste = maximum_caste
+        room.tournament_room = tournament_room
+        logger.info("Room updated!")
+        return rooms
 
     # Room not found, add new one
     return add_room(rooms, supported_application_flags, room_identifier, ranked_room,
                    country_code, minimum_caste, maximum_caste, tournament_room)
 
-def add_room(rooms: Optional[RoomData], supported_application_flags: GameTypeFlags,
+def add_room(rooms: Optional[RoomTable], supported_application_flags: GameTypeFlags,
              room_id: int, ranked_room: bool, country_code: int,
-             minimum_caste: int, maximum_caste: int, tournament_room: bool) -> Optional[RoomData]:
+             minimum_caste: int, maximum_caste: int, tournament_room: bool) -> RoomTable:
     """Add a new room
     
     Args:
-        rooms: Linked list of room data
+        rooms: Table of room data, or None to start a new table
         supported_application_flags: Game type flags for room
         room_id: Room ID
         ranked_room: Whether room is ranked
@@ -276,15 +293,13 @@ def add_room(rooms: Optional[RoomData], supported_application_flags: GameTypeFla
         country_code=country_code,
         minimum_caste=minimum_caste,
         maximum_caste=maximum_caste,
-        tournament_room=tournament_room
+        tournament_room=tournament_room,
+        used=False
     )
 
-    if not rooms:
-        return new_room
+    if rooms is None:
+        rooms = RoomTable()
 
-    # Add to end of list
-    current = rooms
-    while current.next:
-        current = current.next
-    current.next = new_room
+    rooms.index[(int(supported_application_flags), room_id)] = len(rooms.entries)
+    rooms.entries.append(new_room)
     return rooms
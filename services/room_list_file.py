@@ -11,8 +11,23 @@ import json
 import logging
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the stdlib json module
+
 logger = logging.getLogger(__name__)
 
+def _loads(raw: bytes) -> Dict:
+    """Decode room list JSON, using orjson when it is installed."""
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _dumps(data: Dict) -> bytes:
+    """Encode room list JSON, using orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
 @dataclass
 class RoomDefinition:
     """Definition of a game room."""
@@ -30,6 +45,23 @@ class RoomListFile:
     
     filename: str = "rooms.lst"
     rooms: List[RoomDefinition] = field(default_factory=list)
+    _name_index: Dict[str, int] = field(init=False, default_factory=dict, repr=False, compare=False)
+    _port_index: Dict[int, int] = field(init=False, default_factory=dict, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._reindex()
+    
+    def _index_room(self, room: RoomDefinition, position: int) -> None:
+        """Record a room's position in the rooms list under its name and port."""
+        self._name_index[room.name] = position
+        self._port_index[room.port] = position
+    
+    def _reindex(self) -> None:
+        """Rebuild the name and port indexes from the rooms list."""
+        self._name_index.clear()
+        self._port_index.clear()
+        for position, room in enumerate(self.rooms):
+            self._index_room(room, position)
     
     def load(self) -> bool:
         """Load room definitions from file.
@@ -43,10 +75,12 @@ class RoomListFile:
                 logger.warning(f"Room list file {self.filename} not found")
                 return False
                 
-            with open(self.filename, 'r') as f:
-                data = json.load(f)
+            with open(self.filename, 'rb') as f:
+                data = _loads(f.read())
                 
             self.rooms.clear()
+            self._name_index.clear()
+            self._port_index.clear()
             for room_data in data.get('rooms', []):
                 room = RoomDefinition(
                     name=room_data.get('name', ''),
@@ -57,6 +91,7 @@ class RoomListFile:
                     allow_observers=room_data.get('allow_observers', True),
                     ranked=room_data.get('ranked', True)
                 )
+                self._index_room(room, len(self.rooms))
                 self.rooms.append(room)
                 
             logger.info(f"Loaded {len(self.rooms)} rooms from {self.filename}")
@@ -88,8 +123,8 @@ class RoomListFile:
                 ]
             }
             
-            with open(self.filename, 'w') as f:
-                json.dump(data, f, indent=4)
+            with open(self.filename, 'wb') as f:
+                f.write(_dumps(data))
                 
             logger.info(f"Saved {len(self.rooms)} rooms to {self.filename}")
             return True
@@ -107,31 +142,26 @@ class RoomListFile:
         Returns:
             True if successful, False if error
         """
-        try:
-            # Validate room
-            if not room.name:
-                logger.error("Room name cannot be empty")
-                return False
-                
-            if room.port <= 0:
-                logger.error("Invalid room port")
-                return False
-                
-            # Check for duplicate name/port
-            for existing in self.rooms:
-                if existing.name == room.name:
-                    logger.error(f"Room {room.name} already exists")
-                    return False
-                if existing.port == room.port:
-                    logger.error(f"Port {room.port} already in use")
-                    return False
+        # Validate room
+        if not room.name:
+            logger.error("Room name cannot be empty")
+            return False
             
-            self.rooms.append(room)
-            return True
+        if room.port <= 0:
+            logger.error("Invalid room port")
+            return False
             
-        except Exception as e:
-            logger.error(f"Error adding room: {e}")
+        # Check for duplicate name/port
+        if room.name in self._name_index:
+            logger.error(f"Room {room.name} already exists")
             return False
+        if room.port in self._port_index:
+            logger.error(f"Port {room.port} already in use")
+            return False
+        
+        self._index_room(room, len(self.rooms))
+        self.rooms.append(room)
+        return True
     
     def remove_room(self, name: str) -> bool:
         """Remove a room definition by name.
@@ -142,16 +172,14 @@ class RoomListFile:
         Returns:
             True if found and removed, False if not found
         """
-        try:
-            for i, room in enumerate(self.rooms):
-                if room.name == name:
-                    del self.rooms[i]
-                    return True
+        i = self._name_index.pop(name, None)
+        if i is None:
             return False
             
-        except Exception as e:
-            logger.error(f"Error removing room: {e}")
-            return False
+        # Keep the saved order; later rooms shift down one position
+        del self.rooms[i]
+        self._reindex()
+        return True
     
     def get_room(self, name: str) -> Optional[RoomDefinition]:
         """Get a room definition by name.
@@ -162,12 +190,5 @@ class RoomListFile:
         Returns:
             Room definition if found, None if not found
         """
-        try:
-            for room in self.rooms:
-                if room.name == name:
-                    return room
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error getting room: {e}")
-            return None
+        i = self._name_index.get(name)
+        return self.rooms[i] if i is not None else None
@@ -7,9 +7,12 @@ coordinating game starts/ends.
 """
 
 import asyncio
+import functools
+import hmac
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Set
+import time
+from collections.abc import Set as AbstractSetBase
+from typing import AbstractSet, Dict, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 
 from core.interfaces.room_interface import RoomInterface, RoomInfo, RoomSettings, RoomState
@@ -18,6 +21,43 @@ from core.services.game_service import game_service
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=4096)
+def _intern_settings(settings: RoomSettings) -> RoomSettings:
+    """Get the canonical instance of a set of room settings.
+    
+    Equal settings map to the first instance seen, so rooms created with
+    the same settings share it and comparing them is an identity check.
+    """
+    return settings
+
+class SetView(AbstractSetBase):
+    """Read-only live view over a set of user IDs.
+    
+    Supports membership, iteration, len() and set comparisons without
+    copying the underlying set.
+    """
+    __slots__ = ('_members',)
+    
+    def __init__(self, members: Set[int]):
+        self._members = members
+        
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._members
+        
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._members)
+        
+    def __len__(self) -> int:
+        return len(self._members)
+        
+    def __repr__(self) -> str:
+        return f"SetView({self._members!r})"
+        
+    @classmethod
+    def _from_iterable(cls, it) -> frozenset:
+        # Set operators (|, &, -) build plain frozensets, not views
+        return frozenset(it)
+
 @dataclass
 class Room:
     """Internal room state."""
@@ -25,18 +65,23 @@ class Room:
     players: Set[int] = field(default_factory=set)
     spectators: Set[int] = field(default_factory=set)
     password: Optional[str] = None
+    member_count: int = 0  # Players plus spectators
 
 class RoomService(RoomInterface):
     """Service for managing game rooms."""
     def __init__(self):
         self.rooms: Dict[int, Room] = {}
         self.next_room_id: int = 1
+        # Bumped whenever the set of rooms or a room state changes
+        self._gen: int = 0
+        self._list_cache: Dict[bool, Tuple[int, List[RoomInfo]]] = {}
 
     async def create_room(self, host_id: int, settings: RoomSettings) -> Optional[int]:
         """Create a new game room."""
         room_id = self.next_room_id
         self.next_room_id += 1
         
+        settings = _intern_settings(settings)
         room_info = RoomInfo(
             room_id=room_id,
             settings=settings,
@@ -44,7 +89,7 @@ class RoomService(RoomInterface):
             state=RoomState.WAITING,
             player_count=0,
             spectator_count=0,
-            created_at=datetime.now()
+            created_at=time.time()
         )
         
         room = Room(info=room_info)
@@ -52,20 +97,21 @@ class RoomService(RoomInterface):
             room.password = settings.password
             
         self.rooms[room_id] = room
+        self._gen += 1
         logger.info(f"Created room {room_id}: {settings.name}")
         return room_id
         
     async def close_room(self, room_id: int) -> bool:
         """Close a game room."""
-        room = self.rooms.get(room_id)
+        room = self.rooms.pop(room_id, None)
         if not room:
             return False
+        self._gen += 1
             
         # End game if in progress
         if room.info.game_id is not None:
             await game_service.end_game(room.info.game_id)
             
-        del self.rooms[room_id]
         logger.info(f"Closed room {room_id}")
         return True
         
@@ -76,11 +122,16 @@ class RoomService(RoomInterface):
         
     async def list_rooms(self, include_closed: bool = False) -> List[RoomInfo]:
         """List all game rooms."""
-        rooms = []
-        for room in self.rooms.values():
-            if include_closed or room.info.state != RoomState.CLOSED:
-                rooms.append(room.info)
-        return rooms
+        cached = self._list_cache.get(include_closed)
+        if cached is None or cached[0] != self._gen:
+            rooms = []
+            for room in self.rooms.values():
+                if include_closed or room.info.state != RoomState.CLOSED:
+                    rooms.append(room.info)
+            cached = (self._gen, rooms)
+            self._list_cache[include_closed] = cached
+        # Copy so callers can't corrupt the cached list
+        return list(cached[1])
         
     async def join_room(self, room_id: int, user_id: int, password: Optional[str] = None, as_spectator: bool = False) -> bool:
         """Join a game room."""
@@ -93,7 +144,7 @@ class RoomService(RoomInterface):
             return False
             
         # Check password
-        if room.password and password != room.password:
+        if room.password and not hmac.compare_digest((password or '').encode(), room.password.encode()):
             return False
             
         # Check capacity for players
@@ -105,7 +156,8 @@ class RoomService(RoomInterface):
                 return True  # Already in room
                 
             room.players.add(user_id)
-            room.info.player_count = len(room.players)
+            room.info.player_count += 1
+            room.member_count += 1
             
         # Handle spectators
         else:
@@ -116,7 +168,8 @@ class RoomService(RoomInterface):
                 return True  # Already spectating
                 
             room.spectators.add(user_id)
-            room.info.spectator_count = len(room.spectators)
+            room.info.spectator_count += 1
+            room.member_count += 1
             
         logger.info(f"User {user_id} joined room {room_id} as {'spectator' if as_spectator else 'player'}")
         return True
@@ -130,15 +183,17 @@ class RoomService(RoomInterface):
         # Remove from players
         if user_id in room.players:
             room.players.remove(user_id)
-            room.info.player_count = len(room.players)
+            room.info.player_count -= 1
+            room.member_count -= 1
             
         # Remove from spectators
         if user_id in room.spectators:
             room.spectators.remove(user_id)
-            room.info.spectator_count = len(room.spectators)
+            room.info.spectator_count -= 1
+            room.member_count -= 1
             
         # Close empty rooms
-        if not room.players and not room.spectators:
+        if room.member_count == 0:
             await self.close_room(room_id)
             
         logger.info(f"User {user_id} left room {room_id}")
@@ -169,13 +224,20 @@ class RoomService(RoomInterface):
         if game_id is None:
             return None
             
-        # Add players to game
-        for player_id in room.players:
-            await game_service.add_player(game_id, player_id)
+        # Add players to game concurrently
+        results = await asyncio.gather(
+            *(game_service.add_player(game_id, player_id) for player_id in room.players),
+            return_exceptions=True
+        )
+        if not all(result is True for result in results):
+            logger.error(f"Failed to add players to game {game_id} in room {room_id}")
+            await game_service.end_game(game_id, {})
+            return None
             
         # Update room state
         room.info.state = RoomState.IN_GAME
         room.info.game_id = game_id
+        self._gen += 1
         
         logger.info(f"Started game {game_id} in room {room_id}")
         return game_id
@@ -192,19 +254,29 @@ class RoomService(RoomInterface):
         # Update room state
         room.info.state = RoomState.WAITING
         room.info.game_id = None
+        self._gen += 1
         
         logger.info(f"Ended game in room {room_id}")
         return True
         
-    async def get_room_players(self, room_id: int) -> Optional[Dict[str, Set[int]]]:
-        """Get players in a room."""
+    async def get_room_players(self, room_id: int, snapshot: bool = False) -> Optional[Dict[str, AbstractSet[int]]]:
+        """Get players in a room.
+        
+        By default returns read-only views that track the room's membership;
+        pass snapshot=True for mutable copies.
+        """
         room = self.rooms.get(room_id)
         if not room:
             return None
             
+        if snapshot:
+            return {
+                'players': room.players.copy(),
+                'spectators': room.spectators.copy()
+            }
         return {
-            'players': room.players.copy(),
-            'spectators': room.spectators.copy()
+            'players': SetView(room.players),
+            'spectators': SetView(room.spectators)
         }
         
     async def update_settings(self, room_id: int, host_id: int, settings: RoomSettings) -> bool:
@@ -218,9 +290,16 @@ class RoomService(RoomInterface):
             return False
             
         # Update settings
-        room.info.settings = settings
+        room.info.settings = _intern_settings(settings)
         if settings.password:
             room.password = settings.password
             
         logger.info(f"Updated settings for room {room_id}")
         return True
+        
+    def reset_state(self) -> None:
+        """Drop all rooms, returning the service to its initial state."""
+        self.rooms.clear()
+        self.next_room_id = 1
+        self._gen += 1
+        self._list_cache.clear()
@@ -9,9 +9,12 @@ import asyncio
 import logging
 import secrets
 import hashlib
+import hmac
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from email.message import EmailMessage
+from heapq import nlargest
 
 from ..interfaces.user_interface import (
     UserInterface,
@@ -24,9 +27,20 @@ from ..interfaces.user_interface import (
 
 logger = logging.getLogger(__name__)
 
-def hash_password(password: str) -> str:
-    """Hash a password using SHA-256."""
-    return hashlib.sha256(password.encode()).hexdigest()
+# Password hashing parameters
+PASSWORD_SALT_SIZE = 16
+PASSWORD_HASH_ITERATIONS = 100_000
+VERIFY_CACHE_SIZE = 4096  # Recent verify_password results kept
+CLEANUP_BATCH_SIZE = 100  # Reset tokens issued between expired-token sweeps
+
+def hash_password(password: str, salt: bytes) -> bytes:
+    """Hash a password with PBKDF2-HMAC-SHA256 and the given salt."""
+    return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, PASSWORD_HASH_ITERATIONS)
+
+def new_password_entry(password: str) -> Tuple[bytes, bytes]:
+    """Hash a password under a fresh random salt, returning (salt, hash)."""
+    salt = secrets.token_bytes(PASSWORD_SALT_SIZE)
+    return salt, hash_password(password, salt)
 
 class UserService(UserInterface):
     """Service for managing user accounts."""
@@ -36,40 +50,48 @@ class UserService(UserInterface):
         self.profiles: Dict[int, UserProfile] = {}
         self.stats: Dict[int, UserStats] = {}
         self.ranks: Dict[int, UserRank] = {}
-        self.passwords: Dict[int, str] = {}  # Stores hashed passwords
+        self.passwords: Dict[int, Tuple[bytes, bytes]] = {}  # user_id -> (salt, hash)
         self.reset_tokens: Dict[str, tuple] = {}  # token -> (user_id, expiry)
+        self._reset_insert_count: int = 0
+        self._username_lc: Dict[str, int] = {}  # Lowercased username -> user_id
+        self._email_lc: Dict[str, int] = {}  # Lowercased email -> user_id
+        # (user_id, keyed password fingerprint) -> result, least recent first
+        self._verify_cache: "OrderedDict[Tuple[int, bytes], bool]" = OrderedDict()
+        self._process_key: bytes = secrets.token_bytes(32)
         self.next_user_id: int = 1
         
     async def create_user(self, username: str, email: str, password: str) -> Optional[int]:
         """Create a new user account."""
-        # Check if username/email already exists
-        for profile in self.profiles.values():
-            if profile.username.lower() == username.lower():
-                return None
-            if profile.email.lower() == email.lower():
-                return None
-                
-        user_id = self.next_user_id
-        self.next_user_id += 1
-        
-        # Create profile
-        profile = UserProfile(
-            user_id=user_id,
-            username=username,
-            email=email
-        )
-        self.profiles[user_id] = profile
-        
-        # Initialize stats and rank
-        self.stats[user_id] = UserStats(user_id=user_id)
-        self.ranks[user_id] = UserRank(user_id=user_id)
-        
-        # Store hashed password
-        self.passwords[user_id] = hash_password(password)
-        
+        if self._is_taken(username, email):
+            return None
+            
+        user_id = self._add_user(username, email, new_password_entry(password))
         logger.info(f"Created user account for {username}")
         return user_id
         
+    async def create_users_bulk(self, rows: List[Tuple[str, str, str]]) -> List[Optional[int]]:
+        """Create user accounts from (username, email, password) rows.
+        
+        Each distinct password is hashed once and its salted hash shared by
+        every account using it. Returns the new user ID for each row, or None
+        where the username or email is already taken.
+        """
+        entries: Dict[str, Tuple[bytes, bytes]] = {}
+        user_ids: List[Optional[int]] = []
+        for username, email, password in rows:
+            if self._is_taken(username, email):
+                user_ids.append(None)
+                continue
+                
+            entry = entries.get(password)
+            if entry is None:
+                entry = entries[password] = new_password_entry(password)
+            user_ids.append(self._add_user(username, email, entry))
+            
+        logger.info(f"Created {len(user_ids) - user_ids.count(None)} user accounts "
+                    f"with {len(entries)} password hashes")
+        return user_ids
+        
     async def get_user_profile(self, user_id: int) -> Optional[UserProfile]:
         """Get a user's profile information."""
         return self.profiles.get(user_id)
@@ -171,16 +193,12 @@ class UserService(UserInterface):
         
     async def get_top_players(self, limit: int = 10) -> List[Dict]:
         """Get the top ranked players."""
-        # Sort players by rank points
-        sorted_ranks = sorted(
-            self.ranks.values(),
-            key=lambda r: r.rank_points,
-            reverse=True
-        )
+        # Partial sort: only the top `limit` ranks are ordered
+        top_ranks = nlargest(limit, self.ranks.values(), key=lambda r: r.rank_points)
         
         # Get top players
         top_players = []
-        for rank in sorted_ranks[:limit]:
+        for rank in top_ranks:
             profile = self.profiles[rank.user_id]
             top_players.append({
                 'user_id': rank.user_id,
@@ -193,37 +211,59 @@ class UserService(UserInterface):
         return top_players
         
     async def verify_password(self, user_id: int, password: str) -> bool:
-        """Verify a user's password."""
-        stored_hash = self.passwords.get(user_id)
-        if not stored_hash:
+        """Verify a user's password.
+        
+        Results are cached under a keyed fingerprint of the password, so
+        repeated checks of the same credential skip the KDF.
+        """
+        key = (user_id, self._password_fingerprint(password))
+        result = self._verify_cache.get(key)
+        if result is not None:
+            self._verify_cache.move_to_end(key)
+            return result
+            
+        entry = self.passwords.get(user_id)
+        if not entry:
             return False
             
-        return stored_hash == hash_password(password)
+        salt, stored_hash = entry
+        result = hmac.compare_digest(stored_hash, hash_password(password, salt))
+        self._verify_cache[key] = result
+        if len(self._verify_cache) > VERIFY_CACHE_SIZE:
+            self._verify_cache.popitem(last=False)
+        return result
         
     async def change_password(self, user_id: int, old_password: str, new_password: str) -> bool:
         """Change a user's password."""
         if not await self.verify_password(user_id, old_password):
             return False
             
-        self.passwords[user_id] = hash_password(new_password)
+        self.passwords[user_id] = new_password_entry(new_password)
+        self._verify_cache.clear()
         logger.info(f"Changed password for user {user_id}")
         return True
         
     async def reset_password(self, email: str) -> bool:
         """Initiate password reset for a user."""
         # Find user by email
-        for profile in self.profiles.values():
-            if profile.email.lower() == email.lower():
-                # Generate reset token
-                token = secrets.token_urlsafe(32)
-                expiry = datetime.now() + timedelta(hours=24)
-                self.reset_tokens[token] = (profile.user_id, expiry)
-                
-                # TODO: Send reset email
-                logger.info(f"Generated password reset token for user {profile.user_id}")
-                return True
-                
-        return False
+        user_id = self._email_lc.get(email.lower())
+        if user_id is None:
+            return False
+            
+        # Generate reset token
+        token = secrets.token_urlsafe(32)
+        expiry = datetime.now() + timedelta(hours=24)
+        self.reset_tokens[token] = (user_id, expiry)
+        
+        # Sweep abandoned tokens every CLEANUP_BATCH_SIZE issues
+        self._reset_insert_count += 1
+        if self._reset_insert_count >= CLEANUP_BATCH_SIZE:
+            self._reset_insert_count = 0
+            self._cleanup_reset_tokens()
+        
+        # TODO: Send reset email
+        logger.info(f"Generated password reset token for user {user_id}")
+        return True
         
     async def complete_reset(self, reset_token: str, new_password: str) -> bool:
         """Complete password reset with token."""
@@ -236,12 +276,66 @@ class UserService(UserInterface):
             return False
             
         # Update password
-        self.passwords[user_id] = hash_password(new_password)
+        self.passwords[user_id] = new_password_entry(new_password)
+        self._verify_cache.clear()
         del self.reset_tokens[reset_token]
         
         logger.info(f"Reset password for user {user_id}")
         return True
         
+    def reset_state(self) -> None:
+        """Drop all accounts and tokens, returning the service to its initial state."""
+        self.profiles.clear()
+        self.stats.clear()
+        self.ranks.clear()
+        self.passwords.clear()
+        self.reset_tokens.clear()
+        self._reset_insert_count = 0
+        self._username_lc.clear()
+        self._email_lc.clear()
+        self._verify_cache.clear()
+        self.next_user_id = 1
+        
+    def _cleanup_reset_tokens(self) -> None:
+        """Drop expired password reset tokens."""
+        now = datetime.now()
+        expired = [token for token, (_, expiry) in self.reset_tokens.items() if now > expiry]
+        for token in expired:
+            del self.reset_tokens[token]
+        if expired:
+            logger.info(f"Removed {len(expired)} expired password reset tokens")
+        
+    def _is_taken(self, username: str, email: str) -> bool:
+        """Check whether a username or email is already registered."""
+        return username.lower() in self._username_lc or email.lower() in self._email_lc
+        
+    def _add_user(self, username: str, email: str, password_entry: Tuple[bytes, bytes]) -> int:
+        """Register a new account under the next user ID."""
+        user_id = self.next_user_id
+        self.next_user_id += 1
+        
+        # Create profile
+        profile = UserProfile(
+            user_id=user_id,
+            username=username,
+            email=email
+        )
+        self.profiles[user_id] = profile
+        self._username_lc[username.lower()] = user_id
+        self._email_lc[email.lower()] = user_id
+        
+        # Initialize stats and rank
+        self.stats[user_id] = UserStats(user_id=user_id)
+        self.ranks[user_id] = UserRank(user_id=user_id)
+        
+        # Store hashed password
+        self.passwords[user_id] = password_entry
+        return user_id
+        
+    def _password_fingerprint(self, password: str) -> bytes:
+        """Digest a password under the per-process key so it never sits in the cache."""
+        return hashlib.blake2b(password.encode(), digest_size=16, key=self._process_key).digest()
+        
     def _get_rank_title(self, level: int) -> str:
         """Get rank title for a given level."""
         if level < 5:
@@ -11,6 +11,10 @@ Copyright (c) 2002 Vishvananda Ishaya
 Copyright (c) 2003 Bill Keirstead
 """
 
+import asyncio
+import heapq
+import io
+import mmap
 import os
 import struct
 import logging
@@ -18,11 +22,13 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Any
 from enum import IntEnum
 
+from sortedcontainers import SortedDict
+
+from ..models.base import DATACLASS_SLOTS
 from ..models.bungie_net_player import BungieNetPlayerDatum, BungieNetOnlinePlayerData
 from ..models.stats import PlayerStats
 from ..utils.constants import MAXIMUM_PLAYER_NAME_LENGTH, MAXIMUM_BUDDIES, MAXIMUM_PACKED_PLAYER_DATA_LENGTH
-from ..utils.rb_tree import RBTree
-from ..utils.sl_list import SLList, SLListElement
+from ..utils.sl_list import SLList
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +36,19 @@ logger = logging.getLogger(__name__)
 BUNGIE_NET_USER_DB_SIGNATURE = 0x504c4159
 MAXIMUM_PLAYER_SEARCH_RESPONSES = 50
 
+# Precompiled on-disk layouts
+_SIG_STRUCT = struct.Struct("I")  # Entry signature / header player count
+_HDR_STRUCT = struct.Struct("I40I")  # Player count followed by unused words
+_HEADER_SIZE = _HDR_STRUCT.size  # Entries start right after the header
+_PACKED_SIGNATURE = _SIG_STRUCT.pack(BUNGIE_NET_USER_DB_SIGNATURE)
+
+# Fixed entry geometry: signature followed by one player datum
+_DATUM_SIZE = BungieNetPlayerDatum.size()
+_ENTRY_SIZE = _SIG_STRUCT.size + _DATUM_SIZE
+
+# Failures expected from file, mapping and entry decoding
+USER_DB_ERRORS = (OSError, ValueError, IndexError, struct.error)
+
 @dataclass
 class UserQuery:
     """User query structure for searching players"""
@@ -37,23 +56,18 @@ class UserQuery:
     buddy_ids: List[int] = field(default_factory=lambda: [0] * MAXIMUM_BUDDIES)
     order: int = 0
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class UserQueryResponse:
     """Response structure for user queries"""
     match_score: int = 0
     aux_data: Any = None  # MetaserverPlayerAuxData
     player_data: bytes = field(default_factory=lambda: bytearray(MAXIMUM_PACKED_PLAYER_DATA_LENGTH))
 
-@dataclass
-class OrderMemberListData:
-    """Data structure for order member list"""
-    player_id: int = 0
-
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class OrderListData:
     """Data structure for order list"""
     order_index: int = 0
-    member_list: SLList = field(default_factory=SLList)
+    member_list: List[int] = field(default_factory=list)  # Member player IDs
 
 @dataclass
 class BungieNetUserDBHeader:
@@ -67,7 +81,7 @@ class BungieNetUserDBEntry:
     signature: int = BUNGIE_NET_USER_DB_SIGNATURE
     player: BungieNetPlayerDatum = field(default_factory=BungieNetPlayerDatum)
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class BungieNetLoginTreeData:
     """Data structure for login tree"""
     login: str = ""
@@ -78,22 +92,28 @@ class UserDatabase:
     """User database management class"""
     def __init__(self):
         self.order_list: Optional[SLList] = None
+        self.order_by_index: Dict[int, OrderListData] = {}  # order_index -> entry in order_list
         self.online_player_data: List[BungieNetOnlinePlayerData] = []
         self.fd_user_db: int = -1
+        self.db_map: Optional[mmap.mmap] = None  # Read-only view of users.db, remapped on growth
+        self._new_user_lock: Optional[asyncio.Lock] = None  # Created on first use inside the event loop
         self.total_players: int = 0
         self.response_list: List[UserQueryResponse] = [UserQueryResponse() for _ in range(MAXIMUM_PLAYER_SEARCH_RESPONSES)]
-        self.present_order_list: Optional[SLListElement] = None
+        self.present_order_cursor: Optional[Tuple[int, int]] = None  # (order_index, member position)
         self.search_player_id: int = -1
-        self.login_tree = RBTree(self._login_tree_comp_func)
+        self.login_tree: SortedDict = SortedDict()  # Login -> BungieNetLoginTreeData, ordered by login
+        self.players: List[Optional[BungieNetPlayerDatum]] = []  # Resident copy of every entry, by player_id - 1
+        self._names_lower: List[str] = []  # Lowercased player names, parallel to players
 
     def create_user_database(self) -> bool:
         """Create a new user database"""
         try:
             self.fd_user_db = os.open("users.db", os.O_CREAT | os.O_RDWR)
             header = BungieNetUserDBHeader()
-            os.write(self.fd_user_db, struct.pack("I40I", header.player_count, *header.unused))
+            os.write(self.fd_user_db, _HDR_STRUCT.pack(header.player_count, *header.unused))
+            self._remap()
             return True
-        except OSError as e:
+        except USER_DB_ERRORS as e:
             logger.error(f"Failed to create user database: {e}")
             return False
 
@@ -104,65 +124,73 @@ class UserDatabase:
                 return False
 
             self.fd_user_db = os.open("users.db", os.O_RDWR)
-            header = BungieNetUserDBHeader()
-            header_data = os.read(self.fd_user_db, struct.calcsize("I40I"))
-            header.player_count = struct.unpack("I", header_data[:4])[0]
-
-            self.total_players = header.player_count
-            self.online_player_data = [BungieNetOnlinePlayerData() for _ in range(self.total_players)]
-
-            # Read and initialize all player data
-            for i in range(self.total_players):
-                entry_pos = os.lseek(self.fd_user_db, 0, os.SEEK_CUR)
-                signature = struct.unpack("I", os.read(self.fd_user_db, 4))[0]
-                
-                if signature == BUNGIE_NET_USER_DB_SIGNATURE:
-                    player_data = os.read(self.fd_user_db, BungieNetPlayerDatum.size())
-                    player = BungieNetPlayerDatum.from_bytes(player_data)
-                    self.add_entry_to_login_tree(player, entry_pos)
+            
+            # Scan through a buffered reader so the small per-entry reads are
+            # served from userspace; the descriptor stays open for pwrite/mmap
+            with open(self.fd_user_db, 'rb', buffering=io.DEFAULT_BUFFER_SIZE, closefd=False) as db_file:
+                header = BungieNetUserDBHeader()
+                header_data = db_file.read(_HEADER_SIZE)
+                header.player_count = _SIG_STRUCT.unpack_from(header_data)[0]
+
+                self.total_players = header.player_count
+                self.online_player_data = [BungieNetOnlinePlayerData() for _ in range(self.total_players)]
+                self.players = []
+                self._names_lower = []
+
+                # Read and initialize all player data
+                for i in range(self.total_players):
+                    entry_pos = db_file.tell()
+                    signature = _SIG_STRUCT.unpack(db_file.read(_SIG_STRUCT.size))[0]
+                    
+                    if signature == BUNGIE_NET_USER_DB_SIGNATURE:
+                        player_data = db_file.read(_DATUM_SIZE)
+                        player = BungieNetPlayerDatum.from_bytes(player_data)
+                        self.add_entry_to_login_tree(player, entry_pos)
+                        self.players.append(player)
+                        self._names_lower.append(player.name.lower())
+                    else:
+                        self.players.append(None)
+                        self._names_lower.append("")
                     
+            self._remap()
             return True
             
-        except OSError as e:
+        except USER_DB_ERRORS as e:
             logger.error(f"Failed to initialize user database: {e}")
             return False
 
     def shutdown_user_database(self) -> None:
         """Shutdown and cleanup the user database"""
+        if self.db_map:
+            self.db_map.close()
+            self.db_map = None
         if self.fd_user_db != -1:
             os.close(self.fd_user_db)
             self.fd_user_db = -1
 
     def get_first_player_in_order(self, order_index: int) -> Optional[BungieNetPlayerDatum]:
         """Get the first player in a specific order"""
-        if not self.order_list:
-            return None
-            
-        element = self.order_list.head
-        while element:
-            data = element.data
-            if data.order_index == order_index and data.member_list:
-                member = data.member_list.head
-                if member:
-                    player = BungieNetPlayerDatum()
-                    if self.get_player_information(None, member.data.player_id, player):
-                        self.present_order_list = member
-                        return player
-            element = element.next
+        data = self.order_by_index.get(order_index)
+        if data and data.member_list:
+            player = self.get_player_information(None, data.member_list[0])
+            if player:
+                self.present_order_cursor = (order_index, 0)
+                return player
             
         return None
 
     def get_next_player_in_order(self, key: Any) -> Optional[BungieNetPlayerDatum]:
         """Get the next player in the order"""
-        if not self.present_order_list or not self.present_order_list.next:
+        if not self.present_order_cursor:
             return None
             
-        self.present_order_list = self.present_order_list.next
-        player = BungieNetPlayerDatum()
-        if self.get_player_information(None, self.present_order_list.data.player_id, player):
-            return player
+        order_index, position = self.present_order_cursor
+        data = self.order_by_index.get(order_index)
+        if not data or position + 1 >= len(data.member_list):
+            return None
             
-        return None
+        self.present_order_cursor = (order_index, position + 1)
+        return self.get_player_information(None, data.member_list[position + 1])
 
     def get_user_count(self) -> int:
         """Get total number of users"""
@@ -174,56 +202,48 @@ class UserDatabase:
             return self.online_player_data[player_id - 1]
         return None
 
-    def get_player_information(self, login_name: Optional[str], player_id: int, 
-                             player: BungieNetPlayerDatum) -> bool:
-        """Get player information by login name or ID"""
+    def get_player_information(self, login_name: Optional[str], 
+                             player_id: int) -> Optional[BungieNetPlayerDatum]:
+        """Get player information by login name or ID
+        
+        Returns a freshly decoded datum, or None if the player is not found.
+        Use BungieNetPlayerDatum.copy_from to load it into an existing object.
+        """
         try:
             if login_name:
-                data = BungieNetLoginTreeData(login=login_name)
-                node = self.login_tree.search(data)
-                if node:
-                    os.lseek(self.fd_user_db, node.data.fpos, os.SEEK_SET)
-                    signature = struct.unpack("I", os.read(self.fd_user_db, 4))[0]
-                    if signature == BUNGIE_NET_USER_DB_SIGNATURE:
-                        player_data = os.read(self.fd_user_db, BungieNetPlayerDatum.size())
-                        player.__dict__.update(BungieNetPlayerDatum.from_bytes(player_data).__dict__)
-                        return True
+                data = self.login_tree.get(login_name)
+                if data:
+                    return self._read_entry(data.fpos)
             elif player_id > 0 and player_id <= self.total_players:
-                offset = (player_id - 1) * (4 + BungieNetPlayerDatum.size()) + struct.calcsize("I41I")
-                os.lseek(self.fd_user_db, offset, os.SEEK_SET)
-                signature = struct.unpack("I", os.read(self.fd_user_db, 4))[0]
-                if signature == BUNGIE_NET_USER_DB_SIGNATURE:
-                    player_data = os.read(self.fd_user_db, BungieNetPlayerDatum.size())
-                    player.__dict__.update(BungieNetPlayerDatum.from_bytes(player_data).__dict__)
-                    return True
+                offset = (player_id - 1) * _ENTRY_SIZE + _HEADER_SIZE
+                return self._read_entry(offset)
                     
-            return False
+            return None
             
-        except OSError as e:
+        except USER_DB_ERRORS as e:
             logger.error(f"Failed to get player information: {e}")
-            return False
+            return None
 
-    def update_player_information(self, login_name: Optional[str], player_id: int, 
-                                logged_in_flag: bool, player: BungieNetPlayerDatum) -> bool:
+    async def update_player_information(self, login_name: Optional[str], player_id: int, 
+                                      logged_in_flag: bool, player: BungieNetPlayerDatum) -> bool:
         """Update player information"""
         try:
             if login_name:
-                data = BungieNetLoginTreeData(login=login_name)
-                node = self.login_tree.search(data)
-                if node:
-                    os.lseek(self.fd_user_db, node.data.fpos, os.SEEK_SET)
-                    os.write(self.fd_user_db, struct.pack("I", BUNGIE_NET_USER_DB_SIGNATURE))
-                    os.write(self.fd_user_db, player.to_bytes())
+                data = self.login_tree.get(login_name)
+                if data:
+                    player_bytes = player.to_bytes()
+                    await self._pwrite(_PACKED_SIGNATURE + player_bytes, data.fpos)
+                    self._cache_player(data.online_data_index, player_bytes)
                     if logged_in_flag:
-                        self.online_player_data[node.data.online_data_index].logged_in_flag = True
-                        self.online_player_data[node.data.online_data_index].name = player.name
-                        self.online_player_data[node.data.online_data_index].aux_data = player.aux_data
+                        self.online_player_data[data.online_data_index].logged_in_flag = True
+                        self.online_player_data[data.online_data_index].name = player.name
+                        self.online_player_data[data.online_data_index].aux_data = player.aux_data
                     return True
             elif player_id > 0 and player_id <= self.total_players:
-                offset = (player_id - 1) * (4 + BungieNetPlayerDatum.size()) + struct.calcsize("I41I")
-                os.lseek(self.fd_user_db, offset, os.SEEK_SET)
-                os.write(self.fd_user_db, struct.pack("I", BUNGIE_NET_USER_DB_SIGNATURE))
-                os.write(self.fd_user_db, player.to_bytes())
+                offset = (player_id - 1) * _ENTRY_SIZE + _HEADER_SIZE
+                player_bytes = player.to_bytes()
+                await self._pwrite(_PACKED_SIGNATURE + player_bytes, offset)
+                self._cache_player(player_id - 1, player_bytes)
                 if logged_in_flag:
                     self.online_player_data[player_id - 1].logged_in_flag = True
                     self.online_player_data[player_id - 1].name = player.name
@@ -233,59 +253,80 @@ class UserDatabase:
             logger.error(f"Failed to update player information: {e}")
         return False
 
-    def new_user(self, player: BungieNetPlayerDatum) -> bool:
+    async def new_user(self, player: BungieNetPlayerDatum) -> bool:
         """Create a new user"""
+        # Appends are serialized so player IDs, file slots and caches stay in step
+        if self._new_user_lock is None:
+            self._new_user_lock = asyncio.Lock()
+        async with self._new_user_lock:
+            return await self._append_user(player)
+
+    async def _append_user(self, player: BungieNetPlayerDatum) -> bool:
+        """Write a new user entry at the end of the database"""
         try:
             self.total_players += 1
-            offset = (self.total_players - 1) * (struct.calcsize("I") + BungieNetPlayerDatum.size()) + struct.calcsize("I41I")
+            offset = (self.total_players - 1) * _ENTRY_SIZE + _HEADER_SIZE
             
             # Update header
-            os.lseek(self.fd_user_db, 0, os.SEEK_SET)
-            os.write(self.fd_user_db, struct.pack("I", self.total_players))
+            await self._pwrite(_SIG_STRUCT.pack(self.total_players), 0)
             
             # Write new user
-            os.lseek(self.fd_user_db, offset, os.SEEK_SET)
-            data = struct.pack("I", BUNGIE_NET_USER_DB_SIGNATURE) + player.to_bytes()
-            os.write(self.fd_user_db, data)
+            player_bytes = player.to_bytes()
+            data = _PACKED_SIGNATURE + player_bytes
+            await self._pwrite(data, offset)
+            self._remap()
             
             # Update login tree
             self.add_entry_to_login_tree(player, offset)
             
-            # Extend online player data array
+            # Extend online player data array and resident cache
             self.online_player_data.append(BungieNetOnlinePlayerData())
+            self.players.append(BungieNetPlayerDatum.from_bytes(player_bytes))
+            self._names_lower.append(player.name.lower())
             return True
-        except OSError as e:
+        except USER_DB_ERRORS as e:
             logger.error(f"Failed to create new user: {e}")
             self.total_players -= 1
             return False
 
     def query_user_database(self, query: UserQuery) -> List[UserQueryResponse]:
-        """Query the user database"""
-        responses: List[UserQueryResponse] = []
+        """Query the user database
         
-        for i in range(self.total_players):
-            player = BungieNetPlayerDatum()
-            if not self.get_player_information(None, i + 1, player):
+        Keeps the MAXIMUM_PLAYER_SEARCH_RESPONSES best matches across all
+        players, earliest first among equal scores.
+        """
+        # Min-heap of (score, -sequence, response); the root is the weakest kept match
+        heap: List[Tuple[int, int, UserQueryResponse]] = []
+        sequence = 0
+        query_lower = query.string.lower()
+        buddy_ids = frozenset(buddy_id for buddy_id in query.buddy_ids if buddy_id)  # Zero marks an empty slot
+        
+        def offer(score: int, player: BungieNetPlayerDatum) -> None:
+            nonlocal sequence
+            sequence -= 1
+            if len(heap) >= MAXIMUM_PLAYER_SEARCH_RESPONSES and (score, sequence) < heap[0][:2]:
+                return
+            response = UserQueryResponse()
+            response.match_score = score
+            response.aux_data = player.aux_data
+            if len(heap) < MAXIMUM_PLAYER_SEARCH_RESPONSES:
+                heapq.heappush(heap, (score, sequence, response))
+            else:
+                heapq.heapreplace(heap, (score, sequence, response))
+        
+        for player, name_lower in zip(self.players, self._names_lower):
+            if player is None:
                 continue
                 
             # Match by name
-            if query.string.lower() in player.name.lower():
-                response = UserQueryResponse()
-                response.match_score = len(query.string)
-                response.aux_data = player.aux_data
-                responses.append(response)
+            if query_lower in name_lower:
+                offer(len(query.string), player)
                 
             # Match by buddy list
-            if player.player_id in query.buddy_ids:
-                response = UserQueryResponse()
-                response.match_score = MAXIMUM_PLAYER_NAME_LENGTH + 1
-                response.aux_data = player.aux_data
-                responses.append(response)
-                
-            if len(responses) >= MAXIMUM_PLAYER_SEARCH_RESPONSES:
-                break
+            if player.player_id in buddy_ids:
+                offer(MAXIMUM_PLAYER_NAME_LENGTH + 1, player)
                 
-        return sorted(responses, key=lambda x: x.match_score, reverse=True)
+        return [response for _, _, response in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
 
     def is_player_online(self, player_id: int) -> bool:
         """Check if a player is online"""
@@ -295,22 +336,67 @@ class UserDatabase:
 
     def get_player_count_in_order(self, order_index: int) -> int:
         """Get number of players in an order"""
-        count = 0
-        if self.order_list:
-            element = self.order_list.head
-            while element:
-                data = element.data
-                if data.order_index == order_index and data.member_list:
-                    member = data.member_list.head
-                    while member:
-                        count += 1
-                        member = member.next
-                element = element.next
-        return count
-
-    def _login_tree_comp_func(self, k0: Any, k1: Any) -> int:
-        """Comparison function for login tree"""
-        return (k0.login > k1.login) - (k0.login < k1.login)
+        data = self.order_by_index.get(order_index)
+        return len(data.member_list) if data else 0
+
+    def add_player_to_order(self, order_index: int, player_id: int) -> bool:
+        """Add a player to an order's member list"""
+        if self.order_list is None:
+            return False
+            
+        data = self.order_by_index.get(order_index)
+        if data is None:
+            data = OrderListData(order_index=order_index)
+            self.order_list.insert(self.order_list.new_element(data, order_index))
+            self.order_by_index[order_index] = data
+            
+        data.member_list.append(player_id)
+        return True
+
+    def remove_player_from_order(self, order_index: int, player_id: int) -> bool:
+        """Remove a player from an order's member list"""
+        data = self.order_by_index.get(order_index)
+        if data is None:
+            return False
+            
+        try:
+            position = data.member_list.index(player_id)
+        except ValueError:
+            return False
+            
+        del data.member_list[position]
+        
+        # Keep an in-progress walk of this order on the member that follows
+        if self.present_order_cursor:
+            cursor_order, cursor_position = self.present_order_cursor
+            if cursor_order == order_index and position <= cursor_position:
+                self.present_order_cursor = (cursor_order, cursor_position - 1)
+        return True
+
+    async def _pwrite(self, data: bytes, offset: int) -> None:
+        """Write at offset on the default executor so the event loop keeps running"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, os.pwrite, self.fd_user_db, data, offset)
+
+    def _remap(self) -> None:
+        """(Re)map the whole database file for reads after it is opened or grows"""
+        if self.db_map:
+            self.db_map.close()
+        self.db_map = mmap.mmap(self.fd_user_db, 0, access=mmap.ACCESS_READ)
+
+    def _read_entry(self, offset: int) -> Optional[BungieNetPlayerDatum]:
+        """Decode the entry at offset straight from the mapped database"""
+        if _SIG_STRUCT.unpack_from(self.db_map, offset)[0] != BUNGIE_NET_USER_DB_SIGNATURE:
+            return None
+        start = offset + _SIG_STRUCT.size
+        return BungieNetPlayerDatum.from_bytes(self.db_map[start:start + _DATUM_SIZE])
+
+    def _cache_player(self, index: int, player_bytes: bytes) -> None:
+        """Replace a resident player entry with a private copy of what was written"""
+        if 0 <= index < len(self.players):
+            player = BungieNetPlayerDatum.from_bytes(player_bytes)
+            self.players[index] = player
+            self._names_lower[index] = player.name.lower()
 
     def add_entry_to_login_tree(self, player: BungieNetPlayerDatum, fpos: int) -> bool:
         """Add an entry to the login tree"""
@@ -319,11 +405,14 @@ class UserDatabase:
             online_data_index=player.player_id - 1,
             fpos=fpos
         )
-        return self.login_tree.insert(data)
+        self.login_tree[player.login] = data
+        return True
 
     def order_list_new(self) -> bool:
         """Create a new order list"""
         self.order_list = SLList()
+        self.order_by_index = {}
+        self.present_order_cursor = None
         return True
 
 # Global instance
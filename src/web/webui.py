@@ -6,18 +6,56 @@ This module provides:
 - Room and player management
 - Server statistics
 - Admin controls
+
+The app is ASGI (Quart) and every view is a coroutine, so a request waiting
+on I/O does not hold a worker thread. Serve it with an ASGI server, e.g.:
+
+    uvicorn src.web.webui:app --workers 4 --loop uvloop --http httptools
 """
 
-from flask import Flask, render_template, jsonify, request, session, redirect, url_for
-from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user
-from typing import Dict, List, Optional, Any
+from quart import Quart, Response, g, render_template, request, session, redirect, url_for
+from quart_auth import AuthUser, QuartAuth, Unauthorized, current_user, login_user, login_required, logout_user
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple, Union
+import asyncio
+import functools
+import hashlib
+import inspect
 import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itsdangerous import URLSafeTimedSerializer
+from itsdangerous.signer import SigningAlgorithm
+import msgspec
+import orjson
 from datetime import datetime
 from ..room.games import GameManager, GameInfo, PlayerInfo
 from ..room.games_log import GamesLogger
 from ..room.remote_commands import RemoteCommandHandler, CommandRequest, CommandType
 
-app = Flask(__name__)
+# Command types used by the views, bound once at import
+_CT_CREATE = CommandType.CREATE_ROOM
+_CT_END = CommandType.END_GAME
+_CT_STATS = CommandType.GET_SERVER_STATS
+_CT_MAINT = CommandType.MAINTENANCE
+
+class Blake2bSigningAlgorithm(SigningAlgorithm):
+    """Keyed BLAKE2b MAC: one hash pass where HMAC needs two."""
+    def get_signature(self, key: bytes, value: bytes) -> bytes:
+        return hashlib.blake2b(value, key=key, digest_size=32).digest()
+
+class Blake2bAuthSerializer(URLSafeTimedSerializer):
+    """Signs quart-auth login cookies with keyed BLAKE2b instead of HMAC-SHA512.
+    
+    The derived key is a 64-byte BLAKE2b digest, the longest key BLAKE2b takes.
+    """
+    def __init__(self, secret, salt):
+        super().__init__(secret, salt, signer_kwargs={
+            'digest_method': hashlib.blake2b,
+            'algorithm': Blake2bSigningAlgorithm(),
+        })
+
+app = Quart(__name__)
 app.secret_key = 'your-secret-key-here'  # Change this in production
 
 # Initialize components
@@ -29,209 +67,385 @@ command_handler = RemoteCommandHandler(game_manager, games_logger)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('webui')
 
-class User(UserMixin):
-    """User model for authentication."""
+# Worker threads for command handling, which may block on log file writes
+COMMAND_POOL_SIZE = 64
+_CMD_POOL = ThreadPoolExecutor(max_workers=COMMAND_POOL_SIZE, thread_name_prefix='webui-command')
+
+# Freshness windows (seconds) for cached game listings
+GAMES_FRESH_TTL = 3
+GAMES_STALE_TTL = 10
+
+class FlexibleCache:
+    """Stale-while-revalidate cache for slowly changing view data.
+    
+    Entries younger than fresh_ttl are served as is. Entries younger than
+    stale_ttl are served immediately while a background task reloads them,
+    so only a cold or expired key makes a request wait on its loader.
+    """
+    
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._generations: Dict[str, int] = {}
+    
+    async def __call__(self, key: str, fresh_ttl: float, stale_ttl: float,
+                       loader: Callable[[], Union[Any, Awaitable[Any]]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < fresh_ttl:
+                return entry[1]
+            if age < stale_ttl:
+                if key not in self._refreshing:
+                    task = asyncio.ensure_future(self._load(key, loader))
+                    self._refreshing[key] = task
+                    task.add_done_callback(lambda t: self._refresh_done(key, t))
+                return entry[1]
+        return await self._load(key, loader)
+    
+    def invalidate(self, key: str) -> None:
+        """Drop a key so the next read reloads it."""
+        self._entries.pop(key, None)
+        # Results of loads already in flight are discarded
+        self._generations[key] = self._generations.get(key, 0) + 1
+    
+    async def _load(self, key: str, loader: Callable[[], Union[Any, Awaitable[Any]]]) -> Any:
+        generation = self._generations.get(key, 0)
+        value = loader()
+        if inspect.isawaitable(value):
+            value = await value
+        if self._generations.get(key, 0) == generation:
+            self._entries[key] = (time.monotonic(), value)
+        return value
+    
+    def _refresh_done(self, key: str, task: asyncio.Task) -> None:
+        self._refreshing.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Error refreshing cached %s: %s", key, task.exception())
+
+flexible_cache = FlexibleCache()
+
+class PlayerView(msgspec.Struct):
+    """Player entry in a game's details."""
+    player_id: int
+    name: str
+    role: str
+    team: Optional[int]
+    is_ready: bool
+
+class SpectatorView(msgspec.Struct):
+    """Spectator entry in a game's details."""
+    player_id: int
+    name: str
+
+class GameSummaryView(msgspec.Struct):
+    """Game list entry."""
+    room_id: str
+    name: str
+    game_type: str
+    status: str
+    players: int
+    spectators: int
+    max_players: int
+    created_at: datetime
+
+class GameDetailView(msgspec.Struct):
+    """Detailed view of a game, including its players."""
+    room_id: str
+    name: str
+    game_type: str
+    status: str
+    players: List[PlayerView]
+    spectators: List[SpectatorView]
+    max_players: int
+    created_at: datetime
+    last_updated: datetime
+
+# msgspec encodes Structs with a per-type specialized encoder, skipping the
+# intermediate dicts the views used to build
+GAME_ENCODER = msgspec.json.Encoder()
+
+def game_summary(game: GameInfo) -> GameSummaryView:
+    """Build the game list entry for a game."""
+    return GameSummaryView(
+        game.room_id, game.name, game.game_type.name, game.status,
+        len(game.players), len(game.spectators), game.max_players, game.created_at
+    )
+
+def game_details(game: GameInfo) -> GameDetailView:
+    """Build the detailed view of a game, including its players."""
+    return GameDetailView(
+        game.room_id, game.name, game.game_type.name, game.status,
+        [PlayerView(p.player_id, p.name, p.role.name, p.team, p.is_ready) for p in game.players],
+        [SpectatorView(s.player_id, s.name) for s in game.spectators],
+        game.max_players, game.created_at, game.last_updated
+    )
+
+class GameJsonCache:
+    """Serialized game JSON, reused for as long as the source data is unchanged.
+    
+    The game list is re-encoded only when flexible_cache hands back a new
+    list object, and a game's details only when its last_updated moves.
+    """
+    
+    def __init__(self):
+        self._games: Optional[List[GameInfo]] = None
+        self._games_json = b'[]'
+        self._details: Dict[str, Tuple[datetime, bytes]] = {}
+    
+    def games_json(self, games: List[GameInfo]) -> bytes:
+        if games is not self._games:
+            # Encode entry by entry into one buffer rather than building the
+            # whole list of views first
+            buffer = bytearray(b'[')
+            for game in games:
+                if len(buffer) > 1:
+                    buffer += b','
+                GAME_ENCODER.encode_into(game_summary(game), buffer, -1)
+            buffer += b']'
+            self._games_json = bytes(buffer)
+            self._games = games
+        return self._games_json
+    
+    def game_json(self, game: GameInfo) -> bytes:
+        cached = self._details.get(game.room_id)
+        if cached is None or cached[0] != game.last_updated:
+            cached = (game.last_updated, GAME_ENCODER.encode(game_details(game)))
+            self._details[game.room_id] = cached
+        return cached[1]
+    
+    def discard(self, room_id: str) -> None:
+        self._details.pop(room_id, None)
+
+game_json_cache = GameJsonCache()
+
+def request_time() -> datetime:
+    """Timestamp for the current request, taken once and shared by everything it builds."""
+    now = g.get('now')
+    if now is None:
+        now = g.now = datetime.now()
+    return now
+
+async def run_command(cmd_req: CommandRequest) -> Any:
+    """Run a command on the command pool so blocking handlers never stall the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_CMD_POOL, command_handler.handle_command, cmd_req)
+
+def ojson(data: Any, status: int = 200) -> Response:
+    """Build a JSON response with orjson, which encodes datetimes natively."""
+    return Response(orjson.dumps(data), status=status, mimetype='application/json')
+
+class User:
+    """User record for authentication."""
+    __slots__ = ('id', 'username', 'is_admin')
+    
     def __init__(self, id: str, username: str, is_admin: bool = False):
         self.id = id
-        self.username = username
+        self.username = sys.intern(username)  # Shared with the users/cache dict keys
         self.is_admin = is_admin
 
 # Mock user database
-users = {
-    'admin': User('1', 'admin', True),
-    'user': User('2', 'user', False)
-}
+users = {user.username: user for user in (
+    User('1', 'admin', True),
+    User('2', 'user', False)
+)}
+users_by_id = {user.id: user for user in users.values()}
 
-login_manager = LoginManager()
-login_manager.init_app(app)
-login_manager.login_view = 'login'
+# Authenticated requests resolve their user on every hit; keep that O(1)
+USER_CACHE_SIZE = 4096
 
-@login_manager.user_loader
+@functools.lru_cache(maxsize=USER_CACHE_SIZE)
 def load_user(user_id: str) -> Optional[User]:
     """Load user from database."""
-    return users.get(user_id)
+    return users_by_id.get(user_id)
+
+@functools.lru_cache(maxsize=USER_CACHE_SIZE)
+def get_user_by_username(username: str) -> Optional[User]:
+    """Look up a user by login name."""
+    return users.get(username)
+
+def invalidate_user_cache() -> None:
+    """Forget cached user lookups; call after any user is added, changed or removed."""
+    load_user.cache_clear()
+    get_user_by_username.cache_clear()
+
+class SessionUser(AuthUser):
+    """Session user, resolved against the user database by auth id."""
+
+    @property
+    def user(self) -> Optional[User]:
+        return load_user(self.auth_id) if self.auth_id else None
+
+    @property
+    def username(self) -> str:
+        user = self.user
+        return user.username if user else ''
+
+    @property
+    def is_admin(self) -> bool:
+        user = self.user
+        return bool(user and user.is_admin)
+
+auth_manager = QuartAuth(app)
+auth_manager.user_class = SessionUser
+auth_manager.serializer_class = Blake2bAuthSerializer
+
+@app.after_serving
+async def shutdown_command_pool():
+    """Stop the command worker threads with the server."""
+    _CMD_POOL.shutdown(wait=False)
+
+@app.errorhandler(Unauthorized)
+async def redirect_to_login(error: Unauthorized):
+    """Send unauthenticated requests to the login page."""
+    return redirect(url_for('login'))
 
 @app.route('/')
-def index():
+async def index():
     """Render the main page."""
-    return render_template('index.html')
+    return await render_template('index.html')
 
 @app.route('/login', methods=['GET', 'POST'])
-def login():
+async def login():
     """Handle user login."""
     if request.method == 'POST':
-        username = request.form.get('username')
-        password = request.form.get('password')
+        form = await request.form
+        username = form.get('username')
+        password = form.get('password')
         
         # TODO: Implement proper authentication
-        if username in users and password == 'password':  # Change this in production
-            user = users[username]
-            login_user(user)
+        user = get_user_by_username(username) if username else None
+        if user and password == 'password':  # Change this in production
+            login_user(SessionUser(user.id))
             return redirect(url_for('dashboard'))
         
-        return render_template('login.html', error='Invalid credentials')
+        return await render_template('login.html', error='Invalid credentials')
     
-    return render_template('login.html')
+    return await render_template('login.html')
 
 @app.route('/logout')
 @login_required
-def logout():
+async def logout():
     """Handle user logout."""
     logout_user()
     return redirect(url_for('index'))
 
 @app.route('/dashboard')
 @login_required
-def dashboard():
+async def dashboard():
     """Render the dashboard."""
-    games = game_manager.get_all_games()
-    stats = game_manager.get_server_stats()
-    return render_template('dashboard.html', games=games, stats=stats)
+    games = await flexible_cache('games:all', GAMES_FRESH_TTL, GAMES_STALE_TTL, game_manager.get_all_games)
+    stats = await flexible_cache('stats:server', GAMES_FRESH_TTL, GAMES_STALE_TTL, game_manager.get_server_stats)
+    return await render_template('dashboard.html', games=games, stats=stats)
 
 @app.route('/api/games', methods=['GET'])
 @login_required
-def get_games():
+async def get_games():
     """Get all games."""
-    games = game_manager.get_all_games()
-    return jsonify([{
-        'room_id': game.room_id,
-        'name': game.name,
-        'game_type': game.game_type.name,
-        'status': game.status,
-        'players': len(game.players),
-        'spectators': len(game.spectators),
-        'max_players': game.max_players,
-        'created_at': game.created_at.isoformat()
-    } for game in games])
+    games = await flexible_cache('games:all', GAMES_FRESH_TTL, GAMES_STALE_TTL, game_manager.get_all_games)
+    return Response(game_json_cache.games_json(games), mimetype='application/json')
 
 @app.route('/api/games/<room_id>', methods=['GET'])
 @login_required
-def get_game(room_id: str):
+async def get_game(room_id: str):
     """Get game details."""
     game = game_manager.get_game(room_id)
     if not game:
-        return jsonify({'error': 'Game not found'}), 404
-    
-    return jsonify({
-        'room_id': game.room_id,
-        'name': game.name,
-        'game_type': game.game_type.name,
-        'status': game.status,
-        'players': [{
-            'player_id': p.player_id,
-            'name': p.name,
-            'role': p.role.name,
-            'team': p.team,
-            'is_ready': p.is_ready
-        } for p in game.players],
-        'spectators': [{
-            'player_id': s.player_id,
-            'name': s.name
-        } for s in game.spectators],
-        'max_players': game.max_players,
-        'created_at': game.created_at.isoformat(),
-        'last_updated': game.last_updated.isoformat()
-    })
+        game_json_cache.discard(room_id)
+        return ojson({'error': 'Game not found'}, 404)
+    
+    return Response(game_json_cache.game_json(game), mimetype='application/json')
 
-@app.route('/api/games', methods=['POST'])
-@login_required
-def create_game():
-    """Create a new game."""
-    data = request.get_json()
-    if not data:
-        return jsonify({'error': 'Invalid request'}), 400
+def invalidate_game_caches(room_id: Optional[str] = None) -> None:
+    """Drop cached game listings after a command changed the set of games."""
+    flexible_cache.invalidate('games:all')
+    flexible_cache.invalidate('stats:server')
+    if room_id is not None:
+        game_json_cache.discard(room_id)
+
+async def dispatch_command(command_type: CommandType, parameters: Dict[str, Any], action: str,
+                           status: int = 200, body: Optional[Any] = None,
+                           auth_token: Optional[str] = None,
+                           on_success: Optional[Callable[[], None]] = None) -> Response:
+    """Run a command for the current request and shape its JSON response.
     
+    Args:
+        command_type: Command to run
+        parameters: Command parameters
+        action: What the command does, for the error log (e.g. "creating game")
+        status: HTTP status on success
+        body: Response body on success; the command's data if None
+        auth_token: Session auth token, for privileged commands
+        on_success: Called after the command succeeds
+        
+    Returns:
+        Response: JSON response; 400 if the command failed, 500 on error
+    """
     try:
-        request = CommandRequest(
-            command_type=CommandType.CREATE_ROOM,
-            parameters=data,
-            timestamp=datetime.now(),
-            source=request.remote_addr
+        cmd_req = CommandRequest(
+            command_type=command_type,
+            parameters=parameters,
+            timestamp=request_time(),
+            source=request.remote_addr,
+            auth_token=auth_token
         )
         
-        response = command_handler.handle_command(request)
+        response = await run_command(cmd_req)
         if not response.success:
-            return jsonify({'error': response.message}), 400
+            return ojson({'error': response.message}, 400)
         
-        return jsonify(response.data), 201
+        if on_success:
+            on_success()
+        return ojson(response.data if body is None else body, status)
         
     except Exception as e:
-        logger.error(f"Error creating game: {e}")
-        return jsonify({'error': str(e)}), 500
+        logger.error("Error %s: %s", action, e)
+        return ojson({'error': str(e)}, 500)
+
+@app.route('/api/games', methods=['POST'])
+@login_required
+async def create_game():
+    """Create a new game."""
+    data = await request.get_json()
+    if not data:
+        return ojson({'error': 'Invalid request'}, 400)
+    
+    return await dispatch_command(_CT_CREATE, data, 'creating game', 201,
+                                  on_success=invalidate_game_caches)
 
 @app.route('/api/games/<room_id>', methods=['DELETE'])
 @login_required
-def delete_game(room_id: str):
+async def delete_game(room_id: str):
     """Delete a game."""
-    try:
-        request = CommandRequest(
-            command_type=CommandType.END_GAME,
-            parameters={'room_id': room_id},
-            timestamp=datetime.now(),
-            source=request.remote_addr
-        )
-        
-        response = command_handler.handle_command(request)
-        if not response.success:
-            return jsonify({'error': response.message}), 400
-        
-        return jsonify({'message': 'Game deleted'}), 200
-        
-    except Exception as e:
-        logger.error(f"Error deleting game: {e}")
-        return jsonify({'error': str(e)}), 500
+    return await dispatch_command(_CT_END, {'room_id': room_id}, 'deleting game',
+                                  body={'message': 'Game deleted'},
+                                  on_success=lambda: invalidate_game_caches(room_id))
 
 @app.route('/api/stats', methods=['GET'])
 @login_required
-def get_stats():
+async def get_stats():
     """Get server statistics."""
-    try:
-        request = CommandRequest(
-            command_type=CommandType.GET_SERVER_STATS,
-            parameters={},
-            timestamp=datetime.now(),
-            source=request.remote_addr
-        )
-        
-        response = command_handler.handle_command(request)
-        if not response.success:
-            return jsonify({'error': response.message}), 400
-        
-        return jsonify(response.data), 200
-        
-    except Exception as e:
-        logger.error(f"Error getting stats: {e}")
-        return jsonify({'error': str(e)}), 500
+    return await dispatch_command(_CT_STATS, {}, 'getting stats')
 
 @app.route('/api/maintenance', methods=['POST'])
 @login_required
-def set_maintenance():
+async def set_maintenance():
     """Set maintenance mode."""
     if not current_user.is_admin:
-        return jsonify({'error': 'Unauthorized'}), 403
+        return ojson({'error': 'Unauthorized'}, 403)
     
-    data = request.get_json()
+    data = await request.get_json()
     if not data or 'enabled' not in data:
-        return jsonify({'error': 'Invalid request'}), 400
+        return ojson({'error': 'Invalid request'}, 400)
     
-    try:
-        request = CommandRequest(
-            command_type=CommandType.MAINTENANCE,
-            parameters={'enabled': data['enabled']},
-            timestamp=datetime.now(),
-            source=request.remote_addr,
-            auth_token=session.get('auth_token')
-        )
-        
-        response = command_handler.handle_command(request)
-        if not response.success:
-            return jsonify({'error': response.message}), 400
-        
-        return jsonify({'message': 'Maintenance mode updated'}), 200
-        
-    except Exception as e:
-        logger.error(f"Error setting maintenance mode: {e}")
-        return jsonify({'error': str(e)}), 500
+    return await dispatch_command(_CT_MAINT, {'enabled': data['enabled']}, 'setting maintenance mode',
+                                  body={'message': 'Maintenance mode updated'},
+                                  auth_token=session.get('auth_token'))
 
 if __name__ == '__main__':
-    app.run(debug=True) 
\ No newline at end of file
+    import uvicorn
+    # Records don't need thread/process identity; set only when run as
+    # the server so importers keep their own logging configuration
+    logging.logThreads = False
+    logging.logProcesses = False
+    uvicorn.run(app, host='0.0.0.0', port=5000)
\ No newline at end of file
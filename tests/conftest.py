@@ -2,23 +2,33 @@
 Pytest configuration and fixtures.
 """
 
-import asyncio
 import os
 import pytest
-from typing import AsyncGenerator, Generator, Dict, Any
+import pytest_asyncio
+from typing import AsyncGenerator, Dict, Any
 from unittest.mock import MagicMock
 
 # Set test environment
 os.environ["MYTH_ENV"] = "test"
 
-@pytest.fixture(scope="session")
-def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
-    """Create an instance of the default event loop for each test case."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+# Service fixtures are initialized once per session. Fixtures and tests
+# share the session event loop (asyncio_default_fixture_loop_scope in
+# pytest.ini, and the marker added below). Services with a reset_state()
+# are handed to each test freshly reset; the others must not be assumed
+# to start out empty.
 
-@pytest.fixture
+def pytest_collection_modifyitems(items):
+    """Run every async test on the session event loop.
+    
+    Done with a marker rather than asyncio_default_test_loop_scope, which
+    needs pytest-asyncio 0.26+ and so Python 3.9+.
+    """
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def auth_service() -> AsyncGenerator:
     """Get the auth service instance."""
     from core.auth.auth_service import auth_service
@@ -26,7 +36,7 @@ async def auth_service() -> AsyncGenerator:
     yield auth_service
     await auth_service.cleanup()
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def game_service() -> AsyncGenerator:
     """Get the game service instance."""
     from core.services.game_service import game_service
@@ -34,21 +44,59 @@ async def game_service() -> AsyncGenerator:
     yield game_service
     await game_service.cleanup()
 
+@pytest.fixture(scope="session")
+def _room_service() -> Any:
+    """Create the shared room service instance."""
+    from core.services.room_service import RoomService
+    return RoomService()
+
+@pytest.fixture
+def room_service(_room_service: Any) -> Any:
+    """Get the room service, reset for this test."""
+    _room_service.reset_state()
+    return _room_service
+
+@pytest.fixture(scope="session")
+def _user_service() -> Any:
+    """Create the shared user service instance."""
+    from core.services.user_service import UserService
+    return UserService()
+
 @pytest.fixture
-async def room_service() -> AsyncGenerator:
-    """Get the room service instance."""
-    from core.services.room_service import room_service
-    await room_service.initialize()
-    yield room_service
-    await room_service.cleanup()
+def user_service(_user_service: Any) -> Any:
+    """Get the user service, reset for this test."""
+    _user_service.reset_state()
+    return _user_service
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def _session_manager() -> AsyncGenerator:
+    """Create and start the shared session manager, without its cleanup task."""
+    from core.auth.session_manager import SessionManager
+    manager = SessionManager()
+    await manager.start(run_background=False)
+    yield manager
+    await manager.stop()
+
+@pytest.fixture
+def session_manager(_session_manager: Any) -> Any:
+    """Get the session manager, reset for this test."""
+    _session_manager.reset_state()
+    return _session_manager
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def _monitoring_service() -> AsyncGenerator:
+    """Create and start the shared monitoring service."""
+    from core.services import MonitoringService
+    service = MonitoringService()
+    await service.start()
+    yield service
+    await service.stop()
 
 @pytest.fixture
-async def user_service() -> AsyncGenerator:
-    """Get the user service instance."""
-    from core.services.user_service import user_service
-    await user_service.initialize()
-    yield user_service
-    await user_service.cleanup()
+def monitoring_service(_monitoring_service: Any) -> Any:
+    """Get the monitoring service, reset for this test."""
+    _monitoring_service.reset_state()
+    return _monitoring_service
 
 @pytest.fixture
 def mock_config() -> Dict[str, Any]:
@@ -0,0 +1,24 @@
+"""
+Tests for the cseries fixed point helpers.
+"""
+
+import numpy as np
+import pytest
+
+from core.utils.cseries import fixed_to_float, fixed_to_floats, float_to_fixed, floats_to_fixed
+
+def test_floats_to_fixed_matches_scalar():
+    """Test that array conversion truncates exactly like float_to_fixed."""
+    values = [0.0, 1.5, -1.5, 0.25, -0.00001, 32767.99998, -32768.0]
+    assert floats_to_fixed(values).tolist() == [float_to_fixed(v) for v in values]
+
+@pytest.mark.parametrize("value", [32768.0, -32768.00002, 1e9, float("nan"), float("inf")])
+def test_floats_to_fixed_rejects_out_of_range(value):
+    """Test that values outside 32-bit fixed point raise instead of wrapping."""
+    with pytest.raises(ValueError):
+        floats_to_fixed([0.0, value])
+
+def test_fixed_to_floats_keeps_wide_input():
+    """Test that int64 input converts like fixed_to_float rather than truncating."""
+    values = np.array([1 << 16, -(1 << 16), 1 << 40], dtype=np.int64)
+    assert fixed_to_floats(values).tolist() == [fixed_to_float(int(v)) for v in values]
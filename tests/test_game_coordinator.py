@@ -139,8 +139,8 @@ async def test_inactive_cleanup(coordinator: GameCoordinator, game_settings: Dic
     for status in game_players.values():
         status.last_active = old_time
     
-    # Wait for cleanup
-    await asyncio.sleep(65)
+    # Run a cleanup pass instead of waiting for the minutely loop
+    await coordinator._run_cleanup_once()
     
     # Verify game cleaned up
     status = await coordinator.get_game_status(1)
@@ -153,9 +153,9 @@ async def test_player_activity(coordinator: GameCoordinator, game_settings: Dict
     await coordinator.initialize_game(1, game_settings)
     await coordinator.add_player(1, 101)
     
-    # Update activity
+    # Advance the coordinator's clock instead of sleeping
     old_time = coordinator.players[1][101].last_active
-    await asyncio.sleep(1)
+    coordinator._now = lambda: old_time + timedelta(seconds=1)
     
     assert await coordinator.update_player_activity(1, 101)
     new_time = coordinator.players[1][101].last_active
@@ -4,12 +4,12 @@ Tests for the monitoring system components.
 
 import pytest
 import asyncio
-import time
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 
 from core.monitoring.metrics import MetricsCollector, Metric
 from core.monitoring.logger import MonitoringLogger, LogEvent
 from core.monitoring.tracker import PerformanceTracker, PerformanceMetric
+from core.monitoring.reservoir import SlidingTimeWindowArrayReservoir
 
 @pytest.fixture
 def metrics_collector():
@@ -54,12 +54,53 @@ class TestMetricsCollector:
         assert latest is not None
         assert latest.value == 2.0
 
-    @patch('psutil.cpu_percent')
-    @patch('psutil.virtual_memory')
-    def test_system_metrics(self, mock_memory, mock_cpu, metrics_collector):
+    def test_history_limit(self, metrics_collector):
+        """Test that only the most recent max_history values are kept, in order."""
+        for value in range(150):
+            metrics_collector.record("test_metric", float(value), parity=str(value % 2))
+        
+        metrics = metrics_collector.get_metric("test_metric")
+        assert len(metrics) == 100
+        assert [m.value for m in metrics] == [float(v) for v in range(50, 150)]
+        assert metrics[-1].labels == {"parity": "1"}
+        assert metrics_collector.get_latest("test_metric").value == 149.0
+
+    def test_label_sets_bounded_by_history(self, metrics_collector):
+        """Test that label sets are freed once their samples age out."""
+        for value in range(1000):
+            metrics_collector.record("test_metric", float(value), request_id=str(value))
+        
+        metrics = metrics_collector.get_metric("test_metric")
+        assert [m.labels["request_id"] for m in metrics] == [str(v) for v in range(900, 1000)]
+        # One live set per stored sample, plus the empty set; a new sample's
+        # set is taken before the one it overwrites is freed
+        assert len(metrics_collector._label_ids) == 101
+        assert len(metrics_collector._label_sets) <= 102
+
+    def test_reset_state_clears_labels(self, metrics_collector):
+        """Test that reset_state also forgets interned label sets."""
+        for value in range(10):
+            metrics_collector.record("test_metric", float(value), request_id=str(value))
+        assert len(metrics_collector._label_ids) == 11
+        
+        metrics_collector.reset_state()
+        assert metrics_collector.get_metric("test_metric") == []
+        assert len(metrics_collector._label_ids) == 1
+
+    def test_metric_statistics(self, metrics_collector):
+        """Test average, variance and percentile over recorded values."""
+        for value in [1.0, 2.0, 3.0, 4.0, 5.0]:
+            metrics_collector.record("test_metric", value)
+        
+        assert metrics_collector.get_average("test_metric") == pytest.approx(3.0)
+        assert metrics_collector.get_variance("test_metric") == pytest.approx(2.0)
+        assert metrics_collector.get_percentile("test_metric", 0.95) == pytest.approx(5.0)
+        assert metrics_collector.get_average("missing") is None
+
+    def test_system_metrics(self, monkeypatch, metrics_collector):
         """Test collecting system metrics."""
-        mock_cpu.return_value = 50.0
-        mock_memory.return_value = MagicMock(percent=75.0)
+        monkeypatch.setattr('psutil.cpu_percent', lambda interval=None: 50.0)
+        monkeypatch.setattr('psutil.virtual_memory', lambda: MagicMock(percent=75.0))
         
         cpu_usage = metrics_collector._get_cpu_usage()
         memory_usage = metrics_collector._get_memory_usage()
@@ -90,13 +131,17 @@ class TestMonitoringLogger:
 class TestPerformanceTracker:
     def test_operation_timing(self, performance_tracker):
         """Test timing operations."""
+        # Script the clock instead of sleeping
+        now = [10.0]
+        performance_tracker._clock = lambda: now[0]
+        
         performance_tracker.start_operation("test_op")
-        time.sleep(0.1)
+        now[0] = 10.1
         metric = performance_tracker.stop_operation("test_op")
         
         assert metric is not None
         assert metric.operation == "test_op"
-        assert 0.05 < metric.duration < 0.15
+        assert metric.duration == pytest.approx(0.1)
 
     async def test_async_operation_timing(self, performance_tracker):
         """Test timing async operations."""
@@ -116,14 +161,67 @@ class TestPerformanceTracker:
 
     def test_performance_statistics(self, performance_tracker):
         """Test performance statistics calculations."""
-        # Record some test metrics
-        for duration in [0.1, 0.2, 0.3, 0.4, 0.5]:
+        # Record some test metrics, scripting the clock for each start/stop pair
+        durations = [0.1, 0.2, 0.3, 0.4, 0.5]
+        now = [0.0]
+        performance_tracker._clock = lambda: now[0]
+        
+        for duration in durations:
             performance_tracker.start_operation("test_op")
-            time.sleep(duration)
+            now[0] += duration
             performance_tracker.stop_operation("test_op")
         
         avg_duration = performance_tracker.get_average_duration("test_op")
         p95_duration = performance_tracker.get_percentile_duration("test_op", 0.95)
         
-        assert 0.25 < avg_duration < 0.35
-        assert 0.45 < p95_duration < 0.55
+        assert avg_duration == pytest.approx(0.3)
+        assert p95_duration == pytest.approx(0.5)
+        assert performance_tracker.get_percentile_durations("test_op", [0.0, 0.5, 0.95]) == \
+            pytest.approx([0.1, 0.3, 0.5])
+        assert len(performance_tracker.reservoirs["test_op"]) == 5
+
+    def test_window_follows_tracker_clock(self, performance_tracker):
+        """Test that the duration window expires on the tracker's own clock."""
+        now = [0.0]
+        performance_tracker._clock = lambda: now[0]
+        
+        performance_tracker.start_operation("test_op")
+        now[0] = 0.5
+        performance_tracker.stop_operation("test_op")
+        assert performance_tracker.get_average_duration("test_op") == pytest.approx(0.5)
+        
+        now[0] += performance_tracker.window_seconds + 2
+        assert len(performance_tracker.reservoirs["test_op"]) == 0
+        assert performance_tracker.get_average_duration("test_op") is None
+
+class TestSlidingTimeWindowArrayReservoir:
+    def test_window_expiry(self):
+        """Test that samples older than the window are dropped."""
+        now = [0]
+        reservoir = SlidingTimeWindowArrayReservoir(window_seconds=10, clock=lambda: now[0])
+        
+        reservoir.update(1.0)
+        now[0] = 5_000_000_000
+        reservoir.update(3.0)
+        assert len(reservoir) == 2
+        assert reservoir.mean() == pytest.approx(2.0)
+        assert reservoir.stddev() == pytest.approx(1.0)
+        
+        # The first second's bucket leaves the window
+        now[0] = 11_500_000_000
+        assert len(reservoir) == 1
+        assert reservoir.quantile(0.5) == pytest.approx(3.0)
+        
+        now[0] = 20_000_000_000
+        assert reservoir.mean() is None
+        assert reservoir.quantile(0.95) is None
+
+    def test_max_size(self):
+        """Test that the oldest samples are dropped beyond max_size."""
+        reservoir = SlidingTimeWindowArrayReservoir(max_size=3, clock=lambda: 0)
+        for value in [1.0, 2.0, 3.0, 4.0]:
+            reservoir.update(value)
+        
+        assert len(reservoir) == 3
+        assert list(reservoir.values()) == [2.0, 3.0, 4.0]
+        assert reservoir.mean() == pytest.approx(3.0)
@@ -29,14 +29,14 @@ async def test_network_service_start_stop(network_service: NetworkService):
 async def test_network_service_client_connection(network_service: NetworkService):
     """Test client connections."""
     # Start server
-    server_port = 8888
-    await network_service.start_server("127.0.0.1", server_port)
+    await network_service.start_server("127.0.0.1", 0)
+    server_port = network_service.port
     
     # Connect client
     reader, writer = await asyncio.open_connection("127.0.0.1", server_port)
     
     # Wait for client to be registered
-    await asyncio.sleep(0.1)
+    assert await network_service.wait_for_clients(1)
     
     # Check client is connected
     clients = await network_service.get_connected_clients()
@@ -57,14 +57,14 @@ async def test_network_service_client_connection(network_service: NetworkService
 async def test_network_service_message_sending(network_service: NetworkService):
     """Test sending messages between server and client."""
     # Start server
-    server_port = 8889
-    await network_service.start_server("127.0.0.1", server_port)
+    await network_service.start_server("127.0.0.1", 0)
+    server_port = network_service.port
     
     # Connect client
     reader, writer = await asyncio.open_connection("127.0.0.1", server_port)
     
     # Wait for client to be registered
-    await asyncio.sleep(0.1)
+    assert await network_service.wait_for_clients(1)
     client_id = list(await network_service.get_connected_clients())[0]
     
     # Send message to client
@@ -95,50 +95,51 @@ async def test_network_service_message_sending(network_service: NetworkService):
     await network_service.stop_server()
 
 @pytest.mark.asyncio
-async def test_network_service_broadcast(network_service: NetworkService):
+@pytest.mark.parametrize("client_count", [2, 100])
+async def test_network_service_broadcast(network_service: NetworkService, client_count: int):
     """Test broadcasting messages to all clients."""
     # Start server
-    server_port = 8890
-    await network_service.start_server("127.0.0.1", server_port)
+    await network_service.start_server("127.0.0.1", 0)
+    server_port = network_service.port
     
     # Connect multiple clients
-    client1_reader, client1_writer = await asyncio.open_connection("127.0.0.1", server_port)
-    client2_reader, client2_writer = await asyncio.open_connection("127.0.0.1", server_port)
+    connections = [
+        await asyncio.open_connection("127.0.0.1", server_port)
+        for _ in range(client_count)
+    ]
     
     # Wait for clients to be registered
-    await asyncio.sleep(0.1)
+    assert await network_service.wait_for_clients(client_count)
     clients = await network_service.get_connected_clients()
-    assert len(clients) == 2
+    assert len(clients) == client_count
     
     # Broadcast message
     test_message = b"Broadcast test"
     await network_service.broadcast(test_message)
     
-    # Verify both clients received the message
-    received1 = await client1_reader.read(100)
-    received2 = await client2_reader.read(100)
-    assert received1 == test_message
-    assert received2 == test_message
+    # Verify every client received the message
+    for reader, _ in connections:
+        assert await reader.readexactly(len(test_message)) == test_message
     
     # Cleanup
-    client1_writer.close()
-    client2_writer.close()
-    await client1_writer.wait_closed()
-    await client2_writer.wait_closed()
+    for _, writer in connections:
+        writer.close()
+    for _, writer in connections:
+        await writer.wait_closed()
     await network_service.stop_server()
 
 @pytest.mark.asyncio
 async def test_network_service_client_disconnect(network_service: NetworkService):
     """Test client disconnection handling."""
     # Start server
-    server_port = 8891
-    await network_service.start_server("127.0.0.1", server_port)
+    await network_service.start_server("127.0.0.1", 0)
+    server_port = network_service.port
     
     # Connect client
     reader, writer = await asyncio.open_connection("127.0.0.1", server_port)
     
     # Wait for client to be registered
-    await asyncio.sleep(0.1)
+    assert await network_service.wait_for_clients(1)
     clients = await network_service.get_connected_clients()
     assert len(clients) == 1
     client_id = list(clients)[0]
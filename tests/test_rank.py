@@ -0,0 +1,34 @@
+"""
+Tests for the ranking system.
+"""
+
+import pytest
+
+from core.models.bungie_net_player import BungieNetPlayerScoreDatum
+from core.services.rank import RankingSystem, RawRankData
+
+@pytest.fixture
+def ranking_system():
+    """Create a ranking system instance."""
+    return RankingSystem()
+
+def make_ranking_data(points):
+    return [
+        RawRankData(id=player_id, score=BungieNetPlayerScoreDatum(points=value, games_played=1))
+        for player_id, value in enumerate(points, start=1)
+    ]
+
+def test_sort_ranking_data(ranking_system: RankingSystem):
+    """Test that rankings sort best first."""
+    ranking_system.ranking_data = make_ranking_data([10, 30, 20])
+    ranking_system.sort_ranking_data()
+    assert [d.score.points for d in ranking_system.ranking_data] == [30, 20, 10]
+
+def test_sort_ranking_data_equal_size_passes(ranking_system: RankingSystem):
+    """Test that a new ranking list of the same size is sorted by its own scores."""
+    ranking_system.ranking_data = make_ranking_data([10, 20, 30])
+    ranking_system.sort_ranking_data()
+    
+    ranking_system.ranking_data = make_ranking_data([300, 100, 200])
+    ranking_system.sort_ranking_data()
+    assert [d.score.points for d in ranking_system.ranking_data] == [300, 200, 100]
@@ -3,17 +3,13 @@ Tests for the room service.
 """
 
 import pytest
+from dataclasses import replace
 from datetime import datetime
 from typing import Dict, Set
 
 from core.interfaces.room_interface import RoomSettings, RoomState, RoomInfo
 from core.services.room_service import RoomService
 
-@pytest.fixture
-async def room_service():
-    """Create a room service instance."""
-    return RoomService()
-
 @pytest.fixture
 def room_settings():
     """Create test room settings."""
@@ -73,7 +69,7 @@ async def test_room_joining(room_service: RoomService, room_settings: RoomSettin
 async def test_room_password(room_service: RoomService, room_settings: RoomSettings):
     """Test password-protected rooms."""
     # Create password-protected room
-    room_settings.password = "secret123"
+    room_settings = replace(room_settings, password="secret123")
     room_id = await room_service.create_room(1, room_settings)
     
     # Try joining without password
@@ -156,3 +152,86 @@ async def test_room_cleanup(room_service: RoomService, room_settings: RoomSettin
     # Verify room closed
     room_info = await room_service.get_room_info(room_id)
     assert room_info is None
+
+@pytest.mark.asyncio
+async def test_room_players_view(room_service: RoomService, room_settings: RoomSettings):
+    """Test that room players are returned as live, read-only views."""
+    room_id = await room_service.create_room(1, room_settings)
+    await room_service.join_room(room_id, 2)
+    
+    players = await room_service.get_room_players(room_id)
+    
+    # Views follow later membership changes
+    await room_service.join_room(room_id, 3)
+    await room_service.join_room(room_id, 4, as_spectator=True)
+    assert players['players'] == {2, 3}
+    assert 3 in players['players']
+    assert len(players['spectators']) == 1
+    
+    # Views can't be modified
+    with pytest.raises(AttributeError):
+        players['players'].add(5)
+    with pytest.raises(AttributeError):
+        players['spectators'].discard(4)
+    
+    # Set operators give plain sets
+    assert players['players'] | players['spectators'] == {2, 3, 4}
+
+@pytest.mark.asyncio
+async def test_room_players_snapshot(room_service: RoomService, room_settings: RoomSettings):
+    """Test that snapshots of room players are independent copies."""
+    room_id = await room_service.create_room(1, room_settings)
+    await room_service.join_room(room_id, 2)
+    await room_service.join_room(room_id, 3, as_spectator=True)
+    
+    players = await room_service.get_room_players(room_id, snapshot=True)
+    
+    # Snapshots don't follow the room
+    await room_service.join_room(room_id, 4)
+    assert players['players'] == {2}
+    
+    # Changing a snapshot doesn't affect the room
+    players['players'].add(5)
+    players['spectators'].clear()
+    current = await room_service.get_room_players(room_id)
+    assert current['players'] == {2, 4}
+    assert current['spectators'] == {3}
+
+@pytest.mark.asyncio
+async def test_list_rooms_cache(room_service: RoomService, room_settings: RoomSettings, monkeypatch):
+    """Test that cached room lists follow room changes."""
+    from unittest.mock import AsyncMock, MagicMock
+    fake_games = MagicMock(
+        create_game=AsyncMock(return_value=7),
+        add_player=AsyncMock(return_value=True),
+        end_game=AsyncMock(return_value=True)
+    )
+    monkeypatch.setattr("core.services.room_service.game_service", fake_games)
+    
+    assert await room_service.list_rooms() == []
+    
+    # Create
+    first_id = await room_service.create_room(1, room_settings)
+    second_id = await room_service.create_room(2, room_settings)
+    rooms = await room_service.list_rooms()
+    assert [room.room_id for room in rooms] == [first_id, second_id]
+    
+    # Callers get their own copy of the cached list
+    rooms.clear()
+    assert len(await room_service.list_rooms()) == 2
+    
+    # Start and end a game
+    await room_service.join_room(first_id, 1)
+    assert await room_service.start_game(first_id, 1) == 7
+    rooms = {room.room_id: room for room in await room_service.list_rooms()}
+    assert rooms[first_id].state == RoomState.IN_GAME
+    assert rooms[first_id].game_id == 7
+    
+    assert await room_service.end_game(first_id)
+    rooms = {room.room_id: room for room in await room_service.list_rooms()}
+    assert rooms[first_id].state == RoomState.WAITING
+    assert rooms[first_id].game_id is None
+    
+    # Close
+    assert await room_service.close_room(second_id)
+    assert [room.room_id for room in await room_service.list_rooms()] == [first_id]
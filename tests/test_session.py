@@ -9,14 +9,6 @@ from datetime import datetime, timedelta
 from core.auth.session_manager import SessionManager
 from core.interfaces.auth_interface import AuthToken
 
-@pytest.fixture
-async def session_manager():
-    """Create a session manager instance."""
-    manager = SessionManager()
-    await manager.start()
-    yield manager
-    await manager.stop()
-
 @pytest.fixture
 def auth_token():
     """Create a test auth token."""
@@ -8,11 +8,6 @@ from datetime import datetime, timedelta
 from core.interfaces.user_interface import UserRole, UserStatus
 from core.services.user_service import UserService
 
-@pytest.fixture
-async def user_service():
-    """Create a user service instance."""
-    return UserService()
-
 @pytest.mark.asyncio
 async def test_user_creation(user_service: UserService):
     """Test user account creation."""
@@ -192,3 +187,87 @@ async def test_password_reset(user_service: UserService):
     
     # Verify token consumed
     assert token not in user_service.reset_tokens
+
+@pytest.mark.asyncio
+async def test_bulk_user_creation(user_service: UserService, monkeypatch):
+    """Test bulk account creation."""
+    from core.services import user_service as user_service_module
+    
+    # Count password hashes
+    hashed = []
+    new_password_entry = user_service_module.new_password_entry
+    def counting_entry(password):
+        hashed.append(password)
+        return new_password_entry(password)
+    monkeypatch.setattr(user_service_module, "new_password_entry", counting_entry)
+    
+    await user_service.create_user(
+        username="taken",
+        email="taken@example.com",
+        password="password123"
+    )
+    hashed.clear()
+    
+    user_ids = await user_service.create_users_bulk([
+        ("alice", "alice@example.com", "shared"),
+        ("TAKEN", "new@example.com", "shared"),
+        ("bob", "bob@example.com", "shared"),
+        ("carol", "Taken@Example.com", "other"),
+        ("dave", "dave@example.com", "other"),
+        ("Alice", "alice2@example.com", "shared")
+    ])
+    
+    # Duplicates of existing or earlier rows get None
+    assert user_ids[1] is None
+    assert user_ids[3] is None
+    assert user_ids[5] is None
+    assert None not in (user_ids[0], user_ids[2], user_ids[4])
+    assert len(set(user_ids) - {None}) == 3
+    
+    # One hash per distinct password
+    assert sorted(hashed) == ["other", "shared"]
+    assert await user_service.verify_password(user_ids[0], "shared")
+    assert await user_service.verify_password(user_ids[2], "shared")
+    assert await user_service.verify_password(user_ids[4], "other")
+    assert not await user_service.verify_password(user_ids[4], "shared")
+
+@pytest.mark.asyncio
+async def test_password_reset_clears_verify_cache(user_service: UserService):
+    """Test that a completed reset invalidates cached password checks."""
+    user_id = await user_service.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="password123"
+    )
+    
+    # Cache both outcomes before the reset
+    assert await user_service.verify_password(user_id, "password123")
+    assert not await user_service.verify_password(user_id, "newpass123")
+    
+    assert await user_service.reset_password("test@example.com")
+    token = next(iter(user_service.reset_tokens.keys()))
+    assert await user_service.complete_reset(token, "newpass123")
+    
+    assert not await user_service.verify_password(user_id, "password123")
+    assert await user_service.verify_password(user_id, "newpass123")
+
+@pytest.mark.asyncio
+async def test_expired_reset_tokens_swept(user_service: UserService):
+    """Test that expired reset tokens are dropped as new ones are issued."""
+    from core.services.user_service import CLEANUP_BATCH_SIZE
+    
+    user_id = await user_service.create_user(
+        username="testuser",
+        email="test@example.com",
+        password="password123"
+    )
+    user_service.reset_tokens["expired"] = (user_id, datetime.now() - timedelta(hours=1))
+    
+    for _ in range(CLEANUP_BATCH_SIZE - 1):
+        assert await user_service.reset_password("test@example.com")
+    assert "expired" in user_service.reset_tokens
+    
+    # The sweep runs on the batch's last issue and keeps live tokens
+    assert await user_service.reset_password("test@example.com")
+    assert "expired" not in user_service.reset_tokens
+    assert len(user_service.reset_tokens) == CLEANUP_BATCH_SIZE
@@ -3,30 +3,7 @@ Test utilities and helper functions.
 """
 
 import asyncio
-from typing import Any, Callable, Coroutine, TypeVar
-
-T = TypeVar('T')
-
-async def async_test_with_timeout(
-    coro: Coroutine[Any, Any, T],
-    timeout: float = 5.0
-) -> T:
-    """Run an async test with a timeout."""
-    try:
-        return await asyncio.wait_for(coro, timeout=timeout)
-    except asyncio.TimeoutError:
-        raise TimeoutError(f"Test timed out after {timeout} seconds")
-
-def async_test(timeout: float = 5.0) -> Callable:
-    """Decorator for async test functions."""
-    def decorator(func: Callable) -> Callable:
-        async def wrapper(*args, **kwargs) -> Any:
-            return await async_test_with_timeout(
-                func(*args, **kwargs),
-                timeout=timeout
-            )
-        return wrapper
-    return decorator
+from typing import Any, Awaitable
 
 class AsyncContextManager:
     """Helper for async context management in tests."""
@@ -36,11 +13,16 @@ class AsyncContextManager:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         pass
 
-def mock_coro(return_value: Any = None) -> Coroutine:
-    """Create a coroutine mock."""
-    async def mock_coro_func(*args, **kwargs):
-        return return_value
-    return mock_coro_func()
+def mock_coro(return_value: Any = None) -> Awaitable:
+    """Create an awaitable mock that resolves to return_value.
+
+    Returns an already completed future on the running event loop. Unlike
+    a coroutine the result can be awaited any number of times, but never
+    from a different event loop.
+    """
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(return_value)
+    return future
 
 class MockResponse:
     """Mock HTTP response for testing."""
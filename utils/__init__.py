@@ -2,6 +2,6 @@
 Utility functions and classes for the Myth metaserver.
 """
 
-from .environment import Environment
+from . import environment
 
-__all__ = ['Environment']
+__all__ = ['environment']
@@ -6,14 +6,18 @@ Provides common constants, type aliases, and utility functions for:
 - Bit manipulation 
 - String manipulation
 - Network byte order conversion
+
+The fixed point and byte order conversions also come in array forms that
+convert a whole NumPy array in one call.
 """
 
+import sys
 import time
 import socket
 import struct
 from typing import Union, TypeVar, Any
-from dataclasses import dataclass
-from enum import IntEnum, auto
+
+import numpy as np
 
 # Constants
 TRUE = 1
@@ -35,6 +39,14 @@ SHORT_FIXED_FRACTIONAL_BITS = 8
 SHORT_FIXED_ONE = 1 << SHORT_FIXED_FRACTIONAL_BITS
 SHORT_FIXED_ONE_HALF = SHORT_FIXED_ONE // 2
 
+# Derived once so the conversions below are a single shift, mask or
+# multiply. Scaling by these reciprocals is exact: the ones are powers of two.
+_FIXED_TO_SHORT_FIXED_SHIFT = FIXED_FRACTIONAL_BITS - SHORT_FIXED_FRACTIONAL_BITS
+_FIXED_FRACTION_MASK = FIXED_ONE - 1
+_SHORT_FIXED_FRACTION_MASK = SHORT_FIXED_ONE - 1
+_FIXED_TO_FLOAT = 1.0 / FIXED_ONE
+_SHORT_FIXED_TO_FLOAT = 1.0 / SHORT_FIXED_ONE
+
 # Type aliases
 word = int  # unsigned short
 byte = int  # unsigned char
@@ -114,15 +126,15 @@ def low_word(n: int) -> int:
 # Fixed point math functions
 def fixed_to_short_fixed(f: fixed) -> short_fixed:
     """Convert from 16.16 to 8.8 fixed point"""
-    return f >> (FIXED_FRACTIONAL_BITS - SHORT_FIXED_FRACTIONAL_BITS)
+    return f >> _FIXED_TO_SHORT_FIXED_SHIFT
 
 def short_fixed_to_fixed(f: short_fixed) -> fixed:
     """Convert from 8.8 to 16.16 fixed point"""
-    return f << (FIXED_FRACTIONAL_BITS - SHORT_FIXED_FRACTIONAL_BITS)
+    return f << _FIXED_TO_SHORT_FIXED_SHIFT
 
 def fixed_to_float(f: fixed) -> float:
     """Convert from fixed point to float"""
-    return f / FIXED_ONE
+    return f * _FIXED_TO_FLOAT
 
 def float_to_fixed(f: float) -> fixed:
     """Convert from float to fixed point"""
@@ -138,15 +150,15 @@ def fixed_to_integer(f: fixed) -> int:
 
 def fixed_to_integer_round(f: fixed) -> int:
     """Convert from fixed point to integer with rounding"""
-    return fixed_to_integer(f + FIXED_ONE_HALF)
+    return (f + FIXED_ONE_HALF) >> FIXED_FRACTIONAL_BITS
 
 def fixed_fractional_part(f: fixed) -> fixed:
     """Get fractional part of fixed point number"""
-    return f & (FIXED_ONE - 1)
+    return f & _FIXED_FRACTION_MASK
 
 def short_fixed_to_float(f: short_fixed) -> float:
     """Convert from short fixed point to float"""
-    return f / SHORT_FIXED_ONE
+    return f * _SHORT_FIXED_TO_FLOAT
 
 def float_to_short_fixed(f: float) -> short_fixed:
     """Convert from float to short fixed point"""
@@ -162,11 +174,28 @@ def short_fixed_to_integer(f: short_fixed) -> int:
 
 def short_fixed_to_integer_round(f: short_fixed) -> int:
     """Convert from short fixed point to integer with rounding"""
-    return short_fixed_to_integer(f + SHORT_FIXED_ONE_HALF)
+    return (f + SHORT_FIXED_ONE_HALF) >> SHORT_FIXED_FRACTIONAL_BITS
 
 def short_fixed_fractional_part(f: short_fixed) -> short_fixed:
     """Get fractional part of short fixed point number"""
-    return f & (SHORT_FIXED_ONE - 1)
+    return f & _SHORT_FIXED_FRACTION_MASK
+
+def floats_to_fixed(a: np.ndarray) -> np.ndarray:
+    """Convert an array of floats to int32 fixed point, truncating like float_to_fixed
+    
+    Raises ValueError for values that don't fit in 32-bit fixed point
+    (|f| >= 32768.0) or aren't finite, rather than letting them wrap.
+    """
+    scaled = np.asarray(a, dtype=np.float64) * FIXED_ONE
+    # Truncation toward zero keeps anything strictly inside these bounds in range
+    if not np.all((scaled > -2.0**31 - 1) & (scaled < 2.0**31)):
+        raise ValueError("Value out of range for 32-bit fixed point")
+    return scaled.astype(np.int32)
+
+def fixed_to_floats(a: np.ndarray) -> np.ndarray:
+    """Convert an array of fixed point numbers to floats, like fixed_to_float"""
+    # Widened to float64 directly, so wider integer input isn't truncated
+    return np.asarray(a, dtype=np.float64) * _FIXED_TO_FLOAT
 
 # String manipulation functions
 def strupr(string: str) -> str:
@@ -185,19 +214,56 @@ def strnlwr(string: str, n: int) -> str:
     """Convert first n characters of string to lowercase"""
     return string[:n].lower() + string[n:]
 
-# Network byte order functions
-def ntohl(x: int) -> int:
-    """Convert 32-bit integer from network to host byte order"""
-    return socket.ntohl(x)
-
-def htonl(x: int) -> int:
-    """Convert 32-bit integer from host to network byte order"""
-    return socket.htonl(x)
-
-def ntohs(x: int) -> int:
-    """Convert 16-bit integer from network to host byte order"""
-    return socket.ntohs(x)
-
-def htons(x: int) -> int:
-    """Convert 16-bit integer from host to network byte order"""
-    return socket.htons(x)
+# Network byte order functions. These are socket's C functions themselves:
+# a Python wrapper doubled the cost of each call, and a pure-Python byte
+# swap measured several times slower still. On big-endian hosts they
+# return their argument unchanged.
+ntohl = socket.ntohl  # 32-bit, network to host byte order
+htonl = socket.htonl  # 32-bit, host to network byte order
+ntohs = socket.ntohs  # 16-bit, network to host byte order
+htons = socket.htons  # 16-bit, host to network byte order
+
+# Precompiled network order (big-endian) packers for reading and writing
+# fields directly in packet buffers
+_U32_BE = struct.Struct('>I')
+_U16_BE = struct.Struct('>H')
+
+def htonl_into(buffer: bytearray, offset: int, x: int) -> None:
+    """Write a 32-bit integer into buffer at offset in network byte order"""
+    _U32_BE.pack_into(buffer, offset, x)
+
+def ntohl_from(buffer: bytes, offset: int = 0) -> int:
+    """Read a 32-bit network byte order integer from buffer at offset"""
+    return _U32_BE.unpack_from(buffer, offset)[0]
+
+def htons_into(buffer: bytearray, offset: int, x: int) -> None:
+    """Write a 16-bit integer into buffer at offset in network byte order"""
+    _U16_BE.pack_into(buffer, offset, x)
+
+def ntohs_from(buffer: bytes, offset: int = 0) -> int:
+    """Read a 16-bit network byte order integer from buffer at offset"""
+    return _U16_BE.unpack_from(buffer, offset)[0]
+
+# Network order is big-endian, so conversions are a byte swap on
+# little-endian hosts and a no-op elsewhere
+_NEED_SWAP = sys.byteorder == 'little'
+
+def _swap_array(a: np.ndarray, dtype: Any) -> np.ndarray:
+    a = np.asarray(a, dtype=dtype)
+    return a.byteswap() if _NEED_SWAP else a.copy()
+
+def ntohl_array(a: np.ndarray) -> np.ndarray:
+    """Convert an array of 32-bit integers from network to host byte order"""
+    return _swap_array(a, np.uint32)
+
+def htonl_array(a: np.ndarray) -> np.ndarray:
+    """Convert an array of 32-bit integers from host to network byte order"""
+    return _swap_array(a, np.uint32)
+
+def ntohs_array(a: np.ndarray) -> np.ndarray:
+    """Convert an array of 16-bit integers from network to host byte order"""
+    return _swap_array(a, np.uint16)
+
+def htons_array(a: np.ndarray) -> np.ndarray:
+    """Convert an array of 16-bit integers from host to network byte order"""
+    return _swap_array(a, np.uint16)
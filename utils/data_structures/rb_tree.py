@@ -3,37 +3,82 @@ Red-black tree implementation for the Myth metaserver.
 A self-balancing binary search tree with guaranteed O(log n) operations.
 """
 
-from dataclasses import dataclass
-from enum import IntEnum
-from typing import Any, Callable, Generic, Optional, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, Generic, List, Optional, TypeVar
 
 import logging
+import operator
 
 logger = logging.getLogger(__name__)
 
 MAX_TREE_NAME_LENGTH = 64
+MAX_FREE_NODES = 1024  # Removed nodes kept per tree for reuse by insert
 
-class Color(IntEnum):
-    """Node colors for red-black tree"""
-    BLACK = 0
-    RED = 1
+# Node colors, as plain ints so rebalancing compares without enum dispatch
+BLACK = 0
+RED = 1
 
 K = TypeVar('K')  # Key type
 V = TypeVar('V')  # Value type
 
-@dataclass
-class Node(Generic[K, V]):
-    """Red-black tree node"""
-    key: K
-    data: V
-    color: Color = Color.RED
-    parent: Optional['Node[K, V]'] = None
-    left: Optional['Node[K, V]'] = None
-    right: Optional['Node[K, V]'] = None
+if TYPE_CHECKING:
+    class _NodeBase(Generic[K, V]):
+        __slots__ = ()
+else:
+    class _NodeBase:
+        """Runtime stand-in for Generic[K, V]: Node[K, V] subscripts to
+        Node itself, keeping the typing machinery out of node creation."""
+        __slots__ = ()
+
+        def __class_getitem__(cls, params):
+            return cls
+
+class Node(_NodeBase[K, V]):
+    """Red-black tree node
+    
+    Children live in a two-element list, kids[0] left and kids[1] right,
+    so a comparison result indexes the next child directly instead of
+    choosing between two attributes.
+    """
+    __slots__ = ('key', 'data', 'color', 'parent', 'kids')
+
+    def __init__(self, key: K, data: V):
+        self.key = key
+        self.data = data
+        self.color = RED
+        self.parent: 'Node[K, V]' = NIL
+        self.kids: List['Node[K, V]'] = [NIL, NIL]
+
+    @property
+    def left(self) -> 'Node[K, V]':
+        return self.kids[0]
+
+    @left.setter
+    def left(self, node: 'Node[K, V]') -> None:
+        self.kids[0] = node
+
+    @property
+    def right(self) -> 'Node[K, V]':
+        return self.kids[1]
+
+    @right.setter
+    def right(self, node: 'Node[K, V]') -> None:
+        self.kids[1] = node
+
+    def __repr__(self) -> str:
+        return f"Node(key={self.key!r}, data={self.data!r}, color={self.color!r})"
+
+# Shared black sentinel standing in for every missing child and the root's
+# parent, so fixups can read .color and .parent without None checks. Only
+# the removal fixup relies on its parent, which remove() sets just before.
+NIL: Node = Node.__new__(Node)
+NIL.key = NIL.data = None
+NIL.color = BLACK
+NIL.parent = NIL
+NIL.kids = [NIL, NIL]
 
 class RBTree(Generic[K, V]):
     """A self-balancing red-black tree implementation"""
-    def __init__(self, name: str, comp_func: Callable[[K, K], int]):
+    def __init__(self, name: str, comp_func: Optional[Callable[[K, K], int]] = None):
         """Initialize red-black tree
         
         Args:
@@ -42,15 +87,21 @@ class RBTree(Generic[K, V]):
                       negative if a < b
                       0 if a == b
                       positive if a > b
+                      None (or operator.sub) orders keys with the native
+                      < operator, skipping a Python call per tree level
         """
         if not name or len(name) > MAX_TREE_NAME_LENGTH:
             raise ValueError("Invalid tree name")
-        if not comp_func:
-            raise ValueError("Must provide comparison function")
             
         self.name = name
         self.comp_func = comp_func
-        self.root: Optional[Node[K, V]] = None
+        # operator.sub orders numbers exactly as their native < does
+        self._native_order = comp_func is None or comp_func is operator.sub
+        self.root: Node[K, V] = NIL
+        self._free: List[Node[K, V]] = []  # Recycled nodes, reset on reuse
+        if self._native_order:
+            # Chosen once here rather than tested on every lookup
+            self.search = self._search_native
 
     def search(self, key: K) -> Optional[Node[K, V]]:
         """Search for a node with the given key"""
@@ -58,286 +109,322 @@ class RBTree(Generic[K, V]):
             raise ValueError("Key cannot be None")
 
         current = self.root
-        while current:
-            cmp = self.comp_func(key, current.key)
+        comp_func = self.comp_func  # Bound once, not looked up per level
+        while current is not NIL:
+            cmp = comp_func(key, current.key)
             if cmp == 0:
                 return current
-            current = current.left if cmp < 0 else current.right
+            current = current.kids[cmp > 0]
+        return None
+
+    def _search_native(self, key: K) -> Optional[Node[K, V]]:
+        """search() for natively ordered keys, such as ints and strs
+        
+        Compares with == and < directly, so each level costs C-level
+        comparisons and no comparator call.
+        """
+        if not key:
+            raise ValueError("Key cannot be None")
+
+        current = self.root
+        while current is not NIL:
+            current_key = current.key
+            if key == current_key:
+                return current
+            current = current.kids[current_key < key]
         return None
 
     def find_minimum(self, start_node: Optional[Node[K, V]] = None) -> Optional[Node[K, V]]:
         """Find node with minimum key in subtree"""
-        if not start_node:
+        if start_node is None or start_node is NIL:
             start_node = self.root
-        if not start_node:
+        if start_node is NIL:
             return None
             
         current = start_node
-        while current.left:
-            current = current.left
+        while current.kids[0] is not NIL:
+            current = current.kids[0]
         return current
 
     def find_maximum(self, start_node: Optional[Node[K, V]] = None) -> Optional[Node[K, V]]:
         """Find node with maximum key in subtree"""
-        if not start_node:
+        if start_node is None or start_node is NIL:
             start_node = self.root
-        if not start_node:
+        if start_node is NIL:
             return None
             
         current = start_node
-        while current.right:
-            current = current.right
+        while current.kids[1] is not NIL:
+            current = current.kids[1]
         return current
 
     def find_predecessor(self, node: Node[K, V]) -> Optional[Node[K, V]]:
         """Find predecessor of given node"""
-        if not node:
+        if node is None or node is NIL:
             return None
 
         # If left subtree exists, find maximum in it
-        if node.left:
-            return self.find_maximum(node.left)
+        if node.kids[0] is not NIL:
+            return self.find_maximum(node.kids[0])
 
         # Otherwise, walk up until we find first right child
         current = node
         parent = node.parent
-        while parent and current == parent.left:
+        while parent is not NIL and current is parent.kids[0]:
             current = parent
             parent = parent.parent
-        return parent
+        return parent if parent is not NIL else None
 
     def find_successor(self, node: Node[K, V]) -> Optional[Node[K, V]]:
         """Find successor of given node"""
-        if not node:
+        if node is None or node is NIL:
             return None
 
         # If right subtree exists, find minimum in it
-        if node.right:
-            return self.find_minimum(node.right)
+        if node.kids[1] is not NIL:
+            return self.find_minimum(node.kids[1])
 
         # Otherwise, walk up until we find first left child
         current = node
         parent = node.parent
-        while parent and current == parent.right:
+        while parent is not NIL and current is parent.kids[1]:
             current = parent
             parent = parent.parent
-        return parent
+        return parent if parent is not NIL else None
 
     def insert(self, key: K, data: V) -> Node[K, V]:
         """Insert new node with key and data"""
-        node = Node(key=key, data=data)
+        if self._free:
+            node = self._free.pop()
+            node.key = key
+            node.data = data
+            node.color = RED
+        else:
+            node = Node(key, data)
         
-        # Do standard BST insert
-        parent = None
+        # Do standard BST insert, remembering the last comparison so the
+        # new node's side of its parent needs no second call, and the
+        # ancestors passed on the way down for the fixup. Equal keys go
+        # right, as before.
+        path: List[Node[K, V]] = []
+        parent = NIL
+        side = 1
         current = self.root
-        while current:
-            parent = current
-            cmp = self.comp_func(node.key, current.key)
-            if cmp < 0:
-                current = current.left
-            else:
-                current = current.right
+        if self._native_order:
+            while current is not NIL:
+                path.append(current)
+                parent = current
+                side = not key < current.key
+                current = current.kids[side]
+        else:
+            comp_func = self.comp_func
+            while current is not NIL:
+                path.append(current)
+                parent = current
+                side = comp_func(key, current.key) >= 0
+                current = current.kids[side]
                 
         node.parent = parent
-        if not parent:
+        if parent is NIL:
             self.root = node
         else:
-            if self.comp_func(node.key, parent.key) < 0:
-                parent.left = node
-            else:
-                parent.right = node
+            parent.kids[side] = node
                 
         # Fix red-black properties
-        self._fix_insert(node)
+        self._fix_insert(node, path)
         return node
 
     def remove(self, node: Node[K, V]) -> None:
-        """Remove node from tree"""
-        if not node:
+        """Remove node from tree
+        
+        The node passed in (or, for a node with two children, its successor,
+        whose key and data move into it) is recycled for later inserts, so
+        handles to it must not be used afterwards.
+        """
+        if node is None or node is NIL:
             return
             
         # If node has two children, replace with successor
-        if node.left and node.right:
-            successor = self.find_successor(node)
-            if successor:
-                node.key = successor.key
-                node.data = successor.data
-                node = successor
-
-        # Get child (at most one) and parent
-        child = node.left if node.left else node.right
+        kids = node.kids
+        if kids[0] is not NIL and kids[1] is not NIL:
+            successor = self.find_minimum(kids[1])
+            node.key = successor.key
+            node.data = successor.data
+            node = successor
+            kids = node.kids
+
+        # Get child (at most one, possibly NIL) and parent
+        child = kids[0] if kids[0] is not NIL else kids[1]
         parent = node.parent
         
-        # Replace node with child
-        if child:
-            child.parent = parent
-        if not parent:
+        # Replace node with child. The child's parent is set even when it
+        # is NIL, which is how _fix_remove finds its way back up.
+        child.parent = parent
+        if parent is NIL:
             self.root = child
-        elif node == parent.left:
-            parent.left = child
         else:
-            parent.right = child
+            parent.kids[parent.kids[1] is node] = child
             
         # If we removed a black node, fix properties
-        if node.color == Color.BLACK:
-            self._fix_remove(child, parent)
-
-    def _fix_insert(self, node: Node[K, V]) -> None:
-        """Fix red-black tree properties after insertion"""
-        while node != self.root and node.parent and node.parent.color == Color.RED:
-            if node.parent == node.parent.parent.left:
-                uncle = node.parent.parent.right
-                if uncle and uncle.color == Color.RED:
-                    node.parent.color = Color.BLACK
-                    uncle.color = Color.BLACK
-                    node.parent.parent.color = Color.RED
-                    node = node.parent.parent
-                else:
-                    if node == node.parent.right:
-                        node = node.parent
-                        self._rotate_left(node)
-                    node.parent.color = Color.BLACK
-                    node.parent.parent.color = Color.RED
-                    self._rotate_right(node.parent.parent)
-            else:
-                uncle = node.parent.parent.left
-                if uncle and uncle.color == Color.RED:
-                    node.parent.color = Color.BLACK
-                    uncle.color = Color.BLACK
-                    node.parent.parent.color = Color.RED
-                    node = node.parent.parent
-                else:
-                    if node == node.parent.left:
-                        node = node.parent
-                        self._rotate_right(node)
-                    node.parent.color = Color.BLACK
-                    node.parent.parent.color = Color.RED
-                    self._rotate_left(node.parent.parent)
-                    
-        self.root.color = Color.BLACK
+        if node.color == BLACK:
+            self._fix_remove(child)
+
+        # Recycle the unlinked node; callers must not keep using it
+        if len(self._free) < MAX_FREE_NODES:
+            node.key = node.data = None
+            node.parent = kids[0] = kids[1] = NIL
+            self._free.append(node)
 
-    def _fix_remove(self, node: Optional[Node[K, V]], parent: Optional[Node[K, V]]) -> None:
-        """Fix red-black tree properties after removal"""
-        while (node != self.root and 
-               (not node or node.color == Color.BLACK)):
-            if not parent:
+    def _fix_insert(self, node: Node[K, V], path: List[Node[K, V]]) -> None:
+        """Fix red-black tree properties after insertion
+        
+        Uses Okasaki's balance: a red node under a red parent is resolved by
+        rebuilding the node, parent and grandparent as a red subtree root
+        with two black children, whatever the uncle's color, and repeating
+        from that root.
+        
+        Args:
+            node: The inserted node
+            path: Its ancestors, root first, as collected during descent;
+                  consumed from the end instead of chasing parent pointers
+        """
+        while path:
+            parent = path.pop()
+            if parent.color == BLACK:
                 break
-                
-            if node == parent.left:
-                sibling = parent.right
-                if sibling and sibling.color == Color.RED:
-                    sibling.color = Color.BLACK
-                    parent.color = Color.RED
-                    self._rotate_left(parent)
-                    sibling = parent.right
-
-                if (not sibling or
-                    (not sibling.left or sibling.left.color == Color.BLACK) and
-                    (not sibling.right or sibling.right.color == Color.BLACK)):
-                    if sibling:
-                        sibling.color = Color.RED
-                    node = parent
-                    parent = node.parent
+            # A red parent is never the root, so the grandparent exists
+            grandparent = path.pop()
+            
+            # Order the three nodes as low < mid < high and take the two
+            # inner subtrees; the outer two stay where they are
+            if parent is grandparent.kids[0]:
+                high = grandparent
+                if node is parent.kids[0]:
+                    low, mid = node, parent
+                    inner_left, inner_right = node.kids[1], parent.kids[1]
                 else:
-                    if not sibling.right or sibling.right.color == Color.BLACK:
-                        if sibling.left:
-                            sibling.left.color = Color.BLACK
-                        sibling.color = Color.RED
-                        self._rotate_right(sibling)
-                        sibling = parent.right
-
-                    if sibling:
-                        sibling.color = parent.color
-                    parent.color = Color.BLACK
-                    if sibling and sibling.right:
-                        sibling.right.color = Color.BLACK
-                    self._rotate_left(parent)
-                    node = self.root
-                    break
+                    low, mid = parent, node
+                    inner_left, inner_right = node.kids
             else:
-                sibling = parent.left
-                if sibling and sibling.color == Color.RED:
-                    sibling.color = Color.BLACK
-                    parent.color = Color.RED
-                    self._rotate_right(parent)
-                    sibling = parent.left
-
-                if (not sibling or
-                    (not sibling.right or sibling.right.color == Color.BLACK) and
-                    (not sibling.left or sibling.left.color == Color.BLACK)):
-                    if sibling:
-                        sibling.color = Color.RED
-                    node = parent
-                    parent = node.parent
+                low = grandparent
+                if node is parent.kids[0]:
+                    mid, high = node, parent
+                    inner_left, inner_right = node.kids
                 else:
-                    if not sibling.left or sibling.left.color == Color.BLACK:
-                        if sibling.right:
-                            sibling.right.color = Color.BLACK
-                        sibling.color = Color.RED
-                        self._rotate_left(sibling)
-                        sibling = parent.left
-
-                    if sibling:
-                        sibling.color = parent.color
-                    parent.color = Color.BLACK
-                    if sibling and sibling.left:
-                        sibling.left.color = Color.BLACK
-                    self._rotate_right(parent)
-                    node = self.root
-                    break
-
-        if node:
-            node.color = Color.BLACK
-
-    def _rotate_left(self, node: Node[K, V]) -> None:
-        """Rotate subtree left around node"""
-        if not node or not node.right:
-            return
+                    mid, high = parent, node
+                    inner_left, inner_right = parent.kids[0], node.kids[0]
             
-        y = node.right
-        node.right = y.left
-        if y.left:
-            y.left.parent = node
+            # Put mid where the grandparent was
+            top = grandparent.parent
+            mid.parent = top
+            if top is NIL:
+                self.root = mid
+            else:
+                top.kids[top.kids[1] is grandparent] = mid
             
-        y.parent = node.parent
-        if not node.parent:
-            self.root = y
-        elif node == node.parent.left:
-            node.parent.left = y
-        else:
-            node.parent.right = y
+            low.kids[1] = inner_left
+            if inner_left is not NIL:
+                inner_left.parent = low
+            high.kids[0] = inner_right
+            if inner_right is not NIL:
+                inner_right.parent = high
+            mid_kids = mid.kids
+            mid_kids[0] = low
+            mid_kids[1] = high
+            low.parent = high.parent = mid
             
-        y.left = node
-        node.parent = y
+            low.color = high.color = BLACK
+            mid.color = RED
+            node = mid
+                    
+        self.root.color = BLACK
 
-    def _rotate_right(self, node: Node[K, V]) -> None:
-        """Rotate subtree right around node"""
-        if not node or not node.left:
-            return
-            
-        y = node.left
-        node.left = y.right
-        if y.right:
-            y.right.parent = node
-            
-        y.parent = node.parent
-        if not node.parent:
-            self.root = y
-        elif node == node.parent.left:
-            node.parent.left = y
-        else:
-            node.parent.right = y
-            
-        y.right = node
-        node.parent = y
+    def _fix_remove(self, node: Node[K, V]) -> None:
+        """Fix red-black tree properties after removal
+        
+        The left and right cases are one loop body: side indexes the
+        node's position under its parent and other the sibling's, so each
+        rotation is written once. Rotations are inlined, and the parent,
+        sibling and nephews held in locals, saving repeated attribute
+        loads and a method call per step.
+        """
+        root = self.root
+        while node is not root and node.color == BLACK:
+            parent = node.parent
+            kids = parent.kids
+            # The sibling is never NIL here, so a NIL node still matches
+            # only its own side
+            side = 1 if kids[1] is node else 0
+            other = 1 - side
+            sibling = kids[other]
+            if sibling.color == RED:
+                sibling.color = BLACK
+                parent.color = RED
+                # Rotate parent towards side, lifting sibling
+                inner = sibling.kids[side]
+                kids[other] = inner
+                if inner is not NIL:
+                    inner.parent = parent
+                top = parent.parent
+                sibling.parent = top
+                if top is NIL:
+                    self.root = root = sibling
+                else:
+                    top.kids[top.kids[1] is parent] = sibling
+                sibling.kids[side] = parent
+                parent.parent = sibling
+                sibling = inner
+
+            near = sibling.kids[side]
+            far = sibling.kids[other]
+            if near.color == BLACK and far.color == BLACK:
+                sibling.color = RED
+                node = parent
+                continue
+
+            if far.color == BLACK:
+                near.color = BLACK
+                sibling.color = RED
+                # Rotate sibling away from side, lifting near
+                inner = near.kids[other]
+                sibling.kids[side] = inner
+                if inner is not NIL:
+                    inner.parent = sibling
+                near.parent = parent
+                kids[other] = near
+                near.kids[other] = sibling
+                sibling.parent = near
+                far = sibling
+                sibling = near
+
+            sibling.color = parent.color
+            parent.color = BLACK
+            far.color = BLACK
+            # Rotate parent towards side, lifting sibling
+            inner = sibling.kids[side]
+            kids[other] = inner
+            if inner is not NIL:
+                inner.parent = parent
+            top = parent.parent
+            sibling.parent = top
+            if top is NIL:
+                self.root = root = sibling
+            else:
+                top.kids[top.kids[1] is parent] = sibling
+            sibling.kids[side] = parent
+            parent.parent = sibling
+            node = root
+            break
+
+        node.color = BLACK
 
     def validate(self) -> bool:
         """Validate red-black tree properties"""
-        if not self.root:
+        if self.root is NIL:
             return True
             
         # Property 1: Root must be black
-        if self.root.color != Color.BLACK:
+        if self.root.color != BLACK:
             return False
             
         # Property 2: No red node has red child
@@ -345,29 +432,40 @@ class RBTree(Generic[K, V]):
         black_height = self._validate_properties(self.root)
         return black_height >= 0
 
-    def _validate_properties(self, node: Optional[Node[K, V]]) -> int:
-        """Helper for validate(), returns black-height if valid, -1 if invalid"""
-        if not node:
-            return 0
-            
-        # Check red property
-        if node.color == Color.RED:
-            if (node.left and node.left.color == Color.RED) or \
-               (node.right and node.right.color == Color.RED):
+    def _validate_properties(self, node: Node[K, V]) -> int:
+        """Helper for validate(), returns black-height if valid, -1 if invalid
+        
+        Walks the subtree in post-order with an explicit stack instead of
+        recursing, so deep trees need no extra Python frames.
+        """
+        # (node, children_done) entries; heights holds finished subtrees'
+        # black-heights, left before right
+        stack = [(node, False)]
+        heights: List[int] = []
+        while stack:
+            node, children_done = stack.pop()
+            if node is NIL:
+                heights.append(0)
+                continue
+                
+            if not children_done:
+                # Check red property
+                if node.color == RED:
+                    left, right = node.kids
+                    if left.color == RED or right.color == RED:
+                        return -1
+                stack.append((node, True))
+                stack.append((node.kids[1], False))
+                stack.append((node.kids[0], False))
+                continue
+                
+            # Heights must match
+            right_height = heights.pop()
+            left_height = heights.pop()
+            if left_height != right_height:
                 return -1
                 
-        # Check recursive properties
-        left_height = self._validate_properties(node.left)
-        if left_height < 0:
-            return -1
-            
-        right_height = self._validate_properties(node.right)
-        if right_height < 0:
-            return -1
-            
-        # Heights must match
-        if left_height != right_height:
-            return -1
+            heights.append(left_height + (1 if node.color == BLACK else 0))
             
         # Return black-height
-        return left_height + (1 if node.color == Color.BLACK else 0)
+        return heights[0]
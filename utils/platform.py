@@ -8,6 +8,9 @@ Copyright (c) 1997-2002 Bungie Studios
 import sys
 import platform
 import enum
+import functools
+from types import MappingProxyType
+from typing import Any, Mapping
 
 class Platform(enum.Enum):
     """Supported platforms"""
@@ -15,6 +18,9 @@ class Platform(enum.Enum):
     LINUX = "linux"
     MACOS = "darwin"
 
+# The platform can't change while running, so these are computed once
+
+@functools.lru_cache(maxsize=None)
 def get_current_platform() -> Platform:
     """Get the current platform"""
     system = sys.platform.lower()
@@ -27,16 +33,18 @@ def get_current_platform() -> Platform:
     else:
         raise RuntimeError(f"Unsupported platform: {system}")
 
+@functools.lru_cache(maxsize=None)
 def is_64bit() -> bool:
     """Check if running on 64-bit platform"""
-    return sys.maxsize > 2**32
+    return sys.maxsize > (1 << 32)
 
-def get_platform_info() -> dict:
-    """Get detailed platform information"""
-    return {
+@functools.lru_cache(maxsize=None)
+def get_platform_info() -> Mapping[str, Any]:
+    """Get detailed platform information, as a read-only mapping"""
+    return MappingProxyType({
         "platform": get_current_platform(),
         "machine": platform.machine(),
         "processor": platform.processor(),
         "python_version": platform.python_version(),
         "is_64bit": is_64bit()
-    }
+    })
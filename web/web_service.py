@@ -5,11 +5,12 @@ Provides web interface for monitoring and managing the server.
 
 import asyncio
 import logging
+import time
 from aiohttp import web
 import aiohttp_jinja2
 import jinja2
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, Tuple
 
 from ..models.game import GameManager
 from ..models.room import RoomInfo
@@ -21,9 +22,15 @@ logger = logging.getLogger(__name__)
 class WebService:
     """Web interface service"""
     
-    def __init__(self, host: str = '0.0.0.0', port: int = 8080):
+    def __init__(self, host: str = '0.0.0.0', port: int = 8080, cache_ttl: float = 1.0,
+                 auto_reload: bool = False):
         self.host = host
         self.port = port
+        self.auto_reload = auto_reload  # Re-check template mtimes on render (development)
+        # Summary pages are polled by dashboards; their counts change slowly,
+        # so each page context is reused for cache_ttl seconds
+        self.cache_ttl = cache_ttl
+        self._page_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
         self.app = web.Application()
         self.setup_routes()
         self.setup_jinja()
@@ -35,17 +42,23 @@ class WebService:
 
     def setup_routes(self):
         """Set up web routes"""
-        self.app.router.add_get('/', self.handle_index)
-        self.app.router.add_get('/rooms', self.handle_rooms)
-        self.app.router.add_get('/games', self.handle_games)
-        self.app.router.add_get('/stats', self.handle_stats)
+        self.app.router.add_routes([
+            web.get('/', self.handle_index),
+            web.get('/rooms', self.handle_rooms),
+            web.get('/games', self.handle_games),
+            web.get('/stats', self.handle_stats),
+        ])
         
     def setup_jinja(self):
         """Set up Jinja2 templating"""
         template_path = Path(__file__).parent / 'templates'
+        # Compiled templates persist in a per-user temp directory, so a
+        # restart renders without parsing them again
         aiohttp_jinja2.setup(
             self.app,
-            loader=jinja2.FileSystemLoader(str(template_path))
+            loader=jinja2.FileSystemLoader(str(template_path)),
+            auto_reload=self.auto_reload,
+            bytecode_cache=jinja2.FileSystemBytecodeCache()
         )
 
     async def start(self):
@@ -56,14 +69,24 @@ class WebService:
         await site.start()
         logger.info(f'Web interface running at http://{self.host}:{self.port}')
 
+    def _cached_context(self, page: str, build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Get a page's template context, rebuilding it once cache_ttl has passed"""
+        now = time.monotonic()
+        cached = self._page_cache.get(page)
+        if cached and now - cached[0] < self.cache_ttl:
+            return cached[1]
+        context = build()
+        self._page_cache[page] = (now, context)
+        return context
+
     @aiohttp_jinja2.template('index.html')
     async def handle_index(self, request):
         """Handle index page"""
-        return {
+        return self._cached_context('index', lambda: {
             'room_count': len(self.room_service.rooms),
             'game_count': len(self.game_manager.games),
             'uptime': 0  # TODO: Add uptime tracking
-        }
+        })
 
     @aiohttp_jinja2.template('rooms.html')
     async def handle_rooms(self, request):
@@ -80,10 +103,10 @@ class WebService:
     @aiohttp_jinja2.template('stats.html')
     async def handle_stats(self, request):
         """Handle stats page"""
-        return {
+        return self._cached_context('stats', lambda: {
             'stats': {
                 'rooms': len(self.room_service.rooms),
                 'games': len(self.game_manager.games),
                 'players': 0  # TODO: Add player tracking
             }
-        }
+        })